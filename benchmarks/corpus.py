@@ -0,0 +1,254 @@
+# Synthetic PDF corpus generation
+
+"""
+Deterministic generator of synthetic PDF corpora for the benchmarks.
+
+Pages are written directly with PyPDF2 (one small text content stream per
+page and a shared Helvetica font), which is fast enough for documents with
+tens of thousands of pages. The same CorpusSpec and seed always produce the
+same files, and a generated corpus is reused if its manifest matches.
+"""
+
+import json
+import os
+import random
+import shutil
+
+from PyPDF2 import PageObject, PdfWriter
+from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+CORPUS_PASSWORD = "benchmark"
+
+MANIFEST_FILE = "corpus.json"
+
+_WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit suspendisse eget "
+    "libero vitae justo blandit suscipit vestibulum ante primis faucibus orci"
+).split()
+
+
+class CorpusSpec:
+    def __init__(
+        self,
+        files: int = 10,
+        pages: int = 10,
+        encrypted: int = 0,
+        corrupted: int = 0,
+        seed: int = 0,
+    ):
+        """
+        Shape of a synthetic corpus.
+
+        Attributes:
+            files (int): Number of valid, unencrypted PDFs.
+            pages (int): Pages per PDF.
+            encrypted (int): Additional PDFs encrypted with CORPUS_PASSWORD.
+            corrupted (int): Additional PDFs truncated to half their size.
+            seed (int): Seed of the generated page text.
+        """
+
+        if files < 1 or pages < 1:
+            raise ValueError("A corpus needs at least one file with one page")
+        if encrypted < 0 or corrupted < 0:
+            raise ValueError("Encrypted and corrupted counts cannot be negative")
+
+        self.files = files
+        self.pages = pages
+        self.encrypted = encrypted
+        self.corrupted = corrupted
+        self.seed = seed
+
+    @property
+    def label(self) -> str:
+        """Short identifier, also used as the corpus directory name."""
+        return (
+            f"{self.files}x{self.pages}p_enc{self.encrypted}"
+            f"_bad{self.corrupted}_seed{self.seed}"
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "files": self.files,
+            "pages": self.pages,
+            "encrypted": self.encrypted,
+            "corrupted": self.corrupted,
+            "seed": self.seed,
+        }
+
+
+class Corpus:
+    def __init__(
+        self,
+        directory: str,
+        spec: CorpusSpec,
+        valid_files: list[str],
+        encrypted_files: list[str],
+        corrupted_files: list[str],
+    ):
+        """
+        A generated corpus on disk.
+
+        Attributes:
+            directory (str): Directory holding every file of the corpus.
+            spec (CorpusSpec): The spec the corpus was generated from.
+            valid_files (list[str]): Paths of the valid, unencrypted PDFs.
+            encrypted_files (list[str]): Paths of the encrypted PDFs.
+            corrupted_files (list[str]): Paths of the truncated PDFs.
+        """
+
+        self.directory = directory
+        self.spec = spec
+        self.valid_files = valid_files
+        self.encrypted_files = encrypted_files
+        self.corrupted_files = corrupted_files
+
+    @property
+    def all_files(self) -> list[str]:
+        return self.valid_files + self.encrypted_files + self.corrupted_files
+
+    @property
+    def readable_pages(self) -> int:
+        """Pages that can be read with CORPUS_PASSWORD (valid and encrypted files)."""
+        return (len(self.valid_files) + len(self.encrypted_files)) * self.spec.pages
+
+
+def _page_text(rng: random.Random, page_number: int, lines: int = 12) -> bytes:
+    commands = [f"BT /F1 14 Tf 72 740 Td (Page {page_number}) Tj ET"]
+    for line in range(lines):
+        words = " ".join(rng.choice(_WORDS) for _ in range(10))
+        commands.append(f"BT /F1 11 Tf 72 {710 - line * 16} Td ({words}) Tj ET")
+    return "\n".join(commands).encode("ascii")
+
+
+def write_synthetic_pdf(
+    path: str, pages: int, seed: int = 0, password: str | None = None
+) -> None:
+    """
+    Write a PDF with the given number of text pages.
+
+    Args:
+        path (str): Output path.
+        pages (int): Number of pages.
+        seed (int): Seed of the page text.
+        password (str | None): Encrypt the PDF with this user password.
+
+    Returns:
+        None
+    """
+    rng = random.Random(seed)
+    writer = PdfWriter()
+
+    font = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        }
+    )
+    resources = DictionaryObject(
+        {
+            NameObject("/Font"): DictionaryObject(
+                {NameObject("/F1"): writer._add_object(font)}
+            )
+        }
+    )
+
+    for page_number in range(1, pages + 1):
+        content = DecodedStreamObject()
+        content.set_data(_page_text(rng, page_number))
+
+        page = PageObject.create_blank_page(width=612, height=792)
+        page[NameObject("/Resources")] = resources
+        page[NameObject("/Contents")] = writer._add_object(content)
+        writer.add_page(page)
+
+    if password is not None:
+        writer.encrypt(password)
+
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def _load_manifest(directory: str, spec: CorpusSpec) -> Corpus | None:
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get("spec") != spec.as_dict():
+        return None
+
+    files = {
+        key: [os.path.join(directory, name) for name in manifest.get(key, [])]
+        for key in ("valid_files", "encrypted_files", "corrupted_files")
+    }
+    if not all(os.path.isfile(path) for paths in files.values() for path in paths):
+        return None
+
+    return Corpus(directory, spec, **files)
+
+
+def generate_corpus(root_dir: str, spec: CorpusSpec) -> Corpus:
+    """
+    Generate (or reuse) a corpus under root_dir/<spec.label>.
+
+    Only the first valid PDF is generated; the others are byte copies of it
+    under their own names, which keeps corpora with thousands of files fast
+    to generate.
+
+    Args:
+        root_dir (str): Directory in which the corpus directory is created.
+        spec (CorpusSpec): Shape of the corpus.
+
+    Returns:
+        Corpus: The generated corpus.
+    """
+    directory = os.path.join(root_dir, spec.label)
+    corpus = _load_manifest(directory, spec)
+    if corpus is not None:
+        return corpus
+
+    os.makedirs(directory, exist_ok=True)
+
+    first = os.path.join(directory, "doc_1.pdf")
+    write_synthetic_pdf(first, spec.pages, seed=spec.seed)
+
+    valid_files: list[str] = [first]
+    for i in range(2, spec.files + 1):
+        path = os.path.join(directory, f"doc_{i}.pdf")
+        shutil.copyfile(first, path)
+        valid_files.append(path)
+
+    encrypted_files: list[str] = []
+    for i in range(1, spec.encrypted + 1):
+        path = os.path.join(directory, f"encrypted_{i}.pdf")
+        if encrypted_files:
+            shutil.copyfile(encrypted_files[0], path)
+        else:
+            write_synthetic_pdf(
+                path, spec.pages, seed=spec.seed, password=CORPUS_PASSWORD
+            )
+        encrypted_files.append(path)
+
+    corrupted_files: list[str] = []
+    if spec.corrupted:
+        with open(first, "rb") as f:
+            truncated = f.read(os.path.getsize(first) // 2)
+    for i in range(1, spec.corrupted + 1):
+        path = os.path.join(directory, f"corrupted_{i}.pdf")
+        with open(path, "wb") as f:
+            f.write(truncated)
+        corrupted_files.append(path)
+
+    manifest = {
+        "spec": spec.as_dict(),
+        "valid_files": [os.path.basename(p) for p in valid_files],
+        "encrypted_files": [os.path.basename(p) for p in encrypted_files],
+        "corrupted_files": [os.path.basename(p) for p in corrupted_files],
+    }
+    with open(os.path.join(directory, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    return Corpus(directory, spec, valid_files, encrypted_files, corrupted_files)
@@ -0,0 +1,440 @@
+# Benchmark runner
+
+"""
+Time the core operations against a synthetic corpus and compare with a baseline.
+
+Every run of a case happens in a fresh spawned process, so the recorded peak
+RSS and peak number of open file descriptors belong to that operation alone.
+Results are written as JSON; a previous results file can be used as the
+baseline, and throughput or memory regressions beyond a tolerance are reported.
+
+Usage:
+    python -m benchmarks --preset small --output results.json
+    python -m benchmarks --files 100 --pages 500 --baseline results.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+import PyPDF2
+
+from benchmarks.corpus import CORPUS_PASSWORD, Corpus, CorpusSpec, generate_corpus
+from core import globals
+from core.batch.batch_merge import batch_merge_pdfs
+from core.batch.batch_rename import batch_rename_pdfs
+from core.batch.batch_split import batch_split_pdf
+from core.pdf_merge import merge_pdf
+from core.pdf_splitter import split_pdf
+from core.result import Result
+
+PRESETS: dict[str, CorpusSpec] = {
+    "smoke": CorpusSpec(files=3, pages=5, encrypted=1, corrupted=1),
+    "small": CorpusSpec(files=20, pages=50, encrypted=2, corrupted=2),
+    "medium": CorpusSpec(files=200, pages=200, encrypted=10, corrupted=10),
+    "large_pages": CorpusSpec(files=2, pages=10_000, encrypted=1, corrupted=1),
+    "many_files": CorpusSpec(files=5_000, pages=1, encrypted=50, corrupted=50),
+}
+
+DEFAULT_CORPUS_DIR = os.path.join(tempfile.gettempdir(), "pdf_toolkit_bench_corpus")
+
+DEFAULT_TOLERANCE = 0.2
+
+# Interval of the open file descriptor sampler, in seconds
+_FD_SAMPLE_INTERVAL = 0.005
+
+# A case prepares its inputs in the work directory and returns the operation
+# to time, which yields the operation's Result and the pages and files it handled.
+CaseRunner = Callable[[], tuple[Result, int, int]]
+
+
+def _corpus_password(_: str) -> str:
+    return CORPUS_PASSWORD
+
+
+def _merge_pdf_case(corpus: Corpus, workdir: str) -> CaseRunner:
+    output = os.path.join(workdir, "merged.pdf")
+    inputs = corpus.all_files
+    return lambda: (
+        merge_pdf(inputs, output, _corpus_password),
+        corpus.readable_pages,
+        len(inputs),
+    )
+
+
+def _merge_pdf_streaming_case(corpus: Corpus, workdir: str) -> CaseRunner:
+    output = os.path.join(workdir, "merged.pdf")
+    inputs = corpus.all_files
+    return lambda: (
+        merge_pdf(inputs, output, _corpus_password, streaming=True),
+        corpus.readable_pages,
+        len(inputs),
+    )
+
+
+def _merge_pdf_dedupe_case(corpus: Corpus, workdir: str) -> CaseRunner:
+    output = os.path.join(workdir, "merged.pdf")
+    inputs = corpus.all_files
+    return lambda: (
+        merge_pdf(inputs, output, _corpus_password, dedupe=True),
+        corpus.readable_pages,
+        len(inputs),
+    )
+
+
+def _batch_merge_case(corpus: Corpus, workdir: str) -> CaseRunner:
+    return lambda: (
+        batch_merge_pdfs(corpus.directory, "merged", workdir, _corpus_password),
+        corpus.readable_pages,
+        len(corpus.all_files),
+    )
+
+
+def _split_pdf_case(corpus: Corpus, workdir: str) -> CaseRunner:
+    pages = corpus.spec.pages
+    half = pages // 2
+    spec = f"1-{half},{half + 1}-last" if half else "1"
+    source = corpus.valid_files[0]
+    return lambda: (split_pdf(source, spec, workdir, None), pages, 1)
+
+
+def _batch_split_case(corpus: Corpus, workdir: str) -> CaseRunner:
+    source = corpus.valid_files[0]
+    return lambda: (batch_split_pdf(source, workdir, None), corpus.spec.pages, 1)
+
+
+def _batch_rename_case(corpus: Corpus, workdir: str) -> CaseRunner:
+    input_dir = os.path.join(workdir, "input")
+    output_dir = os.path.join(workdir, "output")
+    os.makedirs(input_dir)
+    os.makedirs(output_dir)
+    for path in corpus.valid_files:
+        shutil.copyfile(path, os.path.join(input_dir, os.path.basename(path)))
+
+    files = len(corpus.valid_files)
+    return lambda: (
+        batch_rename_pdfs(input_dir, "renamed", output_dir),
+        files * corpus.spec.pages,
+        files,
+    )
+
+
+CASES: dict[str, Callable[[Corpus, str], CaseRunner]] = {
+    "merge_pdf": _merge_pdf_case,
+    "merge_pdf_streaming": _merge_pdf_streaming_case,
+    "merge_pdf_dedupe": _merge_pdf_dedupe_case,
+    "batch_merge_pdfs": _batch_merge_case,
+    "split_pdf": _split_pdf_case,
+    "batch_split_pdf": _batch_split_case,
+    "batch_rename_pdfs": _batch_rename_case,
+}
+
+
+def _fd_directory() -> str | None:
+    for directory in ("/proc/self/fd", "/dev/fd"):
+        if os.path.isdir(directory):
+            return directory
+    return None
+
+
+class _OpenFileSampler:
+    def __init__(self):
+        """
+        Background thread recording the peak number of open file descriptors.
+
+        Attributes:
+            peak (int | None): Highest count seen, or None if the platform
+                does not expose its descriptors.
+        """
+
+        self._directory = _fd_directory()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self.peak: int | None = None
+
+    def _sample(self) -> None:
+        count = len(os.listdir(self._directory))
+        self.peak = count if self.peak is None else max(self.peak, count)
+
+    def _run(self) -> None:
+        while not self._stop.wait(_FD_SAMPLE_INTERVAL):
+            self._sample()
+
+    def __enter__(self) -> "_OpenFileSampler":
+        if self._directory is not None:
+            self._sample()
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._directory is not None:
+            self._stop.set()
+            self._thread.join()
+            self._sample()
+
+
+def _peak_rss_bytes() -> int | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _run_case(name: str, corpus: Corpus, workdir: str, use_cache: bool) -> dict:
+    """Run one case; executed in a fresh process."""
+    globals.USE_VALIDATION_CACHE = use_cache
+    run = CASES[name](corpus, workdir)
+
+    with _OpenFileSampler() as sampler:
+        start = time.perf_counter()
+        result, pages, files = run()
+        seconds = time.perf_counter() - start
+
+    return {
+        "case": name,
+        "success": result.success,
+        "message": result.message,
+        "seconds": seconds,
+        "pages": pages,
+        "files": files,
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "peak_open_files": sampler.peak,
+    }
+
+
+def _max_or_none(values: list[int | None]) -> int | None:
+    known = [value for value in values if value is not None]
+    return max(known) if known else None
+
+
+def run_case(
+    name: str, corpus: Corpus, repeat: int = 1, use_cache: bool = False
+) -> dict:
+    """
+    Run a case repeat times, each in a fresh process and work directory.
+
+    Args:
+        name (str): Key of the case in CASES.
+        corpus (Corpus): The corpus to run against.
+        repeat (int): Number of runs; the fastest is reported.
+        use_cache (bool): Use the persistent validation cache (off by default so
+            every run validates the files again).
+
+    Returns:
+        dict: The measurements of the case.
+    """
+    runs: list[dict] = []
+    context = multiprocessing.get_context("spawn")
+
+    for _ in range(max(repeat, 1)):
+        with tempfile.TemporaryDirectory(prefix=f"bench_{name}_") as workdir:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                runs.append(
+                    pool.submit(_run_case, name, corpus, workdir, use_cache).result()
+                )
+
+    best = min(runs, key=lambda run: run["seconds"])
+    seconds = max(best["seconds"], 1e-9)
+    return {
+        **best,
+        "success": all(run["success"] for run in runs),
+        "runs": len(runs),
+        "pages_per_second": best["pages"] / seconds,
+        "files_per_second": best["files"] / seconds,
+        "peak_rss_bytes": _max_or_none([run["peak_rss_bytes"] for run in runs]),
+        "peak_open_files": _max_or_none([run["peak_open_files"] for run in runs]),
+    }
+
+
+def run_benchmarks(
+    spec: CorpusSpec,
+    cases: list[str] | None = None,
+    corpus_dir: str = DEFAULT_CORPUS_DIR,
+    repeat: int = 1,
+    use_cache: bool = False,
+) -> dict:
+    """
+    Generate (or reuse) the corpus and run the selected cases against it.
+
+    Args:
+        spec (CorpusSpec): Shape of the corpus.
+        cases (list[str] | None): Names of the cases to run; all by default.
+        corpus_dir (str): Directory where corpora are generated and reused.
+        repeat (int): Runs per case; the fastest is reported.
+        use_cache (bool): Use the persistent validation cache.
+
+    Returns:
+        dict: Report with the corpus spec, the environment and one entry per case.
+    """
+    corpus = generate_corpus(corpus_dir, spec)
+
+    return {
+        "corpus": {"label": spec.label, **spec.as_dict()},
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pypdf2": PyPDF2.__version__,
+            "cpu_count": os.cpu_count(),
+        },
+        "results": [
+            run_case(name, corpus, repeat=repeat, use_cache=use_cache)
+            for name in (cases or list(CASES))
+        ],
+    }
+
+
+def compare_to_baseline(
+    report: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE
+) -> list[str]:
+    """
+    List the regressions of a report against a baseline report.
+
+    A case regresses when its pages/s drop, or its peak RSS grows, by more
+    than the tolerance. Cases are only compared on the same corpus.
+
+    Args:
+        report (dict): Report returned by run_benchmarks().
+        baseline (dict): An earlier report.
+        tolerance (float): Allowed relative change, e.g. 0.2 for 20%.
+
+    Returns:
+        list[str]: One description per regression; empty if there are none.
+    """
+    if report["corpus"]["label"] != baseline.get("corpus", {}).get("label"):
+        return [
+            f"Baseline corpus {baseline.get('corpus', {}).get('label')} does not "
+            f"match {report['corpus']['label']}"
+        ]
+
+    previous = {entry["case"]: entry for entry in baseline.get("results", [])}
+    regressions: list[str] = []
+
+    for entry in report["results"]:
+        old = previous.get(entry["case"])
+        if old is None:
+            continue
+
+        if entry["pages_per_second"] < old["pages_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{entry['case']}: {entry['pages_per_second']:.1f} pages/s "
+                f"(baseline {old['pages_per_second']:.1f})"
+            )
+
+        rss, old_rss = entry.get("peak_rss_bytes"), old.get("peak_rss_bytes")
+        if rss and old_rss and rss > old_rss * (1 + tolerance):
+            regressions.append(
+                f"{entry['case']}: peak RSS {rss / 2**20:.1f} MiB "
+                f"(baseline {old_rss / 2**20:.1f} MiB)"
+            )
+
+    return regressions
+
+
+def format_report(report: dict) -> str:
+    """Render a report as a plain-text table."""
+    lines = [
+        f"Corpus {report['corpus']['label']}",
+        f"{'case':<20}{'seconds':>10}{'pages/s':>12}{'files/s':>10}"
+        f"{'RSS MiB':>10}{'max fds':>9}  status",
+    ]
+    for entry in report["results"]:
+        rss = entry["peak_rss_bytes"]
+        fds = entry["peak_open_files"]
+        lines.append(
+            f"{entry['case']:<20}{entry['seconds']:>10.3f}"
+            f"{entry['pages_per_second']:>12.1f}{entry['files_per_second']:>10.1f}"
+            f"{(f'{rss / 2**20:.1f}' if rss else '-'):>10}"
+            f"{(fds if fds is not None else '-'):>9}  "
+            f"{'ok' if entry['success'] else 'FAILED: ' + entry['message']}"
+        )
+    return "\n".join(lines)
+
+
+def _build_spec(args: argparse.Namespace) -> CorpusSpec:
+    preset = PRESETS[args.preset]
+    return CorpusSpec(
+        files=args.files if args.files is not None else preset.files,
+        pages=args.pages if args.pages is not None else preset.pages,
+        encrypted=args.encrypted if args.encrypted is not None else preset.encrypted,
+        corrupted=args.corrupted if args.corrupted is not None else preset.corrupted,
+        seed=args.seed,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Command-line entry point of the benchmark suite.
+
+    Args:
+        argv (list[str] | None): Arguments; defaults to sys.argv[1:].
+
+    Returns:
+        int: 0 on success, 1 if a case failed or regressed against the baseline.
+    """
+    parser = argparse.ArgumentParser(description="PDF-Toolkit benchmarks")
+    parser.add_argument("--preset", choices=list(PRESETS), default="small")
+    parser.add_argument("--files", type=int, help="Valid PDFs in the corpus")
+    parser.add_argument("--pages", type=int, help="Pages per PDF")
+    parser.add_argument("--encrypted", type=int, help="Encrypted PDFs in the corpus")
+    parser.add_argument("--corrupted", type=int, help="Corrupted PDFs in the corpus")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the page text")
+    parser.add_argument(
+        "--cases", nargs="+", choices=list(CASES), help="Cases to run (default: all)"
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case")
+    parser.add_argument(
+        "--corpus-dir",
+        default=DEFAULT_CORPUS_DIR,
+        help="Where corpora are generated and reused",
+    )
+    parser.add_argument(
+        "--use-cache",
+        action="store_true",
+        help="Use the persistent validation cache",
+    )
+    parser.add_argument("-o", "--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed relative regression (default: 0.2)",
+    )
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(
+        _build_spec(args),
+        cases=args.cases,
+        corpus_dir=args.corpus_dir,
+        repeat=args.repeat,
+        use_cache=args.use_cache,
+    )
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    failed = not all(entry["success"] for entry in report["results"])
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_to_baseline(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        failed = failed or bool(regressions)
+
+    return 1 if failed else 0
@@ -0,0 +1,89 @@
+# Benchmarks runnable with pytest
+#
+# The default "smoke" preset only checks that every case runs. Choose a
+# larger corpus and a baseline through the environment, e.g.
+#   PDF_TOOLKIT_BENCH_PRESET=medium PDF_TOOLKIT_BENCH_BASELINE=base.json pytest benchmarks
+
+import json
+import os
+
+import pytest
+
+from benchmarks.corpus import CorpusSpec, generate_corpus
+from benchmarks.runner import CASES, PRESETS, compare_to_baseline, run_benchmarks
+from core.utils import PDFValidationStatus, inspect_pdf
+
+PRESET = os.environ.get("PDF_TOOLKIT_BENCH_PRESET", "smoke")
+BASELINE = os.environ.get("PDF_TOOLKIT_BENCH_BASELINE")
+OUTPUT = os.environ.get("PDF_TOOLKIT_BENCH_OUTPUT")
+
+
+@pytest.fixture(scope="module")
+def report(tmp_path_factory):
+    report = run_benchmarks(
+        PRESETS[PRESET], corpus_dir=str(tmp_path_factory.mktemp("corpus"))
+    )
+    if OUTPUT:
+        with open(OUTPUT, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def test_generated_corpus(tmp_path):
+    """The corpus holds valid, encrypted and corrupted PDFs and is reused."""
+
+    spec = CorpusSpec(files=2, pages=3, encrypted=1, corrupted=1)
+    corpus = generate_corpus(str(tmp_path), spec)
+
+    statuses = [inspect_pdf(path).status for path in corpus.all_files]
+    assert statuses == [
+        PDFValidationStatus.VALID,
+        PDFValidationStatus.VALID,
+        PDFValidationStatus.ENCRYPTED,
+        PDFValidationStatus.CORRUPTED,
+    ]
+    assert inspect_pdf(corpus.valid_files[0]).page_count == 3
+
+    mtime = os.path.getmtime(corpus.valid_files[0])
+    assert generate_corpus(str(tmp_path), spec).all_files == corpus.all_files
+    assert os.path.getmtime(corpus.valid_files[0]) == mtime
+
+
+@pytest.mark.parametrize("case", list(CASES))
+def test_case_runs(report, case):
+    """Every case succeeds and records its throughput and resource usage."""
+
+    entry = next(entry for entry in report["results"] if entry["case"] == case)
+
+    assert entry["success"], entry["message"]
+    assert entry["pages_per_second"] > 0
+    assert entry["peak_rss_bytes"] is None or entry["peak_rss_bytes"] > 0
+
+
+def test_compare_to_baseline_flags_regressions():
+    """Throughput drops and memory growth beyond the tolerance are reported."""
+
+    def fake_report(pages_per_second, peak_rss_bytes):
+        return {
+            "corpus": {"label": "corpus"},
+            "results": [
+                {
+                    "case": "merge_pdf",
+                    "pages_per_second": pages_per_second,
+                    "peak_rss_bytes": peak_rss_bytes,
+                }
+            ],
+        }
+
+    baseline = fake_report(100.0, 100 * 2**20)
+
+    assert compare_to_baseline(fake_report(90.0, 110 * 2**20), baseline) == []
+    assert len(compare_to_baseline(fake_report(50.0, 200 * 2**20), baseline)) == 2
+
+
+@pytest.mark.skipif(not BASELINE, reason="PDF_TOOLKIT_BENCH_BASELINE not set")
+def test_no_regression_against_baseline(report):
+    with open(BASELINE, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    assert compare_to_baseline(report, baseline) == []
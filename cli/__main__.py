@@ -5,10 +5,13 @@ import argparse
 from cli.batch_cli.batch_merge_cli import add_batch_merge_arguments, run_batch_merge
 from cli.batch_cli.batch_rename_cli import add_batch_rename_arguments, run_batch_rename
 from cli.batch_cli.batch_split_cli import add_batch_split_arguments, run_batch_split
+from cli.info_cli import add_info_arguments, run_info
 from cli.merge_cli import add_merge_arguments, run_merge
 from cli.rename_cli import add_rename_arguments, run_rename
+from cli.run_cli import add_run_arguments, run_jobs
 from cli.split_cli import add_split_arguments, run_split
 from core.globals import EncryptedFileHandling
+from core.validation_cache import clear_validation_cache
 from version import __version__
 
 
@@ -26,7 +29,10 @@ def main() -> None:
         - Batch merge PDFs from a directory
         - Batch rename PDFs in a directory
         - Batch split a PDF into individual pages
+        - Report page counts and validation status of PDFs
+        - Run a manifest of many jobs in one process
         - Show the current version
+        - Bypass or clear the persistent PDF validation cache
 
     For each action, it delegates parsing of action-specific arguments and
     execution to the respective CLI modules.
@@ -71,6 +77,18 @@ def main() -> None:
     add_batch_rename_arguments(batch_rename_subparser)
     batch_rename_subparser.set_defaults(func=run_batch_rename)
 
+    info_subparser = sub_parser.add_parser(
+        "info", help="Show page counts and validation status of PDFs"
+    )
+    add_info_arguments(info_subparser)
+    info_subparser.set_defaults(func=run_info)
+
+    run_subparser = sub_parser.add_parser(
+        "run", help="Run the merge, split, extract and rename jobs of a manifest"
+    )
+    add_run_arguments(run_subparser)
+    run_subparser.set_defaults(func=run_jobs)
+
     parser.add_argument(
         "-v", "--version", action="store_true", help="Show the version of the tool"
     )
@@ -83,17 +101,38 @@ def main() -> None:
         help="Skip all encrypted PDFs",
     )
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or update the persistent PDF validation cache",
+    )
+
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Clear the persistent PDF validation cache",
+    )
+
     args = parser.parse_args()
     if args.enc_mode:
         import core.globals
 
         core.globals.ENCRYPTED_FILE_HANDLING = EncryptedFileHandling.SKIP_ALL
 
+    if args.no_cache:
+        import core.globals
+
+        core.globals.USE_VALIDATION_CACHE = False
+
+    if args.clear_cache:
+        clear_validation_cache()
+        print("Validation cache cleared.")
+
     if args.version:
         print(f"PDF-Toolkit v{__version__}")
     elif hasattr(args, "func"):
         args.func(args)
-    else:
+    elif not args.clear_cache:
         print(
             "No subcommand provided. Try 'merge', 'split', 'rename', or a batch command."
         )
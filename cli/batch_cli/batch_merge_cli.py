@@ -2,8 +2,17 @@
 
 import argparse
 
-from cli.common_commands import ask_password_cli
+from cli.common_commands import (
+    add_max_open_files_argument,
+    add_scan_arguments,
+    add_watch_arguments,
+    ask_password_cli,
+    print_watch_result,
+    scan_options_from_args,
+    watcher_from_args,
+)
 from core.batch.batch_merge import batch_merge_pdfs
+from core.batch.batch_watch import watch_batch_merge
 from core.result import Result
 
 
@@ -13,7 +22,9 @@ def add_batch_merge_arguments(parser: argparse.ArgumentParser) -> None:
 
     This function registers arguments for specifying the input directory
     containing the PDFs to merge, the name for the merged output file,
-    and an optional output directory to save the merged PDF.
+    an optional output directory to save the merged PDF, and the number
+    of worker processes used to validate the PDFs, along with the shared
+    directory scanning and watch options.
 
     Args:
         parser (argparse.ArgumentParser): The argument parser to which batch merge arguments are added.
@@ -34,6 +45,39 @@ def add_batch_merge_arguments(parser: argparse.ArgumentParser) -> None:
         required=False,
         help="Directory to save the merged PDF",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes used to validate the PDFs (default: 1, 0 = all CPUs)",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Write each PDF to the output as soon as it is read (bounded memory, bookmarks are not copied)",
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Write fonts, images and other resources shared by the PDFs only once (implies --streaming)",
+    )
+    parser.add_argument(
+        "--read-ahead",
+        type=int,
+        default=0,
+        help="Number of upcoming PDFs opened in the background while merging (default: 0)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=0,
+        help="Merge the PDFs in groups of this many through temporary files, "
+        "running the groups on --jobs workers (default: 0, a single pass)",
+    )
+    add_max_open_files_argument(parser)
+    add_scan_arguments(parser)
+    add_watch_arguments(parser)
 
 
 def run_batch_merge(args: argparse.Namespace) -> None:
@@ -43,22 +87,61 @@ def run_batch_merge(args: argparse.Namespace) -> None:
     This function merges all PDFs found in the specified input directory into a
     single PDF with the given name. The merged file is saved to the provided
     output directory, or to the input directory if no output is specified.
+    With --watch, it instead keeps running and merges each batch of newly
+    arrived PDFs into a new numbered PDF (<newname>_1.pdf, <newname>_2.pdf...).
 
     Args:
         args (argparse.Namespace): Parsed command-line arguments containing:
             - directory (str): Path to the directory containing PDFs to merge.
             - newname (str): Name for the resulting merged PDF file.
             - outputdirectory (str, optional): Directory to save the merged PDF.
+            - jobs (int): Number of worker processes used to validate the PDFs.
+            - streaming (bool): Write each input as soon as it is read.
+            - dedupe (bool): Write shared resources only once.
+            - read_ahead (int): Number of PDFs opened ahead in the background.
+            - chunk_size (int): Number of PDFs merged per intermediate file.
+            - max_open_files (int): Input PDFs kept open at once (0: no limit).
+            - recursive, include, exclude, min_size, max_size, newer_than,
+              older_than, sort: Directory scanning options.
+            - watch, settle, poll_interval, poll: Watch mode options.
 
     Returns:
         None
     """
 
+    if args.watch:
+        if args.jobs != 1 or args.chunk_size:
+            # Each batch of arrivals is merged directly, in this process
+            print("Merge failed: --jobs and --chunk-size cannot be used with --watch")
+            return
+        watcher = watcher_from_args(args, args.directory, scan_options_from_args(args))
+        print(f"Watching {args.directory} for new PDFs (Ctrl+C to stop)...")
+        result: Result = watch_batch_merge(
+            watcher=watcher,
+            new_name=args.newname,
+            output_dir=args.outputdirectory,
+            ask_password_callback=ask_password_cli,
+            on_result=print_watch_result,
+            streaming=args.streaming,
+            dedupe=args.dedupe,
+            read_ahead=args.read_ahead,
+            max_open_files=args.max_open_files,
+        )
+        print(result.message)
+        return
+
     result: Result = batch_merge_pdfs(
         input_dir_path=args.directory,
         new_name=args.newname,
         output_dir=args.outputdirectory,
         ask_password_callback=ask_password_cli,
+        jobs=args.jobs,
+        scan_options=scan_options_from_args(args),
+        streaming=args.streaming,
+        dedupe=args.dedupe,
+        read_ahead=args.read_ahead,
+        chunk_size=args.chunk_size,
+        max_open_files=args.max_open_files,
     )
 
     if result.success:
@@ -2,7 +2,15 @@
 
 import argparse
 
+from cli.common_commands import (
+    add_scan_arguments,
+    add_watch_arguments,
+    print_watch_result,
+    scan_options_from_args,
+    watcher_from_args,
+)
 from core.batch.batch_rename import batch_rename_pdfs
+from core.batch.batch_watch import watch_batch_rename
 from core.result import Result
 
 
@@ -11,8 +19,9 @@ def add_batch_rename_arguments(parser: argparse.ArgumentParser) -> None:
     Add command-line arguments for batch renaming PDF files in a directory.
 
     This function registers arguments for specifying the input directory containing
-    the PDFs to rename, the base name for renaming, and an optional output directory
-    to save the renamed files.
+    the PDFs to rename, the base name for renaming, an optional output directory
+    to save the renamed files, and the number of validation worker processes,
+    along with the shared directory scanning and watch options.
 
     Args:
         parser (argparse.ArgumentParser): The argument parser to which batch rename arguments are added.
@@ -36,6 +45,15 @@ def add_batch_rename_arguments(parser: argparse.ArgumentParser) -> None:
         required=False,
         help="Directory to save the renamed PDFs",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes used to validate the PDFs (default: 1, 0 = all CPUs)",
+    )
+    add_scan_arguments(parser)
+    add_watch_arguments(parser)
 
 
 def run_batch_rename(args: argparse.Namespace) -> None:
@@ -45,22 +63,42 @@ def run_batch_rename(args: argparse.Namespace) -> None:
     This function renames all PDFs in the specified input directory using the given
     base name, optionally saving the renamed files to a different output directory.
     If no output directory is provided, files are saved in the input directory.
+    With --watch, it instead keeps running and renames each newly arrived PDF,
+    continuing the numbering after the files already present.
 
     Args:
         args (argparse.Namespace): Parsed command-line arguments containing:
             - directory (str): Path to the directory containing PDFs to rename.
             - newname (str): Base name to use when renaming files.
             - outputdirectory (str, optional): Directory to save the renamed PDFs.
+            - jobs (int): Number of worker processes used to validate the PDFs.
+            - recursive, include, exclude, min_size, max_size, newer_than,
+              older_than, sort: Directory scanning options.
+            - watch, settle, poll_interval, poll: Watch mode options.
 
     Returns:
         None
     """
 
     output_directory = args.outputdirectory or args.directory
+    if args.watch:
+        watcher = watcher_from_args(args, args.directory, scan_options_from_args(args))
+        print(f"Watching {args.directory} for new PDFs (Ctrl+C to stop)...")
+        result: Result = watch_batch_rename(
+            watcher=watcher,
+            base_name=args.newname,
+            output_dir=output_directory,
+            on_result=print_watch_result,
+        )
+        print(result.message)
+        return
+
     result: Result = batch_rename_pdfs(
         input_dir=args.directory,
         base_name=args.newname,
         output_dir=output_directory,
+        jobs=args.jobs,
+        scan_options=scan_options_from_args(args),
     )
     if result.success:
         print(f"{result.message}")
@@ -1,12 +1,34 @@
 # Batch Split CLI
 
 import argparse
+import re
 from pathlib import Path
 
-from cli.common_commands import ask_password_cli
+from cli.common_commands import (
+    add_archive_arguments,
+    add_compress_argument,
+    add_keep_resources_argument,
+    add_watch_arguments,
+    ask_password_cli,
+    password_callback,
+    print_watch_result,
+    status_stream,
+    watcher_from_args,
+)
 from core.batch.batch_split import batch_split_pdf
+from core.batch.batch_watch import watch_batch_split
 from core.result import Result
 
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def _byte_size(value: str) -> int:
+    """argparse type converting a size such as 500000, 800K, 20M or 1.5G to bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*", value, re.IGNORECASE)
+    if not match or float(match.group(1)) <= 0:
+        raise argparse.ArgumentTypeError(f"Invalid size: '{value}'")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
 
 def add_batch_split_arguments(parser: argparse.ArgumentParser):
     """
@@ -14,7 +36,7 @@ def add_batch_split_arguments(parser: argparse.ArgumentParser):
 
     This function registers arguments for specifying the source PDF file
     and the optional output directory where the individual page PDFs
-    will be saved.
+    will be saved, along with the shared watch options.
 
     Args:
         parser (argparse.ArgumentParser): The argument parser to which batch split arguments are added.
@@ -24,14 +46,42 @@ def add_batch_split_arguments(parser: argparse.ArgumentParser):
     """
 
     parser.add_argument(
-        "-f", "--file", required=True, help="PDF file to split into individual pages"
+        "-f",
+        "--file",
+        required=True,
+        help="PDF file to split into individual pages (with --watch: directory to watch)",
     )
-    parser.add_argument(
+    destination = parser.add_mutually_exclusive_group()
+    destination.add_argument(
         "-o",
         "--outputdirectory",
         required=False,
         help="Directory to save the split PDFs",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes writing the pages (default: 1, 0 = all CPUs)",
+    )
+    parser.add_argument(
+        "-n",
+        "--pages",
+        type=int,
+        default=1,
+        help="Number of consecutive pages written to each file (default: 1)",
+    )
+    parser.add_argument(
+        "--max-size",
+        type=_byte_size,
+        help="Start a new file before the current one would exceed this size "
+        "(e.g. 500K, 20M), as estimated from the source before writing",
+    )
+    add_archive_arguments(parser, destination)
+    add_compress_argument(parser)
+    add_keep_resources_argument(parser)
+    add_watch_arguments(parser)
 
 
 def run_batch_split(args: argparse.Namespace):
@@ -41,31 +91,77 @@ def run_batch_split(args: argparse.Namespace):
     This function splits the input PDF into separate pages and saves each page
     as an individual PDF in the specified output directory. If no output directory
     is provided, the files are saved in the same directory as the input file.
+    With --watch, the file argument names a directory instead, and every PDF
+    arriving there is split.
 
     Args:
         args (argparse.Namespace): Parsed command-line arguments containing:
             - file (str): Path to the source PDF file.
             - outputdirectory (str, optional): Directory to save the individual page PDFs.
+            - compress (int, optional): Flate level to pack the page PDFs with.
+            - jobs (int): Number of worker processes writing the pages.
+            - keep_resources (bool): Do not prune unused page resources.
+            - pages (int): Number of consecutive pages written to each file.
+            - max_size (int, optional): Maximum size in bytes of each file.
+            - archive (str, optional): Archive to write the PDFs into instead.
+            - archive_format (str, optional): Format of the archive.
+            - watch, settle, poll_interval, poll: Watch mode options.
 
     Returns:
         None
     """
 
+    if args.watch:
+        if args.archive:
+            print("Split failed: --archive cannot be used with --watch")
+            return
+        watcher = watcher_from_args(args, args.file)
+        print(f"Watching {args.file} for new PDFs (Ctrl+C to stop)...")
+        result: Result = watch_batch_split(
+            watcher=watcher,
+            output_dir=args.outputdirectory,
+            ask_password_callback=ask_password_cli,
+            on_result=print_watch_result,
+            compress_level=args.compress,
+            jobs=args.jobs,
+            prune_resources=not args.keep_resources,
+            pages_per_file=args.pages,
+            max_bytes=args.max_size,
+        )
+        print(result.message)
+        return
+
     output_directory = args.outputdirectory or str(Path(args.file).parent)
     result: Result = batch_split_pdf(
         file_path=args.file,
         output_dir=output_directory,
-        ask_password_callback=ask_password_cli,
+        ask_password_callback=password_callback(args),
+        compress_level=args.compress,
+        jobs=args.jobs,
+        prune_resources=not args.keep_resources,
+        pages_per_file=args.pages,
+        max_bytes=args.max_size,
+        archive=args.archive,
+        archive_format=args.archive_format,
     )
+    out = status_stream(args)
     if result.success:
-        print(result.message)
+        print(result.message, file=out)
         data = result.data or {}
         if data.get("skipped_encrypted_files"):
-            print("Skipped encrypted PDFs:", ", ".join(data["skipped_encrypted_files"]))
+            print(
+                "Skipped encrypted PDFs:",
+                ", ".join(data["skipped_encrypted_files"]),
+                file=out,
+            )
         if data.get("wrong_password_files"):
-            print("PDFs with wrong passwords:", ", ".join(data["wrong_password_files"]))
+            print(
+                "PDFs with wrong passwords:",
+                ", ".join(data["wrong_password_files"]),
+                file=out,
+            )
         if data.get("invalid_files"):
-            print("Invalid PDFs:", ", ".join(data["invalid_files"]))
+            print("Invalid PDFs:", ", ".join(data["invalid_files"]), file=out)
 
     else:
-        print(f"Split failed: {result.message}")
+        print(f"Split failed: {result.message}", file=out)
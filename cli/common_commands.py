@@ -1,13 +1,32 @@
 # cli/common_commands.py
 
+import argparse
+import sys
+from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Callable, TextIO
 
 from core import globals
+from core.dir_scanner import SORT_KEYS, ScanOptions
+from core.output_archive import ARCHIVE_FORMATS, STDOUT_TARGET
+from core.pdf_compress import DEFAULT_COMPRESSION_LEVEL
+from core.reader_pool import DEFAULT_MAX_OPEN_FILES
+from core.result import Result
+from core.watcher import FolderWatcher
 
 SKIP_TOKEN = "__skip__"
 
 
-def ask_password_cli(file: str) -> str | None:
+def _ask(prompt: str, stream: TextIO | None) -> str:
+    """input(), writing the prompt to stream when one other than stdout is given."""
+    if stream is None or stream is sys.stdout:
+        return input(prompt)
+    print(prompt, end="", file=stream, flush=True)
+    return sys.stdin.readline()
+
+
+def ask_password_cli(file: str, prompt_stream: TextIO | None = None) -> str | None:
     """
     Prompt the user to enter a password for an encrypted PDF file via CLI.
 
@@ -20,6 +39,8 @@ def ask_password_cli(file: str) -> str | None:
 
     Args:
         file (str): The path to the encrypted PDF file for which a password is requested.
+        prompt_stream (TextIO | None): Stream to write the prompts to instead of
+            stdout, e.g. stderr when stdout carries an archive.
 
     Returns:
         str | None: The password entered by the user, or None if the file should be skipped.
@@ -31,13 +52,288 @@ def ask_password_cli(file: str) -> str | None:
     if globals.ENCRYPTED_FILE_HANDLING == globals.EncryptedFileHandling.SKIP_ALL:
         return None
 
-    password: str | None = input(
-        f"Enter the password for {file_name} (or type {SKIP_TOKEN} to skip):"
+    password: str | None = _ask(
+        f"Enter the password for {file_name} (or type {SKIP_TOKEN} to skip):",
+        prompt_stream,
     ).strip()
 
     if password.lower() == SKIP_TOKEN:
-        sure: str = input(f"Are you sure you want to skip {file}? [y/N]:").strip()
+        sure: str = _ask(
+            f"Are you sure you want to skip {file}? [y/N]:", prompt_stream
+        ).strip()
         if sure == "y" or sure == "Y":
             return None
 
     return password
+
+
+def _timestamp(value: str) -> float:
+    """argparse type converting an ISO date/time (e.g. 2025-01-31 or 2025-01-31T08:00) to a POSIX timestamp."""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid date: '{value}'")
+
+
+def add_scan_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the directory scanning options shared by the directory batch commands.
+
+    This function registers arguments for recursing into sub-directories,
+    include/exclude glob patterns, size and modification time filters, and
+    the order in which the PDFs are processed.
+
+    Args:
+        parser (argparse.ArgumentParser): The argument parser to which scan arguments are added.
+
+    Returns:
+        None
+    """
+
+    parser.add_argument(
+        "-R", "--recursive", action="store_true", help="Include PDFs in sub-directories"
+    )
+    parser.add_argument(
+        "--include",
+        nargs="+",
+        help="Glob patterns file names must match (default: '*.pdf')",
+    )
+    parser.add_argument(
+        "--exclude",
+        nargs="+",
+        help="Glob patterns of file names or relative paths to skip",
+    )
+    parser.add_argument("--min-size", type=int, help="Minimum file size in bytes")
+    parser.add_argument("--max-size", type=int, help="Maximum file size in bytes")
+    parser.add_argument(
+        "--newer-than",
+        type=_timestamp,
+        help="Only PDFs modified at or after this date (e.g. 2025-01-31)",
+    )
+    parser.add_argument(
+        "--older-than",
+        type=_timestamp,
+        help="Only PDFs modified at or before this date (e.g. 2025-01-31T18:00)",
+    )
+    parser.add_argument(
+        "--sort",
+        choices=list(SORT_KEYS),
+        default="natural",
+        help="Processing order (default: natural). 'none' streams in directory order",
+    )
+
+
+def scan_options_from_args(args: argparse.Namespace) -> ScanOptions:
+    """
+    Build ScanOptions from the arguments registered by add_scan_arguments().
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments.
+
+    Returns:
+        ScanOptions: The scan options for the batch operation.
+    """
+
+    return ScanOptions(
+        recursive=args.recursive,
+        include=args.include,
+        exclude=args.exclude,
+        min_size=args.min_size,
+        max_size=args.max_size,
+        modified_after=args.newer_than,
+        modified_before=args.older_than,
+        sort_key=SORT_KEYS[args.sort],
+    )
+
+
+def add_compress_argument(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the output compression option shared by the commands writing PDFs.
+
+    Args:
+        parser (argparse.ArgumentParser): The argument parser to which the option is added.
+
+    Returns:
+        None
+    """
+
+    parser.add_argument(
+        "--compress",
+        nargs="?",
+        type=int,
+        const=DEFAULT_COMPRESSION_LEVEL,
+        choices=range(10),
+        metavar="LEVEL",
+        help="Pack the output into compressed object streams with an xref stream, "
+        f"using this flate level 0-9 (default level: {DEFAULT_COMPRESSION_LEVEL})",
+    )
+
+
+def add_keep_resources_argument(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the option disabling unused resource pruning for the commands writing pages.
+
+    Args:
+        parser (argparse.ArgumentParser): The argument parser to which the option is added.
+
+    Returns:
+        None
+    """
+
+    parser.add_argument(
+        "--keep-resources",
+        action="store_true",
+        help="Copy each page's whole resource dictionary instead of only the "
+        "fonts, images and graphics states it uses",
+    )
+
+
+def add_archive_arguments(
+    parser: argparse.ArgumentParser,
+    group: argparse._MutuallyExclusiveGroup | None = None,
+) -> None:
+    """
+    Add the archive output options shared by the commands splitting PDFs.
+
+    Args:
+        parser (argparse.ArgumentParser): The argument parser to which the options are added.
+        group (argparse._MutuallyExclusiveGroup | None): Group receiving --archive,
+            typically shared with the output directory option.
+
+    Returns:
+        None
+    """
+
+    (group or parser).add_argument(
+        "--archive",
+        metavar="PATH",
+        help="Write the PDFs and a manifest.json of their pages into this .zip "
+        f"or .tar file instead of a directory ('{STDOUT_TARGET}' for stdout)",
+    )
+    parser.add_argument(
+        "--archive-format",
+        choices=ARCHIVE_FORMATS,
+        help="Archive format, when not given by the --archive extension "
+        "(default for stdout: tar)",
+    )
+
+
+def status_stream(args: argparse.Namespace) -> TextIO:
+    """Stream for the messages of a command: stderr when its archive goes to stdout."""
+    if getattr(args, "archive", None) == STDOUT_TARGET:
+        return sys.stderr
+    return sys.stdout
+
+
+def password_callback(args: argparse.Namespace) -> Callable[[str], str | None]:
+    """ask_password_cli(), prompting on the status_stream() of the command."""
+    return partial(ask_password_cli, prompt_stream=status_stream(args))
+
+
+def add_max_open_files_argument(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the open input limit option shared by the merge commands.
+
+    Args:
+        parser (argparse.ArgumentParser): The argument parser to which the option is added.
+
+    Returns:
+        None
+    """
+
+    parser.add_argument(
+        "--max-open-files",
+        nargs="?",
+        type=int,
+        const=DEFAULT_MAX_OPEN_FILES,
+        default=0,
+        metavar="N",
+        help="Keep the input PDFs on disk instead of in memory, with at most N "
+        f"of them open at once (default N: {DEFAULT_MAX_OPEN_FILES})",
+    )
+
+
+def add_watch_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the hot-folder options shared by the batch commands.
+
+    This function registers arguments for watching a directory and processing
+    only newly arriving PDFs, the time a file must stop changing before it is
+    processed, and the polling behaviour.
+
+    Args:
+        parser (argparse.ArgumentParser): The argument parser to which watch arguments are added.
+
+    Returns:
+        None
+    """
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and process only PDFs that arrive in the directory (Ctrl+C to stop)",
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=2.0,
+        help="Seconds a new file must stop changing before it is processed (default: 2)",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between checks of the watched directory (default: 1)",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Always poll the directory instead of using inotify",
+    )
+
+
+def watcher_from_args(
+    args: argparse.Namespace, directory: str, scan_options: ScanOptions | None = None
+) -> FolderWatcher:
+    """
+    Build a FolderWatcher from the arguments registered by add_watch_arguments().
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments.
+        directory (str): Directory to watch.
+        scan_options (ScanOptions | None): Filters selecting the files to watch for.
+
+    Returns:
+        FolderWatcher: The watcher for the batch operation.
+    """
+
+    return FolderWatcher(
+        directory,
+        scan_options=scan_options,
+        settle_seconds=args.settle,
+        poll_interval=args.poll_interval,
+        use_inotify=not args.poll,
+    )
+
+
+def print_watch_result(result: Result) -> None:
+    """
+    Print the outcome of one operation performed in watch mode.
+
+    Args:
+        result (Result): Result of the operation.
+
+    Returns:
+        None
+    """
+
+    prefix = "" if result.success else "Failed: "
+    print(f"{prefix}{result.message}")
+    data = result.data or {}
+    for key, label in (
+        ("skipped_encrypted_files", "Skipped encrypted PDFs:"),
+        ("wrong_password_files", "PDFs with wrong passwords:"),
+        ("invalid_files", "Invalid PDFs:"),
+    ):
+        if data.get(key):
+            print(label, ", ".join(data[key]))
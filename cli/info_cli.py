@@ -0,0 +1,65 @@
+# Info CLI
+
+import argparse
+import os
+
+from core.pdf_info import get_pdf_info
+from core.result import Result
+
+
+def add_info_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add command-line arguments for reporting PDF page counts and status.
+
+    This function registers mutually exclusive arguments for specifying either
+    a list of PDF files or a directory whose PDFs should be inspected.
+
+    Args:
+        parser (argparse.ArgumentParser): The argument parser to which info arguments are added.
+
+    Returns:
+        None
+    """
+
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("-f", "--files", nargs="+", help="List of PDFs to inspect")
+    group.add_argument("-d", "--directory", help="Directory containing PDFs to inspect")
+
+
+def run_info(args: argparse.Namespace) -> None:
+    """
+    Print the page count and validation status of each PDF.
+
+    Each line lists the page count ('-' if unknown), the validation status and
+    the file path, followed by a total.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments containing:
+            - files (list[str], optional): List of PDF file paths to inspect.
+            - directory (str, optional): Directory containing PDFs to inspect.
+
+    Returns:
+        None
+    """
+
+    if args.directory:
+        if not os.path.isdir(args.directory):
+            print(f"The specified directory does not exist: {args.directory}")
+            return
+        files = sorted(
+            os.path.join(args.directory, f)
+            for f in os.listdir(args.directory)
+            if f.lower().endswith(".pdf")
+        )
+    else:
+        files = args.files
+
+    result: Result = get_pdf_info(input_file_path=files)
+    if result.success:
+        for info in result.data["files"]:
+            pages = "-" if info["page_count"] is None else info["page_count"]
+            print(f"{pages:>8}  {info['status']:<10} {info['path']}")
+        print(result.message)
+
+    else:
+        print(f"{result.message}")
@@ -2,7 +2,12 @@
 
 import argparse
 
-from cli.common_commands import ask_password_cli
+from cli.common_commands import (
+    add_compress_argument,
+    add_max_open_files_argument,
+    ask_password_cli,
+)
+from core.page_selection import split_input_spec
 from core.pdf_merge import merge_pdf
 from core.result import Result
 
@@ -12,7 +17,8 @@ def add_merge_arguments(parser: argparse.ArgumentParser) -> None:
     Add command-line arguments for merging PDF files to the argument parser.
 
     This function registers the necessary arguments for the PDF merge operation,
-    including the list of input PDF files and the output file path.
+    including the list of input PDF files, the output file path and the
+    streaming mode for very large outputs.
 
     Args:
         parser (argparse.ArgumentParser): The argument parser to which merge arguments are added.
@@ -22,11 +28,39 @@ def add_merge_arguments(parser: argparse.ArgumentParser) -> None:
     """
 
     parser.add_argument(
-        "-f", "--files", nargs="+", required=True, help="List of PDFs to merge"
+        "-f",
+        "--files",
+        nargs="+",
+        required=True,
+        help="List of PDFs to merge; append ':<pages>' to take only some pages "
+        "(e.g. cover.pdf:1-2 body.pdf appendix.pdf:last)",
     )
     parser.add_argument(
         "-o", "--output", required=True, help="Location to save the merged PDF"
     )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Write each PDF to the output as soon as it is read (bounded memory, bookmarks are not copied)",
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Write fonts, images and other resources shared by the PDFs only once (implies --streaming)",
+    )
+    parser.add_argument(
+        "--read-ahead",
+        type=int,
+        default=0,
+        help="Number of upcoming PDFs opened in the background while merging (default: 0)",
+    )
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help="Append the pages to the existing output PDF with an incremental update instead of rewriting it",
+    )
+    add_compress_argument(parser)
+    add_max_open_files_argument(parser)
 
 
 def run_merge(args: argparse.Namespace) -> None:
@@ -38,17 +72,34 @@ def run_merge(args: argparse.Namespace) -> None:
 
     Args:
         args (argparse.Namespace): Parsed command-line arguments containing:
-            - files (list[str]): List of PDF file paths to merge.
+            - files (list[str]): List of PDF file paths to merge, each optionally
+              followed by ':<page selection>'.
             - output (str): Output path for the merged PDF.
+            - streaming (bool): Write each input as soon as it is read.
+            - dedupe (bool): Write shared resources only once.
+            - read_ahead (int): Number of PDFs opened ahead in the background.
+            - append (bool): Append to the existing output PDF.
+            - compress (int, optional): Flate level to pack the output with.
+            - max_open_files (int): Input PDFs kept open at once (0: no limit).
 
     Returns:
         None
     """
 
+    inputs = [split_input_spec(argument) for argument in args.files]
+    page_specs = [spec for _, spec in inputs]
+
     result: Result = merge_pdf(
-        input_file_path=args.files,
+        input_file_path=[path for path, _ in inputs],
         output_file_path=args.output,
         ask_password_callback=ask_password_cli,
+        streaming=args.streaming,
+        dedupe=args.dedupe,
+        read_ahead=args.read_ahead,
+        page_specs=page_specs if any(page_specs) else None,
+        append=args.append,
+        compress_level=args.compress,
+        max_open_files=args.max_open_files,
     )
     if result.success:
         print(result.message)
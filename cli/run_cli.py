@@ -0,0 +1,73 @@
+# Job manifest CLI
+
+import argparse
+
+from core.job_runner import run_manifest
+from core.reader_cache import DEFAULT_MAX_READERS
+from core.result import Result
+
+
+def add_run_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add command-line arguments for running a job manifest.
+
+    This function registers the manifest path, the number of worker
+    processes, the optional JSON report location and the reader cache size.
+
+    Args:
+        parser (argparse.ArgumentParser): The argument parser to which run arguments are added.
+
+    Returns:
+        None
+    """
+
+    parser.add_argument(
+        "manifest", help="JSON or YAML manifest of merge/split/extract/rename jobs"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes running the jobs (default: 1, 0 = all CPUs)",
+    )
+    parser.add_argument(
+        "-r", "--report", help="Write the per-job results to this JSON file"
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAX_READERS,
+        help=f"Parsed PDFs kept per process for reuse by later jobs (default: {DEFAULT_MAX_READERS})",
+    )
+
+
+def run_jobs(args: argparse.Namespace) -> None:
+    """
+    Execute every job of a manifest using the provided command-line arguments.
+
+    This function prints one line per job, in manifest order, followed by a
+    summary of how many jobs succeeded.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments containing:
+            - manifest (str): Path to the job manifest.
+            - jobs (int): Number of worker processes.
+            - report (str, optional): Path of the JSON report.
+            - cache_size (int): Number of parsed PDFs cached per process.
+
+    Returns:
+        None
+    """
+
+    result: Result = run_manifest(
+        manifest_path=args.manifest,
+        jobs=args.jobs,
+        report_path=args.report,
+        cache_size=args.cache_size,
+    )
+
+    for report in result.data.get("jobs", []):
+        status = "ok" if report["success"] else "failed"
+        print(f"[{status}] {report['id']} ({report['type']}): {report['message']}")
+    print(result.message)
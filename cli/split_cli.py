@@ -2,8 +2,14 @@
 
 import argparse
 
-from cli.common_commands import ask_password_cli
-from core.pdf_splitter import split_pdf
+from cli.common_commands import (
+    add_archive_arguments,
+    add_compress_argument,
+    add_keep_resources_argument,
+    password_callback,
+    status_stream,
+)
+from core.pdf_splitter import split_pdf, split_pdf_by_outline
 from core.result import Result
 
 
@@ -12,8 +18,8 @@ def add_split_arguments(parser: argparse.ArgumentParser) -> None:
     Add command-line arguments for splitting pages from a PDF file.
 
     This function registers arguments for specifying the source PDF file,
-    the page range to extract, and the output directory where the new PDF
-    will be saved.
+    the page range to extract (or the outline depth to split at), and the
+    output directory where the new PDF will be saved.
 
     Args:
         parser (argparse.ArgumentParser): The argument parser to which split arguments are added.
@@ -25,20 +31,32 @@ def add_split_arguments(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "-f", "--file", required=True, help="PDF to extract pages from", type=str
     )
-    parser.add_argument(
+    selection = parser.add_mutually_exclusive_group(required=True)
+    selection.add_argument(
         "-r",
         "--range",
-        required=True,
-        help="Page to extract (e.g., '1', '2-4', or '1,3,5-7')",
+        help="Pages to extract, one file per range (e.g., '1', '2-4', '1,3,5-7', '10-', '-3', 'last', 'odd', 'even', '1-9:2', '1-9:-1')",
         type=str,
     )
-    parser.add_argument(
+    selection.add_argument(
+        "--outline",
+        nargs="?",
+        const=1,
+        default=None,
+        metavar="DEPTH",
+        help="Write one file per bookmark, named after its title, using the outline levels down to DEPTH (default: 1, top-level bookmarks only)",
+        type=int,
+    )
+    destination = parser.add_mutually_exclusive_group(required=True)
+    destination.add_argument(
         "-o",
         "--output",
-        required=True,
         help="Directory to save the split PDF",
         type=str,
     )
+    add_archive_arguments(parser, destination)
+    add_compress_argument(parser)
+    add_keep_resources_argument(parser)
 
 
 def run_split(args: argparse.Namespace) -> None:
@@ -52,28 +70,58 @@ def run_split(args: argparse.Namespace) -> None:
     Args:
         args (argparse.Namespace): Parsed command-line arguments containing:
             - file (str): Path to the source PDF file.
-            - range (str): Page range to extract (e.g., '1', '2-4', '1,3,5-7').
-            - output (str): Directory to save the resulting split PDF.
+            - range (str, optional): Page selection spec (e.g., '1', '2-4', '1,3,5-7', '10-', 'odd').
+            - outline (int, optional): Split at the bookmarks down to this outline depth instead.
+            - output (str, optional): Directory to save the resulting split PDF.
+            - archive (str, optional): Archive to write the PDFs into instead.
+            - archive_format (str, optional): Format of the archive.
+            - compress (int, optional): Flate level to pack the outputs with.
+            - keep_resources (bool): Do not prune unused page resources.
 
     Returns:
         None
     """
 
-    result: Result = split_pdf(
-        file_path=args.file,
-        page_range_input=args.range,
-        output_dir=args.output,
-        ask_password_callback=ask_password_cli,
-    )
+    if args.outline is not None:
+        result: Result = split_pdf_by_outline(
+            file_path=args.file,
+            output_dir=args.output,
+            ask_password_callback=password_callback(args),
+            depth=args.outline,
+            compress_level=args.compress,
+            prune_resources=not args.keep_resources,
+            archive=args.archive,
+            archive_format=args.archive_format,
+        )
+    else:
+        result = split_pdf(
+            file_path=args.file,
+            page_range_input=args.range,
+            output_dir=args.output,
+            ask_password_callback=password_callback(args),
+            compress_level=args.compress,
+            prune_resources=not args.keep_resources,
+            archive=args.archive,
+            archive_format=args.archive_format,
+        )
+    out = status_stream(args)
     if result.success:
-        print(result.message)
+        print(result.message, file=out)
         data = result.data or {}
         if data.get("skipped_encrypted_files"):
-            print("Skipped encrypted PDFs:", ", ".join(data["skipped_encrypted_files"]))
+            print(
+                "Skipped encrypted PDFs:",
+                ", ".join(data["skipped_encrypted_files"]),
+                file=out,
+            )
         if data.get("wrong_password_files"):
-            print("PDFs with wrong passwords:", ", ".join(data["wrong_password_files"]))
+            print(
+                "PDFs with wrong passwords:",
+                ", ".join(data["wrong_password_files"]),
+                file=out,
+            )
         if data.get("invalid_files"):
-            print("Invalid PDFs:", ", ".join(data["invalid_files"]))
+            print("Invalid PDFs:", ", ".join(data["invalid_files"]), file=out)
 
     else:
-        print(f"{result.message}")
+        print(f"{result.message}", file=out)
@@ -0,0 +1,23 @@
+# Settings shared by the test suite and the benchmarks
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_validation_cache(tmp_path, monkeypatch):
+    """Keep the persistent validation cache of each test in its temporary directory."""
+
+    import core.validation_cache
+
+    monkeypatch.setattr(
+        core.validation_cache,
+        "validation_cache_file",
+        lambda: tmp_path / core.validation_cache.VALIDATION_CACHE_FILENAME,
+    )
+    monkeypatch.setattr(core.validation_cache, "_cache", None)
+
+    try:
+        yield
+    finally:
+        if core.validation_cache._cache is not None:
+            core.validation_cache._cache.close()
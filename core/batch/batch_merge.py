@@ -1,15 +1,276 @@
 # Batch PDF merge logic
 
 import os
+import shutil
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import chain, count, islice
 from pathlib import Path
-from typing import Callable
+from tempfile import TemporaryDirectory
+from typing import Any, Callable, Iterable, Iterator
 
 from PyPDF2 import PdfMerger, PdfReader
 
+from core.dir_scanner import ScanOptions, scan_directory
 from core.error_handler import handle_exception
 from core.globals import ENCRYPTED_FILE_HANDLING, EncryptedFileHandling
+from core.reader_pool import PooledFile, PooledPdfMerger, ReaderPool
 from core.result import Result
-from core.utils import PDFValidationStatus, validate_pdf_file
+from core.streaming_merger import StreamingPdfMerger
+from core.utils import PDFValidationStatus, inspect_pdfs_ahead, validate_pdf_files
+
+# Intermediate merges of the chunked strategy live here until the final merge
+SPILL_DIR_PREFIX = "pdf-toolkit-merge-"
+
+# (path, password, reader) of an input that passed validation
+MergeInput = tuple[str, str | None, PdfReader | None]
+
+
+def _create_merger(
+    output_file_path: str, streaming: bool, dedupe: bool, pool: ReaderPool | None
+) -> PdfMerger | StreamingPdfMerger:
+    if streaming or dedupe:
+        return StreamingPdfMerger(output_file_path, dedupe=dedupe)
+    if pool is not None:
+        return PooledPdfMerger()
+    return PdfMerger()
+
+
+def _accepted_inputs(
+    checked: Iterable[tuple[str, bool, PDFValidationStatus, str, PdfReader | None]],
+    ask_password_callback: Callable[[str], str | None] | None,
+    invalid_files: list[str],
+    skipped_encrypted_files: list[str],
+) -> Iterator[MergeInput]:
+    """
+    Yield the inputs to merge, with their password, recording the rejected ones.
+    """
+    for pdf, is_valid, status, error_message, reader in checked:
+        password: str | None = None
+
+        # PDF is not valid AND it is corrupted or it is NOT a PDF
+        if (
+            not is_valid and status == PDFValidationStatus.CORRUPTED
+        ) or status == PDFValidationStatus.NOT_PDF:
+            invalid_files.append(pdf)
+            continue
+
+        # PDF is encrypted
+        if status == PDFValidationStatus.ENCRYPTED:
+            # If user chooses to skip all the encrypted PDFs, then don't call the callback function
+            if ENCRYPTED_FILE_HANDLING == EncryptedFileHandling.SKIP_ALL:
+                skipped_encrypted_files.append(pdf)
+                continue
+
+            # Check if a callback function is provided or not
+            if ask_password_callback is None:
+                skipped_encrypted_files.append(pdf)
+                continue
+
+            password = ask_password_callback(pdf)
+
+            # If user chooses to skip the file, leave it
+            if ENCRYPTED_FILE_HANDLING == EncryptedFileHandling.SKIP:
+                skipped_encrypted_files.append(pdf)
+                continue
+
+            # Password not provided, append in skipped_encrypted_files and continue
+            if not password:
+                skipped_encrypted_files.append(pdf)
+                continue
+
+        yield pdf, password, reader
+
+
+def _open_input(
+    pdf: str,
+    password: str | None,
+    reader: PdfReader | None,
+    wrong_password_files: list[str],
+    skipped_encrypted_files: list[str],
+    pool: ReaderPool | None = None,
+) -> PdfReader | None:
+    """
+    Open (if needed) and decrypt an accepted input; None if it has to be skipped.
+
+    With a pool, an input not already read from a pooled file is reopened on
+    one so the merger does not keep the inspection's in-memory copy.
+    """
+    if pool is not None and not (
+        reader is not None and isinstance(reader.stream, PooledFile)
+    ):
+        reader = pool.open_reader(pdf)
+    elif reader is None:
+        reader = PdfReader(pdf)
+    if reader.is_encrypted:
+        if password is None:
+            skipped_encrypted_files.append(pdf)
+            return None
+        if reader.decrypt(password=password) == 0:
+            wrong_password_files.append(pdf)
+            return None
+    return reader
+
+
+def _merge_group(
+    inputs: Iterable[MergeInput],
+    output_file_path: str,
+    streaming: bool,
+    dedupe: bool,
+    max_open_files: int = 0,
+) -> dict[str, Any]:
+    """
+    Merge a group of inputs into one file; runs in worker processes too.
+
+    Returns:
+        dict[str, Any]: 'pages' written (the file is not created if 0), the
+            'wrong_password_files' and 'skipped_encrypted_files' of the group,
+            and the 'deduplicated_objects' and 'bytes_saved' of the merge.
+    """
+    wrong_password_files: list[str] = []
+    skipped_encrypted_files: list[str] = []
+
+    pool = ReaderPool(max_open_files) if max_open_files else None
+    merger = _create_merger(output_file_path, streaming, dedupe, pool)
+    try:
+        for pdf, password, reader in inputs:
+            reader = _open_input(
+                pdf,
+                password,
+                reader,
+                wrong_password_files,
+                skipped_encrypted_files,
+                pool,
+            )
+            if reader is not None:
+                merger.append(reader)
+            reader = None
+
+        pages = len(merger.pages)
+        if pages:
+            merger.write(output_file_path)
+        return {
+            "pages": pages,
+            "wrong_password_files": wrong_password_files,
+            "skipped_encrypted_files": skipped_encrypted_files,
+            "deduplicated_objects": getattr(merger, "deduplicated_objects", 0),
+            "bytes_saved": getattr(merger, "bytes_saved", 0),
+        }
+    finally:
+        merger.close()
+        if pool is not None:
+            pool.close()
+
+
+def _tree_merge(
+    inputs: Iterable[MergeInput],
+    output_file_path: str,
+    chunk_size: int,
+    jobs: int,
+    streaming: bool,
+    dedupe: bool,
+    max_open_files: int,
+    wrong_password_files: list[str],
+    skipped_encrypted_files: list[str],
+) -> tuple[int, int, int]:
+    """
+    Merge inputs in groups of chunk_size into spill files, then merge those.
+
+    Groups of spill files are merged again until at most chunk_size remain,
+    so no merge ever holds more than chunk_size inputs; the final merge
+    writes output_file_path. In-process, a group's inputs are consumed one
+    at a time, so a streaming merge still holds a single reader. Groups are
+    merged in input order, by jobs worker processes if jobs is not 1, and the
+    spill directory is always removed.
+
+    Returns:
+        tuple[int, int, int]: Pages written, deduplicated objects and bytes saved.
+    """
+    workers = jobs or os.cpu_count() or 1
+    deduplicated_objects = bytes_saved = 0
+
+    with TemporaryDirectory(prefix=SPILL_DIR_PREFIX) as spill_dir, ExitStack() as stack:
+        executor = (
+            stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            if workers > 1
+            else None
+        )
+        spill_paths = (
+            os.path.join(spill_dir, f"spill_{number}.pdf") for number in count(1)
+        )
+
+        def merge_level(
+            groups: Iterable[Iterator[MergeInput]],
+        ) -> tuple[list[str], int]:
+            nonlocal deduplicated_objects, bytes_saved
+            scheduled = []
+            for group in groups:
+                spill_path = next(spill_paths)
+                if executor is None:
+                    outcome: Any = _merge_group(
+                        group, spill_path, streaming, dedupe, max_open_files
+                    )
+                else:
+                    # Readers cannot be sent to a worker; it reopens the file
+                    group = [(pdf, password, None) for pdf, password, _ in group]
+                    outcome = executor.submit(
+                        _merge_group,
+                        group,
+                        spill_path,
+                        streaming,
+                        dedupe,
+                        max_open_files,
+                    )
+                scheduled.append((spill_path, outcome))
+
+            written: list[str] = []
+            pages = 0
+            for spill_path, outcome in scheduled:
+                if isinstance(outcome, Future):
+                    outcome = outcome.result()
+                wrong_password_files.extend(outcome["wrong_password_files"])
+                skipped_encrypted_files.extend(outcome["skipped_encrypted_files"])
+                deduplicated_objects += outcome["deduplicated_objects"]
+                bytes_saved += outcome["bytes_saved"]
+                if outcome["pages"]:
+                    written.append(spill_path)
+                    pages += outcome["pages"]
+            return written, pages
+
+        spills, pages = merge_level(_chunked(inputs, chunk_size))
+        while len(spills) > chunk_size:
+            merged = spills
+            spills, _ = merge_level(
+                _chunked(((path, None, None) for path in merged), chunk_size)
+            )
+            # Free the disk space of a level as soon as the next one is written
+            for path in merged:
+                os.remove(path)
+
+        if not spills:
+            return 0, deduplicated_objects, bytes_saved
+
+        if len(spills) == 1:
+            shutil.move(spills[0], output_file_path)
+        else:
+            outcome = _merge_group(
+                [(path, None, None) for path in spills],
+                output_file_path,
+                streaming,
+                dedupe,
+                max_open_files,
+            )
+            deduplicated_objects += outcome["deduplicated_objects"]
+            bytes_saved += outcome["bytes_saved"]
+
+        return pages, deduplicated_objects, bytes_saved
+
+
+def _chunked(items: Iterable[MergeInput], size: int) -> Iterator[Iterator[MergeInput]]:
+    """Split items into lazy groups of size; each group must be consumed in turn."""
+    iterator = iter(items)
+    for first in iterator:
+        yield chain([first], islice(iterator, size - 1))
 
 
 def batch_merge_pdfs(
@@ -17,6 +278,13 @@ def batch_merge_pdfs(
     new_name: str,
     output_dir: str | None,
     ask_password_callback: Callable[[str], str | None] | None,
+    jobs: int = 1,
+    scan_options: ScanOptions | None = None,
+    streaming: bool = False,
+    dedupe: bool = False,
+    read_ahead: int = 0,
+    chunk_size: int = 0,
+    max_open_files: int = 0,
 ) -> Result:
     """
     Merge multiple PDF files from a directory into a single PDF saved to the specified path.
@@ -28,6 +296,27 @@ def batch_merge_pdfs(
             If None, defaults to input directory path.
         ask_password_callback (Optional[Callable[[str], Optional[str]]]): Function to
             get password for encrypted PDFs. Receives file path, returns password or None.
+        jobs (int): Number of worker processes used to validate the PDFs before merging.
+            1 (default) validates serially; 0 uses one worker per CPU.
+        scan_options (Optional[ScanOptions]): Recursion, filters and ordering used to
+            collect the PDFs. Defaults to the directory's own *.pdf files in natural order.
+        streaming (bool): Write each PDF to the output as soon as it is read, so
+            memory use is bounded by the largest input. Bookmarks are not copied.
+        dedupe (bool): Write identical fonts, images and other resources shared by
+            the PDFs only once (uses the streaming merge). The bytes saved are
+            reported in the Result's 'bytes_saved' data.
+        read_ahead (int): Number of upcoming PDFs opened and parsed on background
+            threads while the current one is appended; the page order is unchanged.
+            Ignored when jobs is not 1.
+        chunk_size (int): Merge the PDFs in groups of this many into intermediate
+            files in a temporary directory, then merge those (again in groups if
+            needed), so no single merge holds more than chunk_size inputs open.
+            With jobs other than 1 the groups are merged in parallel. The page
+            order is the same as a direct merge. 0 (default) merges directly.
+        max_open_files (int): Keep the inputs on disk instead of in memory until
+            the output is written, with at most this many of them open at once;
+            the least recently used are closed and reopened when read again.
+            0 (default) keeps every input in memory.
 
     Returns:
         Result: Object indicating success or failure, with relevant message and error type.
@@ -45,24 +334,51 @@ def batch_merge_pdfs(
             message="Name of the merged PDF cannot be empty",
         )
 
+    if not os.path.isdir(input_dir_path):
+        return Result(
+            success=False,
+            title="Invalid directory",
+            message=f"The specified directory does not exist: {input_dir_path}",
+        )
+
+    if max_open_files < 0:
+        return Result(
+            success=False,
+            title="Invalid open file limit",
+            message="The open file limit must be at least 1 (or 0 for no limit).",
+        )
+
+    if chunk_size == 1 or chunk_size < 0:
+        return Result(
+            success=False,
+            title="Invalid chunk size",
+            message="Chunks must hold at least 2 PDFs (or 0 to merge directly).",
+        )
+
     output_dir = output_dir or input_dir_path
+    scan_options = scan_options or ScanOptions()
 
     if not new_name.endswith(".pdf"):
         new_name += ".pdf"
 
     output_file_path = os.path.abspath(os.path.join(output_dir, new_name))
-    pdf_files = [
-        os.path.abspath(os.path.join(input_dir_path, f))
-        for f in os.listdir(input_dir_path)
-        if f.lower().endswith(".pdf")
-    ]
-
-    if output_file_path in pdf_files:
-        return Result(
-            success=False,
-            title="Invalid output path",
-            message="Output file path cannot be same as any input file.",
-        )
+    pdf_files: Iterable[str] = (
+        os.path.abspath(entry.path)
+        for entry in scan_directory(input_dir_path, scan_options)
+    )
+
+    # Sorting and the parallel pre-scan need the full listing; otherwise the
+    # files are streamed and an output clashing with an input is caught below
+    # by the existence check.
+    if scan_options.sort_key is not None or jobs != 1:
+        pdf_files = list(pdf_files)
+
+        if output_file_path in pdf_files:
+            return Result(
+                success=False,
+                title="Invalid output path",
+                message="Output file path cannot be same as any input file.",
+            )
 
     if os.path.exists(output_file_path):
         return Result(
@@ -73,65 +389,72 @@ def batch_merge_pdfs(
     wrong_password_files: list[str] = []
     skipped_encrypted_files: list[str] = []
 
-    merger = PdfMerger()
+    merger: PdfMerger | StreamingPdfMerger | None = None
+    pool: ReaderPool | None = None
     try:
-        for pdf in pdf_files:
-            is_valid, status, error_message = validate_pdf_file(path=pdf)
-            password: str | None = None
-
-            # PDF is not valid AND it is corrupted or it is NOT a PDF
-            if (
-                not is_valid and status == PDFValidationStatus.CORRUPTED
-            ) or status == PDFValidationStatus.NOT_PDF:
-                invalid_files.append(pdf)
-                continue
+        pool = ReaderPool(max_open_files) if max_open_files else None
 
-            # PDF is encrypted
-            if status == PDFValidationStatus.ENCRYPTED:
-                # If user chooses to skip all the encrypted PDFs, then don't call the callback function
-                if ENCRYPTED_FILE_HANDLING == EncryptedFileHandling.SKIP_ALL:
-                    skipped_encrypted_files.append(pdf)
-                    continue
-
-                # Check if a callback function is provided or not
-                if ask_password_callback is None:
-                    skipped_encrypted_files.append(pdf)
-                    continue
-
-                password = ask_password_callback(pdf)
-
-                # If user chooses to skip the file, leave it
-                if ENCRYPTED_FILE_HANDLING == EncryptedFileHandling.SKIP:
-                    skipped_encrypted_files.append(pdf)
-                    continue
-
-                # Password not provided, append in skipped_encrypted_files and continue
-                if not password:
-                    skipped_encrypted_files.append(pdf)
-                    continue
-
-            reader = PdfReader(pdf)
-            if reader.is_encrypted:
-                if password is not None:
-                    decrypt_result: int = reader.decrypt(password=password)
-                    if decrypt_result == 0:
-                        wrong_password_files.append(pdf)
-                        continue
-                else:
-                    skipped_encrypted_files.append(pdf)
-                    continue
+        # Parallel pre-scan: classify every file up front, in input order
+        prescanned = (
+            validate_pdf_files(list(pdf_files), jobs=jobs) if jobs != 1 else None
+        )
 
-            merger.append(reader)
+        if prescanned is None:
+            # Pooled inputs are parsed once, on disk, and reused by the merge
+            open_reader = pool.open_reader if pool is not None else None
+            checked = (
+                (inspection.path, *inspection.as_tuple(), inspection.reader)
+                for inspection in inspect_pdfs_ahead(pdf_files, read_ahead, open_reader)
+            )
+        else:
+            checked = (
+                (pdf, *result, None) for pdf, result in zip(pdf_files, prescanned)
+            )
 
-        if len(merger.pages) == 0:  # No pages added
+        inputs = _accepted_inputs(
+            checked, ask_password_callback, invalid_files, skipped_encrypted_files
+        )
+
+        if chunk_size:
+            pages, deduplicated_objects, bytes_saved = _tree_merge(
+                inputs,
+                output_file_path,
+                chunk_size,
+                jobs,
+                streaming,
+                dedupe,
+                max_open_files,
+                wrong_password_files,
+                skipped_encrypted_files,
+            )
+        else:
+            merger = _create_merger(output_file_path, streaming, dedupe, pool)
+            for pdf, password, reader in inputs:
+                reader = _open_input(
+                    pdf,
+                    password,
+                    reader,
+                    wrong_password_files,
+                    skipped_encrypted_files,
+                    pool,
+                )
+                if reader is not None:
+                    merger.append(reader)
+                # Drop the reference so a streamed input is freed before the next one
+                reader = None
+            pages = len(merger.pages)
+            if pages:
+                merger.write(output_file_path)
+            deduplicated_objects = getattr(merger, "deduplicated_objects", 0)
+            bytes_saved = getattr(merger, "bytes_saved", 0)
+
+        if pages == 0:  # No pages added
             return Result(
                 success=False,
                 title="No valid PDFs",
                 message="No valid PDFs to merge in the directory.",
             )
 
-        merger.write(output_file_path)
-
         notes: list[str] = []
         if skipped_encrypted_files:
             skipped_names: str = ", ".join(
@@ -147,20 +470,33 @@ def batch_merge_pdfs(
             invalid_names = ", ".join(Path(f).name for f in invalid_files)
             notes.append(f"Invalid PDFs: {invalid_names}")
 
+        message = "PDFs merged successfully!"
+        data = {
+            "invalid_files": invalid_files,
+            "skipped_encrypted_files": skipped_encrypted_files,
+            "wrong_password_files": wrong_password_files,
+        }
+        if dedupe:
+            data["deduplicated_objects"] = deduplicated_objects
+            data["bytes_saved"] = bytes_saved
+            message += (
+                f" {deduplicated_objects} duplicate resources removed,"
+                f" saving {bytes_saved:,} bytes."
+            )
+
         return Result(
             success=True,
             title="Success",
-            message="PDFs merged successfully!",
+            message=message,
             error_type="info",
-            data={
-                "invalid_files": invalid_files,
-                "skipped_encrypted_files": skipped_encrypted_files,
-                "wrong_password_files": wrong_password_files,
-            },
+            data=data,
         )
 
     except Exception as e:
         return handle_exception(exc=e, context="Merging PDFs of a directory")
 
     finally:
-        merger.close()
+        if merger is not None:
+            merger.close()
+        if pool is not None:
+            pool.close()
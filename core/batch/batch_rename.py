@@ -2,13 +2,18 @@
 
 import os
 
+from core.dir_scanner import ScanOptions, scan_directory
 from core.error_handler import handle_exception
 from core.result import Result
-from core.utils import PDFValidationStatus, validate_pdf_file
+from core.utils import PDFValidationStatus, validate_pdf_files
 
 
 def batch_rename_pdfs(
-    input_dir: str, base_name: str, output_dir: str | None = None
+    input_dir: str,
+    base_name: str,
+    output_dir: str | None = None,
+    jobs: int = 1,
+    scan_options: ScanOptions | None = None,
 ) -> Result:
     """
     Rename all PDF files in the input directory with a base name and move them to the output directory.
@@ -17,6 +22,11 @@ def batch_rename_pdfs(
         input_dir (str): Directory containing PDF files to rename.
         base_name (str): Base name for the new PDF files (without '.pdf' extension).
         output_dir (Optional[str]): Directory to save renamed files; defaults to input_dir if not provided.
+        jobs (int): Number of worker processes used to validate the PDFs before renaming.
+            1 (default) validates serially; 0 uses one worker per CPU.
+        scan_options (Optional[ScanOptions]): Recursion, filters and ordering used to
+            collect the PDFs; also decides the numbering order. Defaults to the
+            directory's own *.pdf files in natural order.
 
     Returns:
         Result: Standardized result indicating success or failure, with a descriptive message.
@@ -40,11 +50,7 @@ def batch_rename_pdfs(
                 message=f"The specified directory does not exist: {output_dir}",
             )
 
-        pdf_files = [
-            os.path.join(input_dir, f)
-            for f in os.listdir(input_dir)
-            if f.lower().endswith(".pdf")
-        ]
+        pdf_files = [entry.path for entry in scan_directory(input_dir, scan_options)]
 
         if not pdf_files:
             return Result(
@@ -63,8 +69,7 @@ def batch_rename_pdfs(
                 message="New name for the PDFs cannot be empty",
             )
 
-        for file in pdf_files:
-            is_valid, status, error_message = validate_pdf_file(path=file)
+        for is_valid, status, error_message in validate_pdf_files(pdf_files, jobs=jobs):
             if (
                 not is_valid and status == PDFValidationStatus.CORRUPTED
             ) or status == PDFValidationStatus.NOT_PDF:
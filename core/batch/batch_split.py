@@ -1,34 +1,366 @@
 # Batch PDF split logic
 
 import os
-from typing import Callable
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Any, Callable
 
-from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2 import PageObject, PdfReader, PdfWriter
+from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
 
 from core.error_handler import handle_exception
 from core.globals import ENCRYPTED_FILE_HANDLING, EncryptedFileHandling
+from core.output_archive import (
+    Member,
+    MemoryOutput,
+    OutputArchive,
+    check_archive_target,
+    open_output,
+    output_label,
+)
+from core.output_stage import OutputStage, find_clash
+from core.page_selection import PageRange
+from core.pdf_compress import compression_note
+from core.resource_pruning import add_page, pruned_page, used_resources
 from core.result import Result
-from core.utils import PDFValidationStatus, validate_pdf_file
+from core.utils import PDFValidationStatus, inspect_pdf, probe_page_count
+
+# Chunks of pages handed to each worker; more batches than workers keep them
+# all busy when some pages are much heavier than others
+PARTITIONS_PER_WORKER = 4
+
+# Bytes of a written PDF that do not belong to any object (header, trailer...)
+FILE_OVERHEAD_BYTES = 256
+
+# Bytes written around each object ("n 0 obj", "endobj", its xref entry and
+# its reference in the page tree or a dictionary)
+OBJECT_OVERHEAD_BYTES = 48
+
+# Bytes written around the data of a stream ("stream", "endstream")
+STREAM_OVERHEAD_BYTES = 18
+
+# Keys not followed when measuring a page: they lead back to the page tree
+_BACK_REFERENCES = ("/Parent", "/P")
+
+# (start, stop) 0-based page indexes of the pages written to one file
+Chunk = tuple[int, int]
+
+# Where the files are written: a staging directory, an archive, or memory
+Output = OutputStage | OutputArchive | MemoryOutput
+
+# 0-based page index -> used_resources() of the page, measured once by the
+# size estimate and reused when the page is written
+PageResources = dict[int, dict[str, set[str]] | None]
+
+
+def _chunk_filename(basename: str, chunk: Chunk) -> str:
+    """<basename>_page_<n>.pdf for one page, <basename>_pages_<a>-<b>.pdf otherwise."""
+    start, stop = chunk
+    return f"{basename}_{PageRange(start + 1, stop).file_suffix()}.pdf"
+
+
+def _chunk_pages(chunk: Chunk) -> list[int]:
+    """1-based page numbers of a chunk."""
+    return list(range(chunk[0] + 1, chunk[1] + 1))
+
+
+def _fixed_chunks(page_count: int, pages_per_file: int) -> list[Chunk]:
+    return [
+        (start, min(start + pages_per_file, page_count))
+        for start in range(0, page_count, pages_per_file)
+    ]
+
+
+def _serialized_size(obj: Any) -> int:
+    """Bytes PdfWriter writes for obj; stream data is counted, not serialized."""
+    buffer = BytesIO()
+    if isinstance(obj, StreamObject):
+        DictionaryObject(obj).write_to_stream(buffer, None)
+        return buffer.tell() + len(obj._data) + STREAM_OVERHEAD_BYTES
+    obj.write_to_stream(buffer, None)
+    return buffer.tell()
+
+
+class _ChunkSizeEstimator:
+    def __init__(self):
+        """
+        Estimate the size of the file being written, one added page at a time.
+
+        Each object is measured once, when it first enters the current file;
+        objects shared by the pages of a file (fonts, images...) are counted
+        once per file, and the file itself is never serialized to be measured.
+
+        Attributes:
+            size (int): Estimated size in bytes of the current file.
+
+        Methods:
+            page_cost(page): Bytes the page would add to the current file.
+            add(page): Count the page in the current file.
+            start_chunk(): Start counting a new, empty file.
+        """
+
+        self._seen: set[tuple[int, int]] = set()
+        # (page id, new objects, cost) measured by the last page_cost() call
+        self._pending: tuple[int, dict[tuple[int, int], int], int] | None = None
+        self.size = FILE_OVERHEAD_BYTES
+
+    def start_chunk(self) -> None:
+        self._seen = set()
+        self._pending = None
+        self.size = FILE_OVERHEAD_BYTES
+
+    def _new_objects(self, page: PageObject) -> dict[tuple[int, int], int]:
+        """Size of every object reachable from page that the file does not hold yet."""
+        found: dict[tuple[int, int], int] = {}
+        pending: list[Any] = [page]
+        while pending:
+            obj = pending.pop()
+            if isinstance(obj, IndirectObject):
+                key = (obj.idnum, obj.generation)
+                if key in self._seen or key in found:
+                    continue
+                obj = obj.get_object()
+                found[key] = _serialized_size(obj) + OBJECT_OVERHEAD_BYTES
+
+            if isinstance(obj, DictionaryObject):
+                pending.extend(
+                    obj.raw_get(key) for key in obj if key not in _BACK_REFERENCES
+                )
+            elif isinstance(obj, ArrayObject):
+                pending.extend(obj)
+        return found
+
+    def page_cost(self, page: PageObject) -> int:
+        found = self._new_objects(page)
+        # The page dictionary itself is written as a new object
+        cost = _serialized_size(page) + OBJECT_OVERHEAD_BYTES + sum(found.values())
+        self._pending = (id(page), found, cost)
+        return cost
+
+    def add(self, page: PageObject) -> None:
+        if self._pending is None or self._pending[0] != id(page):
+            self.page_cost(page)
+        _, found, cost = self._pending
+        self._pending = None
+        self._seen.update(found)
+        self.size += cost
+
+
+def _write_chunks(
+    reader: PdfReader,
+    chunks: list[Chunk],
+    output: Output,
+    basename: str,
+    compress_level: int | None,
+    prune_resources: bool,
+    used: PageResources | None = None,
+) -> tuple[list[str], int, int, int]:
+    """
+    Write each chunk of pages of reader to its own PDF.
+
+    With used, the resources of each page are pruned without scanning its
+    content again.
+
+    Returns:
+        tuple[list[str], int, int, int]: The file names written, in page order,
+            their total size in bytes without and with packing, and the
+            number of unused resource entries dropped.
+    """
+    saved_files: list[str] = []
+    bytes_before = bytes_after = pruned_resources = 0
+    for chunk in chunks:
+        writer = PdfWriter()
+        for index in range(*chunk):
+            page = reader.pages[index]
+            if used is not None and used[index] is None:
+                # Known not to be prunable
+                writer.add_page(page)
+            else:
+                pruned_resources += add_page(
+                    writer, page, prune_resources, used[index] if used else None
+                )
+
+        filename = _chunk_filename(basename, chunk)
+        before, after = output.write_pdf(
+            writer, filename, _chunk_pages(chunk), compress_level
+        )
+        bytes_before += before
+        bytes_after += after
+        saved_files.append(filename)
+    return saved_files, bytes_before, bytes_after, pruned_resources
+
+
+def _size_chunks(
+    reader: PdfReader,
+    page_count: int,
+    max_bytes: int,
+    pages_per_file: int,
+    prune_resources: bool,
+) -> tuple[list[Chunk], PageResources | None]:
+    """
+    Group the pages into chunks, rolling over before one would exceed max_bytes.
+
+    A chunk is also closed once it holds pages_per_file pages. A page that
+    alone exceeds max_bytes gets a chunk of its own. Nothing is written: the
+    sizes are estimated from the source objects, pruned if prune_resources is
+    set.
+
+    Returns:
+        tuple[list[Chunk], PageResources | None]: The chunks, and the
+            resources used by each page if prune_resources is set.
+    """
+    estimator = _ChunkSizeEstimator()
+    chunks: list[Chunk] = []
+    used: PageResources | None = {} if prune_resources else None
+    first = 0
+    for index in range(page_count):
+        page = reader.pages[index]
+        if used is not None:
+            used[index] = used_resources(page)
+            if used[index] is not None:
+                page, _ = pruned_page(page, used[index])
+
+        held = index - first
+        if held and (
+            held == pages_per_file
+            or estimator.size + estimator.page_cost(page) > max_bytes
+        ):
+            chunks.append((first, index))
+            first = index
+            estimator.start_chunk()
+
+        estimator.add(page)
+
+    if page_count:
+        chunks.append((first, page_count))
+    return chunks, used
+
+
+_worker_reader: PdfReader | None = None
+
+
+def _init_split_worker(file_path: str, password: str | None) -> None:
+    """
+    Open (and decrypt) the PDF once per worker process.
+    """
+    global _worker_reader
+    _worker_reader = PdfReader(file_path)
+    if _worker_reader.is_encrypted:
+        _worker_reader.decrypt(password or "")
+
+
+def _write_chunks_in_worker(
+    chunks: list[Chunk],
+    output: Output,
+    basename: str,
+    compress_level: int | None,
+    prune_resources: bool,
+    used: PageResources | None = None,
+) -> tuple[tuple[list[str], int, int, int], list[Member]]:
+    """
+    Write chunks from the worker's reader; files written to a MemoryOutput
+    are sent back to be added to the archive.
+    """
+    written = _write_chunks(
+        _worker_reader,
+        chunks,
+        output,
+        basename,
+        compress_level,
+        prune_resources,
+        used,
+    )
+    members = output.members if isinstance(output, MemoryOutput) else []
+    return written, members
+
+
+def _batch_resources(
+    used: PageResources | None, batch: list[Chunk]
+) -> PageResources | None:
+    """The entries of used for the pages of a batch, sent along with it."""
+    if used is None:
+        return None
+    return {index: used[index] for chunk in batch for index in range(*chunk)}
+
+
+def _partitions(chunks: list[Chunk], workers: int) -> list[list[Chunk]]:
+    """Split the chunks into contiguous batches for the workers."""
+    size = max(1, -(-len(chunks) // (workers * PARTITIONS_PER_WORKER)))
+    return [chunks[start : start + size] for start in range(0, len(chunks), size)]
 
 
 def batch_split_pdf(
     file_path: str,
     output_dir: str | None = None,
     ask_password_callback: Callable[[str], str | None] | None = None,
+    compress_level: int | None = None,
+    jobs: int = 1,
+    prune_resources: bool = True,
+    pages_per_file: int = 1,
+    max_bytes: int | None = None,
+    archive: str | None = None,
+    archive_format: str | None = None,
 ) -> Result:
     """
     Split a PDF file into multiple single-page PDF files saved in the specified directory.
 
+    With pages_per_file, every file holds that many consecutive pages; with
+    max_bytes, pages are streamed into the current file until the next one
+    would make it larger than max_bytes. Files holding several pages are
+    named <basename>_pages_<first>-<last>.pdf.
+
+    All the output names are checked against the output directory before
+    anything is written; the files are written to a staging directory and
+    published together, so a failed run leaves no files behind.
+
     Args:
         file_path (str): Path to the input PDF file to be split.
         output_dir (Optional[str]): Directory to save the split PDF files.
             Defaults to the directory of the input file if not provided.
+        compress_level (Optional[int]): Pack the output PDFs into compressed object
+            streams with a cross-reference stream, using this zlib level (0-9).
+            The byte counts with and without packing are reported in the
+            Result's 'bytes_before' and 'bytes_after' data.
+        jobs (int): Number of worker processes writing the pages. Each one opens
+            the PDF itself and writes contiguous ranges of pages; file names
+            and their order in the Result are the same as with one process.
+            1 (default) writes the pages in this process; 0 uses one worker per CPU.
+        prune_resources (bool): Copy only the fonts, images and graphics states
+            each page draws with, instead of its whole (often document-wide)
+            resource dictionary. The number of entries dropped is reported in
+            the Result's 'pruned_resources' data.
+        pages_per_file (int): Number of consecutive pages written to each file.
+        max_bytes (Optional[int]): Start a new file before the current one would
+            exceed this many bytes. The size is estimated incrementally from the
+            size of each page's objects in the source file, counting objects
+            shared by the pages of a file once. A page larger than max_bytes on
+            its own gets a file of its own. The files are known from these
+            estimates before anything is written.
+        archive (Optional[str]): Write the files into this .zip or .tar archive
+            (or "-" for stdout, as tar) instead of to output_dir, with a
+            manifest of the source pages of each; see core.output_archive.
+            Workers send the files they write back to be added in page order.
+        archive_format (Optional[str]): "zip" or "tar", when it cannot be told
+            from the archive's extension.
 
     Returns:
         Result: Standardized Result object indicating success or failure.
-            On success, includes a list of the created single-page PDF filenames in 'data'.
+            On success, includes a list of the created PDF filenames in 'data'.
     """
+    if pages_per_file < 1 or (max_bytes is not None and max_bytes < 1):
+        return Result(
+            success=False,
+            error_type="error",
+            title="Invalid chunk size",
+            message="Files must hold at least one page and one byte.",
+        )
+
     try:
+        if archive is not None:
+            failure = check_archive_target(archive, archive_format)
+            if failure is not None:
+                return failure
+
         if not os.path.isfile(file_path):
             return Result(
                 success=False,
@@ -38,7 +370,7 @@ def batch_split_pdf(
             )
 
         output_dir = output_dir if output_dir else os.path.dirname(file_path)
-        if not os.path.isdir(output_dir):
+        if archive is None and not os.path.isdir(output_dir):
             return Result(
                 success=False,
                 error_type="error",
@@ -53,7 +385,8 @@ def batch_split_pdf(
                 title="Invalid file",
                 message="Selected file is not a PDF",
             )
-        is_valid, status, error_message = validate_pdf_file(path=file_path)
+        inspection = inspect_pdf(path=file_path)
+        is_valid, status, error_message = inspection.as_tuple()
 
         password: str | None = None
 
@@ -99,7 +432,7 @@ def batch_split_pdf(
                     error_type="error",
                 )
 
-        reader = PdfReader(file_path)
+        reader = inspection.reader
         if reader.is_encrypted:
             if not password:
                 return Result(
@@ -117,35 +450,103 @@ def batch_split_pdf(
                 )
 
         basename = os.path.splitext(os.path.basename(file_path))[0]
+        page_count = probe_page_count(reader)
 
-        saved_files = []
-
-        for i, page in enumerate(reader.pages, start=1):
-            writer = PdfWriter()
-            writer.add_page(page)
-
-            filename = f"{basename}_page_{i}.pdf"
-            output_path = os.path.join(output_dir, filename)
+        if max_bytes is None:
+            chunks = _fixed_chunks(page_count, pages_per_file)
+            used = None
+        else:
+            chunks, used = _size_chunks(
+                reader, page_count, max_bytes, pages_per_file, prune_resources
+            )
+        clash = (
+            find_clash(
+                output_dir, (_chunk_filename(basename, chunk) for chunk in chunks)
+            )
+            if archive is None
+            else None
+        )
+        if clash is not None:
+            return Result(
+                success=False,
+                error_type="error",
+                title="File Exists",
+                message=f"File '{clash}' already exists in the output directory.",
+            )
 
-            if os.path.exists(output_path):
-                return Result(
-                    success=False,
-                    error_type="error",
-                    title="File Exists",
-                    message=f"File '{filename}' already exists in the output directory.",
+        workers = min(jobs or os.cpu_count() or 1, page_count)
+        with open_output(output_dir, archive, archive_format, file_path) as output:
+            if workers <= 1 or len(chunks) <= 1:
+                (
+                    saved_files,
+                    bytes_before,
+                    bytes_after,
+                    pruned_resources,
+                ) = _write_chunks(
+                    reader,
+                    chunks,
+                    output,
+                    basename,
+                    compress_level,
+                    prune_resources,
+                    used,
                 )
+            else:
+                # The workers open the file themselves; the reader stays here
+                inspection = reader = None
+                saved_files = []
+                bytes_before = bytes_after = pruned_resources = 0
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_split_worker,
+                    initargs=(file_path, password),
+                ) as executor:
+                    futures = [
+                        executor.submit(
+                            _write_chunks_in_worker,
+                            batch,
+                            output if archive is None else MemoryOutput(),
+                            basename,
+                            compress_level,
+                            prune_resources,
+                            _batch_resources(used, batch),
+                        )
+                        for batch in _partitions(chunks, workers)
+                    ]
+                    # Collected in submission order, so files stay in page order
+                    for future in futures:
+                        (files, before, after, pruned), members = future.result()
+                        for member in members:
+                            output.add(*member)
+                        saved_files.extend(files)
+                        bytes_before += before
+                        bytes_after += after
+                        pruned_resources += pruned
 
-            with open(output_path, "wb") as out_pdf:
-                writer.write(out_pdf)
+            output.publish(saved_files)
 
-            saved_files.append(filename)
+        kind = (
+            "single-page PDF files"
+            if pages_per_file == 1 and max_bytes is None
+            else "PDF files"
+        )
+        message = f"PDF successfully split into {len(saved_files)} {kind} and saved to {output_label(output_dir, archive)}."
+        data = {"files": saved_files}
+        if archive is not None:
+            data["archive"] = archive
+        if prune_resources:
+            data["pruned_resources"] = pruned_resources
+        if compress_level is not None:
+            message += " " + compression_note(bytes_before, bytes_after)
+            data["bytes_before"] = bytes_before
+            data["bytes_after"] = bytes_after
 
         return Result(
             success=True,
             error_type="info",
             title="Success",
-            message=f"PDF successfully split into {len(saved_files)} single-page PDF files and saved to {output_dir}.",
-            data={"files": saved_files},
+            message=message,
+            data=data,
         )
 
     except Exception as e:
@@ -0,0 +1,257 @@
+# Hot-folder batch logic
+
+"""
+Watch-mode variants of the batch operations.
+
+Each function blocks on a FolderWatcher and runs the existing single-file
+core operation on every batch of newly arrived PDFs, reporting each Result
+through on_result. Outputs written into the watched directory are
+registered with the watcher so they are never picked up as arrivals.
+Watching stops when stop_event is set or on KeyboardInterrupt.
+"""
+
+import os
+import threading
+from typing import Callable
+
+from core.batch.batch_split import batch_split_pdf
+from core.pdf_merge import merge_pdf
+from core.pdf_rename import rename_pdf_file
+from core.result import Result
+from core.watcher import FolderWatcher
+
+
+class _NumberedPaths:
+    def __init__(self, directory: str, base_name: str):
+        """
+        Hand out "<base_name>_<n>.pdf" paths in a directory that do not exist yet.
+
+        Attributes:
+            directory (str): Directory the paths are created in.
+            base_name (str): File name prefix, without the '.pdf' extension.
+        """
+
+        self.directory = directory
+        self.base_name = base_name
+        self._next = 1
+
+    def next_path(self) -> str:
+        while True:
+            path = os.path.join(self.directory, f"{self.base_name}_{self._next}.pdf")
+            self._next += 1
+            if not os.path.exists(path):
+                return path
+
+
+def _strip_pdf_extension(name: str) -> str:
+    return name[:-4] if name.lower().endswith(".pdf") else name
+
+
+def _invalid_watch_args(directory: str, output_dir: str | None) -> Result | None:
+    for path in (directory, output_dir):
+        if path is not None and not os.path.isdir(path):
+            return Result(
+                success=False,
+                error_type="error",
+                title="Invalid directory",
+                message=f"The specified directory does not exist: {path}",
+            )
+    return None
+
+
+def _run_watcher(
+    watcher: FolderWatcher,
+    handle: Callable[[list[str]], None],
+    stop_event: threading.Event | None,
+) -> None:
+    try:
+        watcher.watch(handle, stop_event=stop_event)
+    except KeyboardInterrupt:
+        pass
+
+
+def _stopped_result(watcher: FolderWatcher, processed: int) -> Result:
+    return Result(
+        success=True,
+        error_type="info",
+        title="Watch stopped",
+        message=f"Stopped watching {watcher.directory}: {processed} new PDF files processed.",
+        data={"processed": processed},
+    )
+
+
+def watch_batch_merge(
+    watcher: FolderWatcher,
+    new_name: str,
+    output_dir: str | None,
+    ask_password_callback: Callable[[str], str | None] | None,
+    on_result: Callable[[Result], None],
+    stop_event: threading.Event | None = None,
+    streaming: bool = False,
+    dedupe: bool = False,
+    read_ahead: int = 0,
+    max_open_files: int = 0,
+) -> Result:
+    """
+    Merge each batch of newly arrived PDFs into a new numbered PDF.
+
+    Every batch of files that settle together is merged into
+    "<new_name>_<n>.pdf", using the first free n in the output directory.
+
+    Args:
+        watcher (FolderWatcher): Watcher of the input directory.
+        new_name (str): Base name of the merged PDFs.
+        output_dir (Optional[str]): Directory to save the merged PDFs; defaults to the watched directory.
+        ask_password_callback (Optional[Callable[[str], Optional[str]]]): Function to
+            get password for encrypted PDFs.
+        on_result (Callable[[Result], None]): Receives the Result of every merge.
+        stop_event (Optional[threading.Event]): Set it to stop watching.
+        streaming (bool): Use the bounded-memory streaming merge.
+        dedupe, read_ahead, max_open_files: Passed to merge_pdf() for every batch.
+
+    Returns:
+        Result: Failure for invalid arguments; otherwise a summary once watching stops.
+    """
+    new_name = _strip_pdf_extension(new_name or "")
+    if not new_name.strip():
+        return Result(
+            success=False,
+            title="Invalid name",
+            message="Name of the merged PDF cannot be empty",
+        )
+
+    invalid = _invalid_watch_args(watcher.directory, output_dir)
+    if invalid:
+        return invalid
+
+    outputs = _NumberedPaths(output_dir or watcher.directory, new_name)
+    processed = 0
+
+    def handle(arrivals: list[str]) -> None:
+        nonlocal processed
+        output_file_path = outputs.next_path()
+        watcher.ignore(output_file_path)
+        on_result(
+            merge_pdf(
+                arrivals,
+                output_file_path,
+                ask_password_callback,
+                streaming,
+                dedupe=dedupe,
+                read_ahead=read_ahead,
+                max_open_files=max_open_files,
+            )
+        )
+        processed += len(arrivals)
+
+    _run_watcher(watcher, handle, stop_event)
+    return _stopped_result(watcher, processed)
+
+
+def watch_batch_split(
+    watcher: FolderWatcher,
+    output_dir: str | None,
+    ask_password_callback: Callable[[str], str | None] | None,
+    on_result: Callable[[Result], None],
+    stop_event: threading.Event | None = None,
+    compress_level: int | None = None,
+    jobs: int = 1,
+    prune_resources: bool = True,
+    pages_per_file: int = 1,
+    max_bytes: int | None = None,
+) -> Result:
+    """
+    Split every newly arrived PDF, by default into single-page PDFs.
+
+    Args:
+        watcher (FolderWatcher): Watcher of the input directory.
+        output_dir (Optional[str]): Directory to save the page PDFs; defaults to
+            the directory of each arrived file.
+        ask_password_callback (Optional[Callable[[str], Optional[str]]]): Function to
+            get password for encrypted PDFs.
+        on_result (Callable[[Result], None]): Receives the Result of every split.
+        stop_event (Optional[threading.Event]): Set it to stop watching.
+        compress_level, jobs, prune_resources, pages_per_file, max_bytes:
+            Passed to batch_split_pdf() for every arrived file.
+
+    Returns:
+        Result: Failure for invalid arguments; otherwise a summary once watching stops.
+    """
+    invalid = _invalid_watch_args(watcher.directory, output_dir)
+    if invalid:
+        return invalid
+
+    processed = 0
+
+    def handle(arrivals: list[str]) -> None:
+        nonlocal processed
+        for pdf in arrivals:
+            target_dir = output_dir or os.path.dirname(pdf)
+            result = batch_split_pdf(
+                pdf,
+                target_dir,
+                ask_password_callback,
+                compress_level=compress_level,
+                jobs=jobs,
+                prune_resources=prune_resources,
+                pages_per_file=pages_per_file,
+                max_bytes=max_bytes,
+            )
+            for filename in (result.data or {}).get("files", []):
+                watcher.ignore(os.path.join(target_dir, filename))
+            on_result(result)
+            processed += 1
+
+    _run_watcher(watcher, handle, stop_event)
+    return _stopped_result(watcher, processed)
+
+
+def watch_batch_rename(
+    watcher: FolderWatcher,
+    base_name: str,
+    output_dir: str | None,
+    on_result: Callable[[Result], None],
+    stop_event: threading.Event | None = None,
+) -> Result:
+    """
+    Rename every newly arrived PDF to "<base_name>_<n>.pdf".
+
+    Numbering continues after the PDFs already named that way in the output
+    directory, skipping numbers that are taken.
+
+    Args:
+        watcher (FolderWatcher): Watcher of the input directory.
+        base_name (str): Base name for the renamed PDFs.
+        output_dir (Optional[str]): Directory to move the renamed PDFs to; defaults to the watched directory.
+        on_result (Callable[[Result], None]): Receives the Result of every rename.
+        stop_event (Optional[threading.Event]): Set it to stop watching.
+
+    Returns:
+        Result: Failure for invalid arguments; otherwise a summary once watching stops.
+    """
+    base_name = _strip_pdf_extension(base_name or "")
+    if not base_name.strip():
+        return Result(
+            success=False,
+            title="Invalid name",
+            message="New name for the PDFs cannot be empty",
+        )
+
+    invalid = _invalid_watch_args(watcher.directory, output_dir)
+    if invalid:
+        return invalid
+
+    output_dir = output_dir or watcher.directory
+    outputs = _NumberedPaths(output_dir, base_name)
+    processed = 0
+
+    def handle(arrivals: list[str]) -> None:
+        nonlocal processed
+        for pdf in arrivals:
+            new_path = outputs.next_path()
+            watcher.ignore(new_path)
+            on_result(rename_pdf_file(pdf, output_dir, os.path.basename(new_path)))
+            processed += 1
+
+    _run_watcher(watcher, handle, stop_event)
+    return _stopped_result(watcher, processed)
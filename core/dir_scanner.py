@@ -0,0 +1,187 @@
+# Directory scanning for batch operations
+
+"""
+Shared os.scandir-based directory scanner used by the batch operations.
+
+Entries are yielded lazily as os.DirEntry objects, whose stat() results are
+cached, so filters and later consumers do not pay for another stat call.
+Sorting (natural order by default) needs every name up front; pass
+sort_key=None to stream entries in filesystem order instead.
+"""
+
+import os
+import re
+from fnmatch import fnmatch
+from typing import Any, Callable, Iterator
+
+_DIGITS = re.compile(r"(\d+)")
+
+
+def natural_sort_key(text: str) -> list[Any]:
+    """
+    Key for "human" ordering, e.g. file2.pdf before file10.pdf.
+
+    Args:
+        text (str): The string to build the key for.
+
+    Returns:
+        list[Any]: Alternating lower-cased text and integer chunks.
+    """
+    return [
+        int(chunk) if chunk.isdigit() else chunk.lower()
+        for chunk in _DIGITS.split(text)
+    ]
+
+
+def natural_entry_key(entry: os.DirEntry) -> list[Any]:
+    """Natural sort key of a directory entry's path."""
+    return natural_sort_key(entry.path)
+
+
+SORT_KEYS: dict[str, Callable[[os.DirEntry], Any] | None] = {
+    "natural": natural_entry_key,
+    "name": lambda entry: entry.path,
+    "mtime": lambda entry: entry.stat().st_mtime_ns,
+    "size": lambda entry: entry.stat().st_size,
+    "none": None,
+}
+
+
+class ScanOptions:
+    def __init__(
+        self,
+        recursive: bool = False,
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        min_size: int | None = None,
+        max_size: int | None = None,
+        modified_after: float | None = None,
+        modified_before: float | None = None,
+        sort_key: Callable[[os.DirEntry], Any] | None = natural_entry_key,
+    ):
+        """
+        Filters and ordering applied by scan_directory().
+
+        Attributes:
+            recursive (bool): Descend into sub-directories (symlinked directories are not followed).
+            include (list[str]): Glob patterns a file name must match; defaults to ["*.pdf"].
+                Matching is case-insensitive.
+            exclude (list[str]): Glob patterns matched against the name and the path
+                relative to the scanned directory; matching files and directories are skipped.
+            min_size (int | None): Minimum file size in bytes.
+            max_size (int | None): Maximum file size in bytes.
+            modified_after (float | None): Only files modified at or after this POSIX timestamp.
+            modified_before (float | None): Only files modified at or before this POSIX timestamp.
+            sort_key (Callable | None): Key applied to the entries; natural path order by
+                default. None streams entries in filesystem order without listing first.
+        """
+
+        self.recursive = recursive
+        self.include = [p.lower() for p in (include or ["*.pdf"])]
+        self.exclude = [p.lower() for p in (exclude or [])]
+        self.min_size = min_size
+        self.max_size = max_size
+        self.modified_after = modified_after
+        self.modified_before = modified_before
+        self.sort_key = sort_key
+
+    @property
+    def needs_stat(self) -> bool:
+        return any(
+            value is not None
+            for value in (
+                self.min_size,
+                self.max_size,
+                self.modified_after,
+                self.modified_before,
+            )
+        )
+
+    def is_excluded(self, name: str, relative_path: str) -> bool:
+        name = name.lower()
+        relative_path = relative_path.lower()
+        return any(
+            fnmatch(name, pattern) or fnmatch(relative_path, pattern)
+            for pattern in self.exclude
+        )
+
+    def accepts(self, entry: os.DirEntry) -> bool:
+        return self.matches(entry.name, entry.stat)
+
+    def matches(self, name: str, get_stat: Callable[[], os.stat_result]) -> bool:
+        """
+        Check a file name against the include globs and, if needed, its stat against the filters.
+
+        Args:
+            name (str): File name (without directory).
+            get_stat (Callable[[], os.stat_result]): Returns the file's stat; only
+                called when a size or mtime filter is set.
+
+        Returns:
+            bool: True if the file passes every filter.
+        """
+        name = name.lower()
+        if not any(fnmatch(name, pattern) for pattern in self.include):
+            return False
+
+        if self.needs_stat:
+            stat = get_stat()
+            if self.min_size is not None and stat.st_size < self.min_size:
+                return False
+            if self.max_size is not None and stat.st_size > self.max_size:
+                return False
+            if self.modified_after is not None and stat.st_mtime < self.modified_after:
+                return False
+            if (
+                self.modified_before is not None
+                and stat.st_mtime > self.modified_before
+            ):
+                return False
+
+        return True
+
+
+def _walk(directory: str, options: ScanOptions, prefix: str) -> Iterator[os.DirEntry]:
+    with os.scandir(directory) as entries:
+        subdirectories: list[os.DirEntry] = []
+
+        for entry in entries:
+            relative_path = f"{prefix}{entry.name}"
+            if options.is_excluded(entry.name, relative_path):
+                continue
+
+            if entry.is_dir(follow_symlinks=False):
+                if options.recursive:
+                    subdirectories.append(entry)
+            elif entry.is_file() and options.accepts(entry):
+                yield entry
+
+    # Descend after closing the parent handle to keep one directory fd open
+    for subdirectory in subdirectories:
+        yield from _walk(subdirectory.path, options, f"{prefix}{subdirectory.name}/")
+
+
+def scan_directory(
+    directory: str, options: ScanOptions | None = None
+) -> Iterator[os.DirEntry]:
+    """
+    Yield the files of a directory that pass the scan options.
+
+    Args:
+        directory (str): Directory to scan.
+        options (ScanOptions | None): Filters and ordering; defaults to
+            non-recursive, "*.pdf", natural order.
+
+    Returns:
+        Iterator[os.DirEntry]: Matching file entries, with cached stat results.
+
+    Raises:
+        OSError: If the directory cannot be read.
+    """
+    options = options or ScanOptions()
+    entries = _walk(directory, options, "")
+
+    if options.sort_key is None:
+        yield from entries
+    else:
+        yield from sorted(entries, key=options.sort_key)
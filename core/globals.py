@@ -22,3 +22,6 @@ class EncryptedFileHandling(Enum):
 
 
 ENCRYPTED_FILE_HANDLING = EncryptedFileHandling.ASK
+
+# Consult and update the persistent validation cache (core/validation_cache.py)
+USE_VALIDATION_CACHE = True
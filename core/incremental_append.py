@@ -0,0 +1,304 @@
+# Incremental-update PDF append
+
+"""
+Append pages to an existing PDF with an incremental update.
+
+Rewriting a large PDF to add a few pages costs as much as the whole
+document. An incremental update (PDF 1.7, section 7.5.6) instead leaves the
+existing bytes untouched and appends to the end of the file:
+
+  - the new pages and everything they reference, as new objects;
+  - a new /Pages node holding the new pages;
+  - a new version of the root /Pages node, with that node added to its kids;
+  - a cross-reference section for these objects and a trailer whose /Prev
+    points at the previous cross-reference section.
+
+The cost is proportional to the appended pages (plus the root /Pages node).
+The new section is a classic cross-reference table, or a cross-reference
+stream when the existing file ends with one. Should the append fail, the file
+is truncated back to its original length.
+"""
+
+import os
+import re
+import zlib
+from typing import Any, BinaryIO, Callable
+
+from PyPDF2 import PdfReader
+from PyPDF2.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NumberObject,
+    read_object,
+)
+
+from core.streaming_merger import StreamingPdfMerger
+
+# Page attributes a page inherits from its ancestors in the page tree (the
+# ones PdfReader copies into its pages), with the value a page has when no
+# ancestor sets them. /MediaBox is also inheritable, but it is required and
+# every page of a PdfReader has its own, so it needs no default.
+INHERITABLE_DEFAULTS: dict[str, Callable[[DictionaryObject], Any]] = {
+    "/Resources": lambda page: DictionaryObject(),
+    "/CropBox": lambda page: page.get("/MediaBox"),
+    "/Rotate": lambda page: NumberObject(0),
+}
+
+# The last "startxref" is within this many bytes of the end of the file
+_TAIL_WINDOW = 4096
+
+_STARTXREF_OFFSET = re.compile(rb"startxref\s+(\d+)")
+
+
+def _read_startxref(stream: BinaryIO) -> tuple[int, bool]:
+    """Return the offset of the last cross-reference section and whether it is a table."""
+    size = stream.seek(0, os.SEEK_END)
+    stream.seek(max(0, size - _TAIL_WINDOW))
+    matches = list(_STARTXREF_OFFSET.finditer(stream.read()))
+    if not matches:
+        raise ValueError("The PDF has no startxref")
+
+    offset = int(matches[-1].group(1))
+    stream.seek(offset)
+    return offset, stream.read(32).lstrip().startswith(b"xref")
+
+
+def _trailer_size(
+    reader: PdfReader, stream: BinaryIO, xref_offset: int, is_table: bool
+) -> int:
+    """/Size of the last trailer, read from the xref stream dictionary if there is one."""
+    if is_table:
+        return int(reader.trailer.get("/Size", 0))
+    # PdfReader does not copy /Size from xref streams into reader.trailer
+    stream.seek(xref_offset)
+    reader.read_object_header(stream)
+    xref_stream = read_object(stream, reader)
+    if not isinstance(xref_stream, DictionaryObject) or "/Size" not in xref_stream:
+        raise ValueError("The cross-reference stream has no /Size")
+    return int(xref_stream["/Size"])
+
+
+class IncrementalPdfAppender(StreamingPdfMerger):
+    def __init__(self, output_file_path: str, dedupe: bool = False):
+        """
+        Append pages to the existing PDF output_file_path as an incremental update.
+
+        The existing document is only read for its trailer, catalog and root
+        page tree node. Appended data goes straight to the end of the file;
+        write() completes the update and close() without write() truncates
+        the file back to its original length.
+
+        Attributes:
+            output_file_path (str): The existing PDF to append to.
+            dedupe (bool): Write identical stream objects of the new pages only once.
+            pages (list[int]): Object numbers of the appended pages, in order.
+            existing_pages (int): Page count of the document before the update.
+
+        Methods:
+            append(reader, pages): Copy the pages of a reader to the end of the file.
+            write(output_file_path): Write the new page tree node, xref section and trailer.
+            close(): Undo the partial update if write() was not called.
+
+        Raises:
+            ValueError: If the file is encrypted or its structure cannot be read.
+        """
+
+        super().__init__(output_file_path, dedupe=dedupe)
+
+        with open(output_file_path, "rb") as f:
+            reader = PdfReader(f)
+            if reader.is_encrypted:
+                raise ValueError("Cannot append to an encrypted PDF")
+
+            self._prev_xref, self._xref_is_table = _read_startxref(f)
+            size = _trailer_size(reader, f, self._prev_xref, self._xref_is_table)
+            self._trailer = {
+                key: reader.trailer.raw_get(key)
+                for key in ("/Root", "/Info", "/ID")
+                if key in reader.trailer
+            }
+            pages_reference = reader.trailer["/Root"].get_object().raw_get("/Pages")
+            if not isinstance(pages_reference, IndirectObject):
+                raise ValueError("The root page tree node is not an indirect object")
+            page_tree = pages_reference.get_object()
+            # Numbers a damaged /Size would not cover are not reused either
+            numbers = [number for section in reader.xref.values() for number in section]
+            numbers.extend(reader.xref_objStm)
+            size = max([size] + [n + 1 for n in numbers])
+
+        self._root_pages = pages_reference
+        self._root_kids = list(page_tree.get("/Kids", []))
+        self.existing_pages = int(page_tree.get("/Count", 0))
+        # The rewritten root keeps every key except the ones updated in write()
+        self._root_entries = {
+            key: value
+            for key, value in page_tree.items()
+            if key not in ("/Kids", "/Count")
+        }
+        # Defaults for inheritable attributes set on the root, so the root's
+        # values do not leak into the appended pages (/CropBox defaults to
+        # the page's own /MediaBox)
+        self._page_defaults = {
+            key: factory
+            for key, factory in INHERITABLE_DEFAULTS.items()
+            if key in page_tree
+        }
+
+        # New objects are numbered after the existing ones
+        self._offsets = [0] * size
+        self._parent_number = self._reserve()
+        self._original_size: int | None = None
+
+    def _output(self) -> BinaryIO:
+        if self._stream is None:
+            self._stream = open(self.output_file_path, "r+b")
+            self._original_size = self._stream.seek(0, os.SEEK_END)
+            self._stream.seek(self._original_size - 1)
+            if self._stream.read(1) not in (b"\n", b"\r"):
+                self._stream.write(b"\n")
+        return self._stream
+
+    def _prepare_page(self, page: DictionaryObject) -> None:
+        for key, factory in self._page_defaults.items():
+            if key not in page:
+                value = factory(page)
+                if value is not None:
+                    page[NameObject(key)] = value
+
+    def _write_root_pages(self) -> None:
+        root = DictionaryObject(
+            {NameObject(key): value for key, value in self._root_entries.items()}
+        )
+        root[NameObject("/Kids")] = ArrayObject(
+            self._root_kids + [IndirectObject(self._parent_number, 0, None)]
+        )
+        root[NameObject("/Count")] = NumberObject(self.existing_pages + len(self.pages))
+
+        stream = self._output()
+        self._root_offset = stream.tell()
+        reference = self._root_pages
+        stream.write(f"{reference.idnum} {reference.generation} obj\n".encode())
+        root.write_to_stream(stream, None)
+        stream.write(b"\nendobj\n")
+
+    def _xref_entries(self) -> list[tuple[int, int, int]]:
+        """(object number, offset, generation) of every object of the update."""
+        first_new = self._parent_number
+        reference = self._root_pages
+        entries = [(reference.idnum, self._root_offset, reference.generation)]
+        entries.extend(
+            (number, self._offsets[number], 0)
+            for number in range(first_new, len(self._offsets))
+        )
+        return sorted(entries)
+
+    @staticmethod
+    def _subsections(numbers: list[int]) -> list[tuple[int, int]]:
+        """Group sorted object numbers into (first, count) runs."""
+        runs: list[tuple[int, int]] = []
+        for number in numbers:
+            if runs and runs[-1][0] + runs[-1][1] == number:
+                runs[-1] = (runs[-1][0], runs[-1][1] + 1)
+            else:
+                runs.append((number, 1))
+        return runs
+
+    def _trailer_dict(self, size: int) -> DictionaryObject:
+        trailer = DictionaryObject(
+            {NameObject(key): value for key, value in self._trailer.items()}
+        )
+        trailer[NameObject("/Size")] = NumberObject(size)
+        trailer[NameObject("/Prev")] = NumberObject(self._prev_xref)
+        return trailer
+
+    def _write_xref_table(self, stream: BinaryIO) -> int:
+        entries = self._xref_entries()
+        xref_offset = stream.tell()
+        stream.write(b"xref\n")
+        index = 0
+        for first, count in self._subsections([number for number, _, _ in entries]):
+            stream.write(f"{first} {count}\n".encode())
+            for _, offset, generation in entries[index : index + count]:
+                stream.write(f"{offset:010d} {generation:05d} n \n".encode())
+            index += count
+
+        stream.write(b"trailer\n")
+        self._trailer_dict(len(self._offsets)).write_to_stream(stream, None)
+        return xref_offset
+
+    def _write_xref_stream(self, stream: BinaryIO) -> int:
+        number = self._reserve()
+        xref_offset = stream.tell()
+        self._offsets[number] = xref_offset
+
+        entries = self._xref_entries()
+        width = max(1, (xref_offset.bit_length() + 7) // 8)
+        data = b"".join(
+            b"\x01" + offset.to_bytes(width, "big") + generation.to_bytes(2, "big")
+            for _, offset, generation in entries
+        )
+
+        xref = DecodedStreamObject()
+        xref.update(self._trailer_dict(len(self._offsets)))
+        xref[NameObject("/Type")] = NameObject("/XRef")
+        xref[NameObject("/W")] = ArrayObject(
+            [NumberObject(1), NumberObject(width), NumberObject(2)]
+        )
+        xref[NameObject("/Index")] = ArrayObject(
+            NumberObject(value)
+            for run in self._subsections([entry[0] for entry in entries])
+            for value in run
+        )
+        xref[NameObject("/Filter")] = NameObject("/FlateDecode")
+        xref._data = zlib.compress(data)
+
+        stream.write(f"{number} 0 obj\n".encode())
+        xref.write_to_stream(stream, None)
+        stream.write(b"\nendobj\n")
+        return xref_offset
+
+    def write(self, output_file_path: str | None = None) -> None:
+        """
+        Write the new page tree nodes, cross-reference section and trailer.
+
+        Args:
+            output_file_path (str | None): Ignored; the update is always
+                written to the file given to the constructor.
+
+        Returns:
+            None
+        """
+        node = DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Pages"),
+                NameObject("/Parent"): self._root_pages,
+                NameObject("/Kids"): ArrayObject(
+                    IndirectObject(number, 0, None) for number in self.pages
+                ),
+                NameObject("/Count"): NumberObject(len(self.pages)),
+            }
+        )
+        self._write_object(self._parent_number, node)
+        self._write_root_pages()
+
+        stream = self._output()
+        if self._xref_is_table:
+            xref_offset = self._write_xref_table(stream)
+        else:
+            xref_offset = self._write_xref_stream(stream)
+        stream.write(f"\nstartxref\n{xref_offset}\n%%EOF\n".encode())
+        stream.close()
+        self._original_size = None
+
+    def close(self) -> None:
+        """Close the file, truncating it to its original length unless write() completed."""
+        if self._stream is None:
+            return
+        if not self._stream.closed:
+            self._stream.close()
+        if self._original_size is not None:
+            os.truncate(self.output_file_path, self._original_size)
+            self._original_size = None
@@ -0,0 +1,439 @@
+# Job manifest runner
+
+"""
+Run many merge, split, extract, batch split and rename jobs from one manifest.
+
+Running each job as its own CLI call pays the interpreter start-up, the
+PyPDF2 import and the parse of every input again. run_manifest() executes
+all the jobs of a JSON or YAML manifest in one process (or in a pool of
+worker processes), with a shared reader cache so that an input used by
+several jobs is parsed once per process.
+
+A manifest looks like:
+
+    passwords:
+      secret.pdf: hunter2
+    jobs:
+      - id: cover
+        type: merge
+        files: [cover.pdf:1-2, body.pdf]
+        output: out/book.pdf
+        streaming: true
+      - type: split
+        file: body.pdf
+        range: 1-3,4-
+        output: out
+      - type: extract
+        file: body.pdf
+        range: last
+        output: out
+      - type: batch_split
+        file: secret.pdf
+        output: out/pages
+      - type: rename
+        file: scan.pdf
+        output: archive/scan_2024.pdf
+
+Keys follow the options of the matching CLI subcommand; "compress" takes
+a flate level and "max_open_files" an open file limit (or true for the
+default ones). Split and extract jobs take an "archive" (.zip or .tar) to
+write their files into instead of an "output" directory. Relative paths are
+resolved against the directory of the manifest, and encrypted inputs are
+opened with the password listed for them (or skipped when there is none).
+Jobs run in manifest order; with more than one worker they run concurrently,
+so a job must not depend on the output of another one.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from core import globals
+from core.batch.batch_split import batch_split_pdf
+from core.error_handler import handle_exception
+from core.output_archive import ARCHIVE_FORMATS
+from core.page_selection import split_input_spec
+from core.pdf_compress import DEFAULT_COMPRESSION_LEVEL
+from core.pdf_extract_pages import extract_pdf_page
+from core.pdf_merge import merge_pdf
+from core.pdf_rename import rename_pdf_file
+from core.pdf_splitter import split_pdf, split_pdf_by_outline
+from core.reader_cache import (
+    DEFAULT_MAX_READERS,
+    activate_shared_reader_cache,
+    shared_reader_cache,
+)
+from core.reader_pool import DEFAULT_MAX_OPEN_FILES
+from core.result import Result
+
+# Job type -> (required keys, optional keys)
+JOB_KEYS: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "merge": (
+        ("files", "output"),
+        ("streaming", "dedupe", "append", "compress", "max_open_files"),
+    ),
+    "split": (
+        ("file", "range"),
+        ("output", "compress", "keep_resources", "archive", "archive_format"),
+    ),
+    "split_outline": (
+        ("file",),
+        ("output", "depth", "compress", "keep_resources", "archive", "archive_format"),
+    ),
+    "extract": (
+        ("file", "range"),
+        ("output", "compress", "keep_resources", "archive", "archive_format"),
+    ),
+    "batch_split": (
+        ("file",),
+        (
+            "output",
+            "compress",
+            "keep_resources",
+            "pages_per_file",
+            "max_bytes",
+            "archive",
+            "archive_format",
+        ),
+    ),
+    "rename": (("file", "output"), ()),
+}
+
+# Job types writing to an output directory or, instead, to an archive
+ARCHIVE_JOBS = ("split", "split_outline", "extract")
+
+YAML_EXTENSIONS = (".yaml", ".yml")
+
+
+def _read_manifest_file(manifest_path: str) -> Any:
+    with open(manifest_path, encoding="utf-8") as f:
+        if not manifest_path.lower().endswith(YAML_EXTENSIONS):
+            return json.load(f)
+
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("PyYAML is required to read YAML manifests")
+        return yaml.safe_load(f)
+
+
+def _resolve(base_dir: str, path: Any, job_id: str, key: str) -> str:
+    if not isinstance(path, str) or not path.strip():
+        raise ValueError(f"Job {job_id}: '{key}' must be a non-empty path")
+    return os.path.join(base_dir, os.path.expanduser(path))
+
+
+def _normalize_job(raw: Any, index: int, base_dir: str) -> dict[str, Any]:
+    if not isinstance(raw, dict):
+        raise ValueError(f"Job {index}: expected a mapping of options")
+
+    job_id = str(raw.get("id", index))
+    job_type = raw.get("type")
+    if job_type not in JOB_KEYS:
+        raise ValueError(
+            f"Job {job_id}: unknown type {job_type!r}; "
+            f"expected one of {', '.join(JOB_KEYS)}"
+        )
+
+    required, optional = JOB_KEYS[job_type]
+    unknown = set(raw) - set(required) - set(optional) - {"id", "type"}
+    if unknown:
+        raise ValueError(f"Job {job_id}: unknown keys {', '.join(sorted(unknown))}")
+    missing = [key for key in required if key not in raw]
+    if job_type in ARCHIVE_JOBS and "output" not in raw and "archive" not in raw:
+        missing.append("output")
+    if missing:
+        raise ValueError(f"Job {job_id}: missing {', '.join(missing)}")
+
+    job: dict[str, Any] = {"id": job_id, "type": job_type}
+    for key in required + optional:
+        if key not in raw:
+            continue
+        value = raw[key]
+        if key in ("file", "output", "archive"):
+            value = _resolve(base_dir, value, job_id, key)
+        elif key == "files":
+            if not isinstance(value, list) or not value:
+                raise ValueError(f"Job {job_id}: 'files' must be a non-empty list")
+            value = [_resolve(base_dir, item, job_id, key) for item in value]
+        elif key == "range":
+            value = str(value)
+        elif key == "compress":
+            if value is True:
+                value = DEFAULT_COMPRESSION_LEVEL
+            if value is False:
+                value = None
+            elif not isinstance(value, int) or not 0 <= value <= 9:
+                raise ValueError(
+                    f"Job {job_id}: 'compress' must be a level from 0 to 9"
+                )
+        elif key == "archive_format":
+            if value not in ARCHIVE_FORMATS:
+                raise ValueError(
+                    f"Job {job_id}: 'archive_format' must be one of "
+                    f"{', '.join(ARCHIVE_FORMATS)}"
+                )
+        elif key in ("pages_per_file", "max_bytes", "depth"):
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ValueError(f"Job {job_id}: '{key}' must be a positive number")
+        elif key == "max_open_files":
+            if value is True:
+                value = DEFAULT_MAX_OPEN_FILES
+            elif value is False:
+                value = 0
+            elif not isinstance(value, int) or value < 0:
+                raise ValueError(
+                    f"Job {job_id}: 'max_open_files' must be a positive number"
+                )
+        else:
+            value = bool(value)
+        job[key] = value
+    return job
+
+
+def load_manifest(manifest_path: str) -> tuple[list[dict[str, Any]], dict[str, str]]:
+    """
+    Read and validate a JSON or YAML job manifest.
+
+    The format is chosen from the extension (.yaml/.yml, otherwise JSON).
+    Relative paths are resolved against the manifest's directory.
+
+    Args:
+        manifest_path (str): Path to the manifest.
+
+    Returns:
+        tuple[list[dict[str, Any]], dict[str, str]]: The normalized jobs, and
+            the passwords keyed by absolute file path.
+
+    Raises:
+        OSError: If the manifest cannot be read.
+        ValueError: If the manifest is malformed.
+    """
+    document = _read_manifest_file(manifest_path)
+    if isinstance(document, list):
+        document = {"jobs": document}
+    if not isinstance(document, dict) or not isinstance(document.get("jobs"), list):
+        raise ValueError("The manifest must contain a list of jobs")
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    jobs = [
+        _normalize_job(raw, index, base_dir)
+        for index, raw in enumerate(document["jobs"], start=1)
+    ]
+
+    ids = [job["id"] for job in jobs]
+    duplicates = sorted({job_id for job_id in ids if ids.count(job_id) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate job ids: {', '.join(duplicates)}")
+
+    passwords = document.get("passwords") or {}
+    if not isinstance(passwords, dict):
+        raise ValueError("'passwords' must map file paths to passwords")
+
+    return jobs, {
+        os.path.abspath(_resolve(base_dir, path, "passwords", "passwords")): str(pw)
+        for path, pw in passwords.items()
+    }
+
+
+def run_job(job: dict[str, Any], passwords: dict[str, str]) -> Result:
+    """
+    Run one normalized manifest job with the matching core operation.
+
+    Args:
+        job (dict[str, Any]): A job as returned by load_manifest().
+        passwords (dict[str, str]): Passwords keyed by absolute file path.
+
+    Returns:
+        Result: The Result of the core operation.
+    """
+
+    def ask_password(path: str) -> str | None:
+        return passwords.get(os.path.abspath(path))
+
+    try:
+        job_type = job["type"]
+        if job_type == "merge":
+            files, specs = zip(*(split_input_spec(item) for item in job["files"]))
+            return merge_pdf(
+                list(files),
+                job["output"],
+                ask_password,
+                streaming=job.get("streaming", False),
+                dedupe=job.get("dedupe", False),
+                append=job.get("append", False),
+                compress_level=job.get("compress"),
+                max_open_files=job.get("max_open_files", 0),
+                page_specs=list(specs) if any(specs) else None,
+            )
+        if job_type == "split":
+            return split_pdf(
+                job["file"],
+                job["range"],
+                job.get("output"),
+                ask_password,
+                compress_level=job.get("compress"),
+                prune_resources=not job.get("keep_resources", False),
+                archive=job.get("archive"),
+                archive_format=job.get("archive_format"),
+            )
+        if job_type == "split_outline":
+            return split_pdf_by_outline(
+                job["file"],
+                job.get("output"),
+                ask_password,
+                depth=job.get("depth", 1),
+                compress_level=job.get("compress"),
+                prune_resources=not job.get("keep_resources", False),
+                archive=job.get("archive"),
+                archive_format=job.get("archive_format"),
+            )
+        if job_type == "extract":
+            return extract_pdf_page(
+                job["file"],
+                job["range"],
+                job.get("output"),
+                ask_password,
+                compress_level=job.get("compress"),
+                prune_resources=not job.get("keep_resources", False),
+                archive=job.get("archive"),
+                archive_format=job.get("archive_format"),
+            )
+        if job_type == "batch_split":
+            return batch_split_pdf(
+                job["file"],
+                job.get("output"),
+                ask_password,
+                compress_level=job.get("compress"),
+                prune_resources=not job.get("keep_resources", False),
+                pages_per_file=job.get("pages_per_file", 1),
+                max_bytes=job.get("max_bytes"),
+                archive=job.get("archive"),
+                archive_format=job.get("archive_format"),
+            )
+
+        return rename_pdf_file(
+            job["file"], os.path.dirname(job["output"]), os.path.basename(job["output"])
+        )
+
+    except Exception as e:
+        return handle_exception(exc=e, context=f"running job {job.get('id')}")
+
+
+def _job_report(job: dict[str, Any], result: Result, seconds: float) -> dict:
+    return {
+        "id": job["id"],
+        "type": job["type"],
+        "success": result.success,
+        "title": result.title,
+        "message": result.message,
+        "error_type": result.error_type,
+        "data": result.data,
+        "seconds": round(seconds, 4),
+    }
+
+
+def _run_timed(job: dict[str, Any], passwords: dict[str, str]) -> dict:
+    started = time.perf_counter()
+    result = run_job(job, passwords)
+    return _job_report(job, result, time.perf_counter() - started)
+
+
+_worker_passwords: dict[str, str] = {}
+
+
+def _init_job_worker(
+    passwords: dict[str, str], use_validation_cache: bool, cache_size: int
+) -> None:
+    """
+    Set up a job worker process: global flags, passwords and its reader cache.
+    """
+    global _worker_passwords
+    _worker_passwords = passwords
+    globals.USE_VALIDATION_CACHE = use_validation_cache
+    activate_shared_reader_cache(cache_size)
+
+
+def _run_in_worker(job: dict[str, Any]) -> dict:
+    return _run_timed(job, _worker_passwords)
+
+
+def run_manifest(
+    manifest_path: str,
+    jobs: int = 1,
+    report_path: str | None = None,
+    cache_size: int = DEFAULT_MAX_READERS,
+) -> Result:
+    """
+    Run every job of a manifest and collect a per-job report.
+
+    Args:
+        manifest_path (str): Path to the JSON or YAML manifest.
+        jobs (int): Number of worker processes. 1 runs the jobs in order in
+            the current process; 0 uses one worker per CPU.
+        report_path (str | None): Also write the report as JSON to this file.
+        cache_size (int): Parsed readers kept per process for reuse by later jobs.
+
+    Returns:
+        Result: Success if every job succeeded. 'jobs' in data lists, in
+            manifest order, the id, type, Result fields and duration of each job.
+    """
+    try:
+        job_list, passwords = load_manifest(manifest_path)
+    except (OSError, ValueError) as e:
+        return Result(success=False, title="Invalid manifest", message=str(e))
+
+    if not job_list:
+        return Result(
+            success=False, title="No jobs", message="The manifest contains no jobs."
+        )
+
+    try:
+        started = time.perf_counter()
+        jobs = min(jobs or os.cpu_count() or 1, len(job_list))
+        if jobs <= 1:
+            with shared_reader_cache(cache_size):
+                reports = [_run_timed(job, passwords) for job in job_list]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=_init_job_worker,
+                initargs=(passwords, globals.USE_VALIDATION_CACHE, cache_size),
+            ) as executor:
+                chunksize = max(1, len(job_list) // (jobs * 4))
+                reports = list(
+                    executor.map(_run_in_worker, job_list, chunksize=chunksize)
+                )
+        elapsed = time.perf_counter() - started
+
+        failed = [report["id"] for report in reports if not report["success"]]
+        data = {
+            "jobs": reports,
+            "succeeded": len(reports) - len(failed),
+            "failed": len(failed),
+            "seconds": round(elapsed, 3),
+        }
+
+        if report_path:
+            with open(report_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, default=str)
+
+        message = (
+            f"{data['succeeded']} of {len(reports)} jobs succeeded in {elapsed:.2f}s."
+        )
+        if failed:
+            return Result(
+                success=False,
+                error_type="warning",
+                title="Some jobs failed",
+                message=f"{message} Failed jobs: {', '.join(failed)}",
+                data=data,
+            )
+        return Result(
+            success=True, error_type="info", title="Success", message=message, data=data
+        )
+
+    except Exception as e:
+        return handle_exception(exc=e, context="running the job manifest")
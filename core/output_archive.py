@@ -0,0 +1,332 @@
+# Archive output for multi-file operations
+
+"""
+Stream the files of a split into a single ZIP or tar archive.
+
+Splitting a large scan page by page creates thousands of small files, and
+creating (then listing, copying...) that many files is costly on network
+filesystems. An OutputArchive takes the place of the OutputStage of split,
+extract and batch split:
+
+  - each PDF is serialized in memory and appended to the archive as it is
+    written, without any temporary file;
+  - the archive goes to a file (which must not exist yet) or to stdout, and
+    tar archives are written in streaming mode, so stdout can be a pipe;
+  - publish() appends MANIFEST_NAME, mapping every member to its source
+    pages and every source page to its members, and completes the archive;
+  - an archive file left incomplete by a failure is removed; on stdout, the
+    archive is cut short instead of completed, so a reader sees it as truncated.
+"""
+
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from io import BytesIO
+from typing import Any, BinaryIO, Iterable
+
+from core.output_stage import OutputStage
+from core.pdf_compress import pdf_bytes
+from core.result import Result
+
+ARCHIVE_FORMATS = ("zip", "tar")
+
+# Extension -> archive format, when no format is given
+ARCHIVE_EXTENSIONS = {".zip": "zip", ".tar": "tar"}
+
+# Target writing the archive to standard output (as tar unless told otherwise)
+STDOUT_TARGET = "-"
+
+MANIFEST_NAME = "manifest.json"
+
+# (member name, PDF data, 1-based source pages)
+Member = tuple[str, bytes, list[int]]
+
+
+def archive_format_of(target: str, archive_format: str | None = None) -> str | None:
+    """
+    Return the format of an archive target, or None if it cannot be told.
+
+    Args:
+        target (str): Path of the archive, or STDOUT_TARGET.
+        archive_format (str | None): Explicit format, overriding the extension.
+
+    Returns:
+        str | None: "zip" or "tar".
+    """
+    if archive_format is not None:
+        return archive_format if archive_format in ARCHIVE_FORMATS else None
+    if target == STDOUT_TARGET:
+        return "tar"
+    return ARCHIVE_EXTENSIONS.get(os.path.splitext(target)[1].lower())
+
+
+def check_archive_target(
+    target: str, archive_format: str | None = None
+) -> Result | None:
+    """
+    Check that an archive can be created at target.
+
+    Args:
+        target (str): Path of the archive, or STDOUT_TARGET.
+        archive_format (str | None): Explicit format, overriding the extension.
+
+    Returns:
+        Result | None: The Result explaining why it cannot, or None.
+    """
+    if archive_format_of(target, archive_format) is None:
+        return Result(
+            success=False,
+            error_type="error",
+            title="Invalid archive",
+            message="The archive must be a .zip or .tar file, "
+            f"or its format one of {', '.join(ARCHIVE_FORMATS)}.",
+        )
+    if target == STDOUT_TARGET:
+        return None
+
+    directory = os.path.dirname(target) or "."
+    if not os.path.isdir(directory):
+        return Result(
+            success=False,
+            error_type="error",
+            title="Invalid output directory",
+            message=f"The specified directory does not exist: {directory}",
+        )
+    if os.path.exists(target):
+        return Result(
+            success=False,
+            error_type="error",
+            title="File Exists",
+            message=f"File '{os.path.basename(target)}' already exists.",
+        )
+    return None
+
+
+class MemoryOutput:
+    def __init__(self):
+        """
+        Collect written PDFs in memory, to be added to an OutputArchive later.
+
+        Used by worker processes, which cannot write to the parent's archive.
+
+        Attributes:
+            members (list[Member]): The PDFs written, in order.
+
+        Methods:
+            write_pdf(writer, filename, pages, compress_level): Serialize a PDF.
+        """
+
+        self.members: list[Member] = []
+
+    def write_pdf(
+        self,
+        writer: Any,
+        filename: str,
+        pages: list[int],
+        compress_level: int | None = None,
+    ) -> tuple[int, int]:
+        data, before = pdf_bytes(writer, compress_level)
+        self.members.append((filename, data, pages))
+        return before, len(data)
+
+
+class _StdoutStream:
+    def __init__(self):
+        """Standard output for an archive; once aborted, nothing more reaches it."""
+
+        self._buffer = sys.stdout.buffer
+        self._aborted = False
+
+    def write(self, data: bytes) -> int:
+        # Archives write their end records when garbage collected, too
+        if not self._aborted:
+            self._buffer.write(data)
+        return len(data)
+
+    def flush(self) -> None:
+        if not self._aborted:
+            self._buffer.flush()
+
+    def abort(self) -> None:
+        self._buffer.flush()
+        self._aborted = True
+
+
+class OutputArchive:
+    def __init__(
+        self,
+        target: str,
+        archive_format: str | None = None,
+        source: str | None = None,
+    ):
+        """
+        ZIP or tar archive receiving the files of an operation as they are written.
+
+        Use it as a context manager, like an OutputStage: the archive is
+        opened on entry, publish() completes it, and on exit an archive file
+        that was not published is removed (on stdout, it is left incomplete).
+
+        Attributes:
+            target (str): Path of the archive, or STDOUT_TARGET.
+            archive_format (str): "zip" or "tar".
+            source (str | None): Name of the split PDF, recorded in the manifest.
+
+        Methods:
+            add(filename, data, pages): Append a member.
+            write_pdf(writer, filename, pages, compress_level): Serialize a PDF and append it.
+            publish(filenames): Append the manifest and complete the archive.
+
+        Raises:
+            ValueError: If the format cannot be told from target.
+        """
+
+        archive_format = archive_format_of(target, archive_format)
+        if archive_format is None:
+            raise ValueError(f"Unknown archive format for {target}")
+
+        self.target = target
+        self.archive_format = archive_format
+        self.source = source
+        self._stream: BinaryIO | _StdoutStream | None = None
+        self._archive: zipfile.ZipFile | tarfile.TarFile | None = None
+        self._members: list[dict[str, Any]] = []
+        self._published = False
+
+    def __enter__(self) -> "OutputArchive":
+        if self.target == STDOUT_TARGET:
+            self._stream = _StdoutStream()
+        else:
+            # Exclusive creation: an existing file is never replaced
+            self._stream = open(self.target, "xb")
+
+        if self.archive_format == "zip":
+            self._archive = zipfile.ZipFile(
+                self._stream, "w", compression=zipfile.ZIP_DEFLATED
+            )
+        else:
+            self._archive = tarfile.open(fileobj=self._stream, mode="w|")
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._archive is None:
+            return
+        archive, self._archive = self._archive, None
+        if not self._published and isinstance(self._stream, _StdoutStream):
+            # Completing it would pass a failed run off as a valid archive:
+            # the stream is left truncated
+            self._stream.abort()
+            return
+        try:
+            archive.close()
+        finally:
+            if isinstance(self._stream, _StdoutStream):
+                self._stream.flush()
+            else:
+                self._stream.close()
+            if not self._published:
+                os.remove(self.target)
+
+    def _write_member(self, filename: str, data: bytes) -> None:
+        if self._archive is None:
+            raise RuntimeError("The output archive is not open")
+
+        if isinstance(self._archive, zipfile.ZipFile):
+            info = zipfile.ZipInfo(filename, time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            self._archive.writestr(info, data)
+        else:
+            info = tarfile.TarInfo(filename)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            info.mode = 0o644
+            self._archive.addfile(info, BytesIO(data))
+
+    def add(self, filename: str, data: bytes, pages: list[int]) -> None:
+        self._write_member(filename, data)
+        self._members.append({"name": filename, "pages": pages})
+
+    def write_pdf(
+        self,
+        writer: Any,
+        filename: str,
+        pages: list[int],
+        compress_level: int | None = None,
+    ) -> tuple[int, int]:
+        """
+        Serialize a PdfWriter in memory and append it to the archive.
+
+        Args:
+            writer (PdfWriter): The document to write.
+            filename (str): Name of the member.
+            pages (list[int]): The 1-based source pages it holds, for the manifest.
+            compress_level (int | None): zlib level to pack the PDF with.
+
+        Returns:
+            tuple[int, int]: Size in bytes of the regular layout and of the PDF written.
+        """
+        data, before = pdf_bytes(writer, compress_level)
+        self.add(filename, data, pages)
+        return before, len(data)
+
+    def manifest(self) -> dict[str, Any]:
+        """The members written so far and, for each source page, the members holding it."""
+        pages: dict[str, list[str]] = {}
+        for member in self._members:
+            for page in member["pages"]:
+                pages.setdefault(str(page), []).append(member["name"])
+        return {"source": self.source, "members": self._members, "pages": pages}
+
+    def publish(self, filenames: Iterable[str]) -> None:
+        """
+        Append the manifest and complete the archive.
+
+        Args:
+            filenames (Iterable[str]): Names of the members, as for
+                OutputStage.publish(); they are already in the archive.
+
+        Returns:
+            None
+        """
+        missing = set(filenames) - {member["name"] for member in self._members}
+        if missing:
+            raise RuntimeError(f"Not in the archive: {', '.join(sorted(missing))}")
+
+        manifest = json.dumps(self.manifest(), indent=2).encode("utf-8")
+        self._write_member(MANIFEST_NAME, manifest)
+        self._archive.close()
+        self._published = True
+
+
+def output_label(output_dir: str | None, archive: str | None = None) -> str:
+    """Where the files of an operation went, for Result messages."""
+    if archive is None:
+        return str(output_dir)
+    return "standard output" if archive == STDOUT_TARGET else archive
+
+
+def open_output(
+    output_dir: str,
+    archive: str | None = None,
+    archive_format: str | None = None,
+    source: str | None = None,
+) -> OutputStage | OutputArchive:
+    """
+    Return the OutputStage of output_dir, or an OutputArchive if archive is set.
+
+    Args:
+        output_dir (str): The directory the files are published to.
+        archive (str | None): Path of the archive to write instead, or STDOUT_TARGET.
+        archive_format (str | None): Explicit archive format.
+        source (str | None): Path of the split PDF, named in the manifest.
+
+    Returns:
+        OutputStage | OutputArchive: The output, to be used as a context manager.
+    """
+    if archive is None:
+        return OutputStage(output_dir)
+    return OutputArchive(
+        archive, archive_format, os.path.basename(source) if source else None
+    )
@@ -0,0 +1,143 @@
+# Staged output for multi-file operations
+
+"""
+Check, write and publish the files of an operation as a whole.
+
+Operations writing many files (split, extract, batch split) used to check
+each target right before writing it, so a clash on the last file wasted
+the work done so far and left the earlier files behind. With an
+OutputStage:
+
+  - find_clash() checks every target name against a single listing of the
+    output directory before anything is written;
+  - files are written to a hidden staging directory created inside the
+    output directory, so publishing is a rename on the same filesystem;
+  - publish() moves them to the output directory without ever replacing an
+    existing file; if one appeared in the meantime, the files already
+    published are removed again;
+  - the staging directory is always removed, so a failed run leaves nothing
+    behind and can simply be retried.
+"""
+
+import os
+import shutil
+import tempfile
+from typing import Any, Iterable
+
+from core.pdf_compress import write_pdf
+
+STAGE_DIR_PREFIX = ".pdf-toolkit-stage-"
+
+
+def find_clash(output_dir: str, filenames: Iterable[str]) -> str | None:
+    """
+    Return the first name already present in output_dir or repeated in filenames.
+
+    Args:
+        output_dir (str): The directory the files will be published to.
+        filenames (Iterable[str]): The names of the files to publish.
+
+    Returns:
+        str | None: The clashing name, or None when every name is free.
+    """
+    taken = set(os.listdir(output_dir))
+    for filename in filenames:
+        if filename in taken:
+            return filename
+        taken.add(filename)
+    return None
+
+
+def _publish_file(source: str, target: str) -> None:
+    """Move source to target, failing rather than replacing an existing target."""
+    try:
+        os.link(source, target)
+    except FileExistsError:
+        raise
+    except OSError:
+        # Filesystems without hard links: a check-then-rename is the best we have
+        if os.path.exists(target):
+            raise FileExistsError(target)
+        os.replace(source, target)
+        return
+    os.remove(source)
+
+
+class OutputStage:
+    def __init__(self, output_dir: str):
+        """
+        Staging directory whose files are published together to output_dir.
+
+        Use it as a context manager: the staging directory is created on
+        entry and removed on exit, and files not published by then are
+        discarded.
+
+        Attributes:
+            output_dir (str): The directory the files are published to.
+            directory (str | None): The staging directory, while the stage is open.
+
+        Methods:
+            path(filename): Staging path to write filename to.
+            write_pdf(writer, filename, pages, compress_level): Write a PDF to the stage.
+            publish(filenames): Move the staged files to output_dir, all or none.
+        """
+
+        self.output_dir = output_dir
+        self.directory: str | None = None
+
+    def __enter__(self) -> "OutputStage":
+        self.directory = tempfile.mkdtemp(prefix=STAGE_DIR_PREFIX, dir=self.output_dir)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+    def path(self, filename: str) -> str:
+        if self.directory is None:
+            raise RuntimeError("The output stage is not open")
+        return os.path.join(self.directory, filename)
+
+    def write_pdf(
+        self,
+        writer: Any,
+        filename: str,
+        pages: list[int],
+        compress_level: int | None = None,
+    ) -> tuple[int, int]:
+        """
+        Write a PdfWriter to the staging path of filename.
+
+        Takes the same arguments as OutputArchive.write_pdf(), so operations can
+        write to either; the source pages are only recorded by archives.
+
+        Returns:
+            tuple[int, int]: Size in bytes of the regular layout and of the file written.
+        """
+        return write_pdf(writer, self.path(filename), compress_level)
+
+    def publish(self, filenames: Iterable[str]) -> None:
+        """
+        Move the staged files to the output directory.
+
+        Args:
+            filenames (Iterable[str]): Names of the staged files, in publishing order.
+
+        Returns:
+            None
+
+        Raises:
+            FileExistsError: If a target appeared since find_clash(); the files
+                published before it are removed again.
+        """
+        published: list[str] = []
+        try:
+            for filename in filenames:
+                target = os.path.join(self.output_dir, filename)
+                _publish_file(self.path(filename), target)
+                published.append(target)
+        except BaseException:
+            for target in published:
+                os.remove(target)
+            raise
@@ -0,0 +1,381 @@
+# Page selection parsing
+
+"""
+Compile page selection specs (e.g. "1-3,5,10-,last,odd,1-9:2,11-20:-1") into
+normalized page ranges.
+
+A PageSelection only stores its ranges, never the individual page numbers, so
+memory use is proportional to the number of ranges regardless of page count.
+"""
+
+import os
+import re
+from math import gcd
+from typing import Iterator
+
+# "<start>-<end>[:<step>]" where either side may be omitted or be "last"
+_RANGE_PATTERN = re.compile(
+    r"^(?P<start>\d+|last)?\s*-\s*(?P<end>\d+|last)?(?:\s*:\s*(?P<step>-?\d+))?$"
+)
+_PAGE_PATTERN = re.compile(r"^(?P<page>\d+|last)$")
+# "<file>.pdf:<spec>"; the spec is everything after the first ":" following ".pdf"
+_INPUT_SPEC_PATTERN = re.compile(
+    r"^(?P<path>.+?\.pdf):(?P<spec>[^\\/]+)$", re.IGNORECASE
+)
+
+
+class PageRange:
+    __slots__ = ("start", "end", "step")
+
+    def __init__(self, start: int, end: int, step: int = 1):
+        """
+        An inclusive range of 1-based page numbers.
+
+        Attributes:
+            start (int): Lowest page number in the range.
+            end (int): Highest page number in the range.
+            step (int): Distance between selected pages. A negative step
+                iterates from end down to start (reversal).
+        """
+
+        self.start = start
+        self.end = end
+        self.step = step
+
+    def __iter__(self) -> Iterator[int]:
+        if self.step > 0:
+            return iter(range(self.start, self.end + 1, self.step))
+        return iter(range(self.end, self.start - 1, self.step))
+
+    def __len__(self) -> int:
+        return (self.end - self.start) // abs(self.step) + 1
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PageRange):
+            return NotImplemented
+        return (self.start, self.end, self.step) == (other.start, other.end, other.step)
+
+    def __repr__(self):
+        return f"<PageRange {self}>"
+
+    def __str__(self):
+        if self.start == self.end:
+            return str(self.start)
+        label = f"{self.start}-{self.end}"
+        return label if self.step == 1 else f"{label}:{self.step}"
+
+    def index_range(self) -> range:
+        """The selected pages as a range of 0-based indices, in iteration order."""
+        if self.step > 0:
+            return range(self.start - 1, self.end, self.step)
+        return range(self.end - 1, self.start - 2, self.step)
+
+    @property
+    def is_contiguous(self) -> bool:
+        """True for a plain, forward range with step 1."""
+        return self.step == 1
+
+    def file_suffix(self) -> str:
+        """
+        Return the suffix used to name an output file holding this range.
+
+        Returns:
+            str: "page_5", "pages_1-3", "pages_9-1" or "pages_1-9_every_2".
+        """
+        if self.start == self.end:
+            return f"page_{self.start}"
+
+        first, last = (
+            (self.start, self.end) if self.step > 0 else (self.end, self.start)
+        )
+        suffix = f"pages_{first}-{last}"
+        if abs(self.step) != 1:
+            suffix += f"_every_{abs(self.step)}"
+        return suffix
+
+
+class PageSelection:
+    def __init__(self, ranges: list[PageRange]):
+        """
+        An ordered, normalized selection of page ranges.
+
+        Use PageSelection.compile() or parse_page_selection() to build one from
+        a user-supplied spec.
+
+        Attributes:
+            ranges (list[PageRange]): The normalized ranges, in spec order.
+
+        Methods:
+            __iter__(): Lazily yield the selected 1-based page numbers.
+            __len__(): Number of selected pages, computed from the ranges.
+            indices(): Lazily yield the selected 0-based page indices.
+        """
+
+        self.ranges = ranges
+
+    @classmethod
+    def compile(cls, spec: str, total_pages: int) -> "PageSelection":
+        """
+        Compile a page selection spec against a document's page count.
+
+        Comma-separated segments may be:
+            - "5"            a single page
+            - "1-3"          an inclusive range
+            - "5-" / "-3"    open-ended ranges (to the last / from the first page)
+            - "last"         the last page; also usable as a range end ("5-last")
+            - "odd" / "even" every odd / even page
+            - "1-9:2"        a range with a step
+            - "1-9:-1"       a negative step reverses the range (9, 8, ... 1)
+
+        No page is selected twice: each segment only adds the pages that the
+        segments before it do not select, in spec order, so "odd,1-4" selects
+        1, 3, 5, 7, 9, 2, 4. A segment is dropped when it adds no page, split
+        when some of its pages are already selected, and a plain range
+        overlapping the range before it extends that range.
+
+        Args:
+            spec (str): The page selection spec.
+            total_pages (int): Total pages in the PDF, used to resolve and validate ranges.
+
+        Returns:
+            PageSelection: The compiled selection.
+
+        Raises:
+            ValueError: If the spec is malformed, out of bounds or selects no pages.
+        """
+        ranges: list[PageRange] = []
+
+        for segment in spec.split(","):
+            segment = segment.strip().lower()
+            if not segment:
+                continue
+
+            page_range = _parse_segment(segment, total_pages)
+            if page_range is None:
+                continue
+
+            _add_new_pages(ranges, page_range)
+
+        if not ranges:
+            raise ValueError("No valid page ranges provided")
+
+        return cls(ranges)
+
+    def __iter__(self) -> Iterator[int]:
+        for page_range in self.ranges:
+            yield from page_range
+
+    def __len__(self) -> int:
+        return sum(len(page_range) for page_range in self.ranges)
+
+    def __repr__(self):
+        return f"<PageSelection {self}>"
+
+    def __str__(self):
+        return ",".join(str(page_range) for page_range in self.ranges)
+
+    def indices(self) -> Iterator[int]:
+        """Lazily yield the selected pages as 0-based indices for reader.pages."""
+        for page in self:
+            yield page - 1
+
+
+def _resolve_page(token: str | None, default: int, total_pages: int) -> int:
+    if token is None:
+        return default
+    if token == "last":
+        return total_pages
+    return int(token)
+
+
+def _parse_segment(segment: str, total_pages: int) -> PageRange | None:
+    """
+    Parse a single comma-separated segment of a page selection spec.
+
+    Returns:
+        PageRange | None: The range, or None if the segment selects no pages
+        (e.g. "even" on a single-page document).
+
+    Raises:
+        ValueError: If the segment is malformed or out of bounds.
+    """
+    if segment in ("odd", "even"):
+        start = 1 if segment == "odd" else 2
+        if start > total_pages:
+            return None
+        end = total_pages - (total_pages - start) % 2
+        return PageRange(start, end, 2)
+
+    step = 1
+    page_match = _PAGE_PATTERN.match(segment)
+    range_match = _RANGE_PATTERN.match(segment)
+
+    if page_match:
+        start = end = _resolve_page(page_match["page"], 1, total_pages)
+    elif range_match and (range_match["start"] or range_match["end"]):
+        start = _resolve_page(range_match["start"], 1, total_pages)
+        end = _resolve_page(range_match["end"], total_pages, total_pages)
+        if range_match["step"] is not None:
+            step = int(range_match["step"])
+            if step == 0:
+                raise ValueError(f"Step cannot be zero: '{segment}'")
+    elif "-" in segment:
+        raise ValueError(f"Invalid range format: '{segment}'")
+    else:
+        raise ValueError(f"Invalid page number: '{segment}'")
+
+    if start < 1 or end > total_pages or start > total_pages:
+        raise ValueError(f"Page range {start}-{end} is out of bounds (1–{total_pages})")
+
+    if start > end:
+        raise ValueError(f"Start page {start} cannot be greater than end page {end}")
+
+    # Trim the end so that it is an actually selected page
+    end -= (end - start) % abs(step)
+    return PageRange(start, end, step)
+
+
+def _common_pages(
+    page_range: PageRange, other: PageRange
+) -> tuple[int, int, int] | None:
+    """
+    Pages selected by both ranges, as (first, last, step) with a positive step.
+
+    Both ranges are arithmetic progressions, so their common pages are one as
+    well, with the least common multiple of their steps.
+    """
+    stride, other_stride = abs(page_range.step), abs(other.step)
+    divisor = gcd(stride, other_stride)
+    offset = other.start - page_range.start
+    if offset % divisor:
+        return None
+
+    step = stride // divisor * other_stride
+    # A page of both progressions: page_range.start + k * stride
+    k = offset // divisor * pow(stride // divisor, -1, other_stride // divisor)
+    page = page_range.start + k * stride
+
+    low = max(page_range.start, other.start)
+    high = min(page_range.end, other.end)
+    first = page + -(-(low - page) // step) * step
+    if first > high:
+        return None
+    return first, first + (high - first) // step * step, step
+
+
+def _without_pages_of(page_range: PageRange, other: PageRange) -> list[PageRange]:
+    """
+    Remove the pages of other from a range.
+
+    Args:
+        page_range (PageRange): The range to remove pages from.
+        other (PageRange): The range whose pages are removed.
+
+    Returns:
+        list[PageRange]: The remaining pages, as ranges in the iteration order
+            of page_range.
+    """
+    common = _common_pages(page_range, other)
+    if common is None:
+        return [page_range]
+
+    first, last, common_step = common
+    stride = abs(page_range.step)
+    pieces: list[PageRange] = []
+
+    def add_piece(low: int, high: int, step: int = stride) -> None:
+        # Pages of page_range within [low, high], every step pages
+        start = page_range.start + -(-(low - page_range.start) // stride) * stride
+        if start <= high:
+            end = start + (high - start) // step * step
+            pieces.append(PageRange(start, end, step if start < end else 1))
+
+    add_piece(page_range.start, first - 1)
+    if common_step == 2 * stride:
+        # Every other page is removed: the rest is a single progression
+        add_piece(first + stride, last - stride, common_step)
+    else:
+        # One range per gap between the removed pages
+        for removed in range(first, last, common_step):
+            add_piece(removed + 1, removed + common_step - 1)
+    add_piece(last + 1, page_range.end)
+
+    if page_range.step > 0:
+        return pieces
+    return [PageRange(piece.start, piece.end, -piece.step) for piece in pieces[::-1]]
+
+
+def _add_new_pages(ranges: list[PageRange], new: PageRange) -> None:
+    """
+    Append the pages of a range that the ranges so far do not select yet.
+
+    A contiguous range overlapping the last one extends it instead, so
+    "1-5,3-8" gives a single range 1-8 while "1-5,6-8" keeps two.
+
+    Args:
+        ranges (list[PageRange]): Disjoint ranges so far, in spec order;
+            updated in place.
+        new (PageRange): The range to add.
+    """
+    pieces = [new]
+    for existing in ranges:
+        pieces = [
+            piece for part in pieces for piece in _without_pages_of(part, existing)
+        ]
+        if not pieces:
+            return
+
+    last = ranges[-1] if ranges else None
+    if (
+        last is not None
+        and last.is_contiguous
+        and new.is_contiguous
+        and new.start <= last.end
+        and pieces[0].start == last.end + 1
+    ):
+        last.end = pieces.pop(0).end
+    ranges.extend(pieces)
+
+
+def parse_page_selection(
+    page_range_input: str, total_pages: int
+) -> tuple[PageSelection | None, str | None]:
+    """
+    Parse a page selection spec, returning an error message instead of raising.
+
+    Args:
+        page_range_input (str): Page selection spec (e.g., "1-3,5,10-,last,odd").
+        total_pages (int): Total pages in the PDF to validate ranges.
+
+    Returns:
+        tuple[PageSelection | None, str | None]:
+            - The compiled PageSelection if parsing is successful, else None.
+            - Error message string if parsing fails, else None.
+    """
+    try:
+        return PageSelection.compile(page_range_input, total_pages), None
+    except ValueError as e:
+        return None, str(e)
+
+
+def split_input_spec(argument: str) -> tuple[str, str | None]:
+    """
+    Split an input argument of the form "file.pdf:<page selection>".
+
+    An argument naming an existing file is never split, so paths that
+    contain a colon still work.
+
+    Args:
+        argument (str): e.g. "cover.pdf:1-2", "appendix.pdf:last" or "body.pdf".
+
+    Returns:
+        tuple[str, str | None]: The file path and the page selection spec,
+            or None if the argument has no spec.
+    """
+    if os.path.exists(argument):
+        return argument, None
+
+    match = _INPUT_SPEC_PATTERN.match(argument)
+    if match is None:
+        return argument, None
+    return match["path"], match["spec"]
@@ -5,38 +5,70 @@
 import os
 from typing import Callable
 
-from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2 import PdfWriter
 
 from core.error_handler import handle_exception
 from core.globals import ENCRYPTED_FILE_HANDLING, EncryptedFileHandling
+from core.output_archive import check_archive_target, open_output, output_label
+from core.output_stage import find_clash
+from core.page_selection import parse_page_selection
+from core.pdf_compress import compression_note
+from core.resource_pruning import add_page
 from core.result import Result
-from core.utils import PDFValidationStatus, parse_page_ranges, validate_pdf_file
+from core.utils import PDFValidationStatus, inspect_pdf, probe_page_count
 
 
 def extract_pdf_page(
     file_path: str,
     page_range_input: str,
-    output_dir: str,
+    output_dir: str | None,
     ask_password_callback: Callable[[str], str | None] | None,
+    compress_level: int | None = None,
+    prune_resources: bool = True,
+    archive: str | None = None,
+    archive_format: str | None = None,
 ) -> Result:
     """
     Extract pages from a PDF file based on a user-defined page range.
 
     Supports encrypted PDFs by using a password callback function.
 
+    All the output names are checked against the output directory before
+    anything is written; the files are written to a staging directory and
+    published together, so a failed run leaves no files behind.
+
     Args:
         file_path (str): Path to the input PDF file.
-        page_range_input (str): Page range as a string (e.g., "1-3", "1,3,5-7").
-        output_dir (str): Directory where the extracted pages will be saved.
+        page_range_input (str): Page selection spec (e.g., "1-3", "1,3,5-7", "10-", "last", "even").
+        output_dir (str | None): Directory where the extracted pages will be saved;
+            unused with an archive.
         ask_password_callback (Callable[[str], str | None] | None):
             A function that accepts the file path and returns the PDF password as a string,
             or None if unavailable. Required for encrypted PDFs.
+        compress_level (int | None): Pack the output PDFs into compressed object
+            streams with a cross-reference stream, using this zlib level (0-9).
+            The byte counts with and without packing are reported in the
+            Result's 'bytes_before' and 'bytes_after' data.
+        prune_resources (bool): Copy only the fonts, images and graphics
+            states each page draws with, instead of its whole (often
+            document-wide) resource dictionary. The number of entries dropped
+            is reported in the Result's 'pruned_resources' data.
+        archive (str | None): Write the files into this .zip or .tar archive
+            (or "-" for stdout) instead of to output_dir, with a manifest of
+            the source pages of each. See core.output_archive.
+        archive_format (str | None): "zip" or "tar", when it cannot be told
+            from the archive's extension.
 
     Returns:
         Result: A standardized Result object indicating success or failure with appropriate message and metadata.
 
     """
     try:
+        if archive is not None:
+            failure = check_archive_target(archive, archive_format)
+            if failure is not None:
+                return failure
+
         if not os.path.isfile(file_path):
             return Result(
                 success=False,
@@ -45,7 +77,7 @@ def extract_pdf_page(
                 message=f"The original file does not exist: {file_path}",
             )
 
-        if not os.path.isdir(output_dir):
+        if archive is None and not os.path.isdir(output_dir):
             return Result(
                 success=False,
                 error_type="error",
@@ -62,7 +94,8 @@ def extract_pdf_page(
                 message="Selected file is not a PDF",
             )
 
-        is_valid, status, error_message = validate_pdf_file(path=file_path)
+        inspection = inspect_pdf(path=file_path)
+        is_valid, status, error_message = inspection.as_tuple()
 
         password: str | None = None
 
@@ -109,7 +142,7 @@ def extract_pdf_page(
                     error_type="error",
                 )
 
-        reader = PdfReader(file_path)
+        reader = inspection.reader
 
         if reader.is_encrypted:
             if not password:
@@ -127,9 +160,9 @@ def extract_pdf_page(
                     error_type="error",
                 )
 
-        total_pages = len(reader.pages)
+        total_pages = probe_page_count(reader)
 
-        page_ranges, msg = parse_page_ranges(page_range_input, total_pages)
+        selection, msg = parse_page_selection(page_range_input, total_pages)
 
         if msg:
             return Result(
@@ -141,45 +174,61 @@ def extract_pdf_page(
 
         basename = os.path.splitext(os.path.basename(file_path))[0]
 
-        saved_files = []
-        if page_ranges is None:
+        if selection is None:
             return Result(
                 success=False,
                 error_type="error",
                 title="Invalid page range",
                 message="Page range cannot be empty",
             )
-        for start, end in page_ranges:
-            writer = PdfWriter()
-            for i in range(start - 1, end):
-                writer.add_page(reader.pages[i])
 
-            if start == end:
-                filename = f"{basename}_page_{start}.pdf"
-            else:
-                filename = f"{basename}_pages_{start}-{end}.pdf"
+        saved_files = [
+            f"{basename}_{page_range.file_suffix()}.pdf"
+            for page_range in selection.ranges
+        ]
+        clash = find_clash(output_dir, saved_files) if archive is None else None
+        if clash is not None:
+            return Result(
+                success=False,
+                error_type="error",
+                title="File Exists",
+                message=f"File '{clash}' already exists in the output directory.",
+            )
 
-            output_path = os.path.join(output_dir, filename)
+        bytes_before = bytes_after = pruned_resources = 0
+        with open_output(output_dir, archive, archive_format, file_path) as output:
+            for page_range, filename in zip(selection.ranges, saved_files):
+                writer = PdfWriter()
+                for page_number in page_range:
+                    pruned_resources += add_page(
+                        writer, reader.pages[page_number - 1], prune_resources
+                    )
 
-            if os.path.exists(output_path):
-                return Result(
-                    success=False,
-                    error_type="error",
-                    title="File Exists",
-                    message=f"File '{filename}' already exists in the output directory.",
+                before, after = output.write_pdf(
+                    writer, filename, list(page_range), compress_level
                 )
-
-            with open(output_path, "wb") as out_pdf:
-                writer.write(out_pdf)
-
-            saved_files.append(filename)
+                bytes_before += before
+                bytes_after += after
+
+            output.publish(saved_files)
+
+        message = f"Pages {selection} were successfully extracted and saved to {output_label(output_dir, archive)}."
+        data = {"files": saved_files}
+        if archive is not None:
+            data["archive"] = archive
+        if prune_resources:
+            data["pruned_resources"] = pruned_resources
+        if compress_level is not None:
+            message += " " + compression_note(bytes_before, bytes_after)
+            data["bytes_before"] = bytes_before
+            data["bytes_after"] = bytes_after
 
         return Result(
             success=True,
             error_type="info",
             title="Success",
-            message=f"Pages {page_ranges} were successfully extracted and saved to {output_dir}.",
-            data={"files": saved_files},
+            message=message,
+            data=data,
         )
 
     except Exception as e:
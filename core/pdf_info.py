@@ -0,0 +1,63 @@
+# PDF info logic
+
+from core.error_handler import handle_exception
+from core.result import Result
+from core.utils import PDFValidationStatus, inspect_pdf
+
+
+def get_pdf_info(input_file_path: list[str]) -> Result:
+    """
+    Report the validation status, encryption flag and page count of PDF files.
+
+    Page counts come from the validation cache or from the root page tree's
+    /Count entry (see probe_page_count()), so the page trees are not flattened.
+    Encrypted PDFs are not decrypted; their page count is reported as None.
+
+    Args:
+        input_file_path (list[str]): Paths of the PDF files to inspect.
+
+    Returns:
+        Result: A standardized Result object. On success, 'data' contains:
+            - files (list[dict]): One entry per input with 'path', 'status',
+              'page_count', 'encrypted' and 'message' keys.
+            - total_pages (int): Sum of the known page counts.
+    """
+
+    if not input_file_path:
+        return Result(
+            success=False, title="No files", message="No input files selected."
+        )
+
+    try:
+        files: list[dict] = []
+        total_pages = 0
+
+        for pdf in input_file_path:
+            inspection = inspect_pdf(path=pdf)
+            page_count = (
+                inspection.page_count
+                if inspection.status == PDFValidationStatus.VALID
+                else None
+            )
+            total_pages += page_count or 0
+
+            files.append(
+                {
+                    "path": pdf,
+                    "status": inspection.status.value,
+                    "page_count": page_count,
+                    "encrypted": inspection.is_encrypted,
+                    "message": inspection.message,
+                }
+            )
+
+        return Result(
+            success=True,
+            title="Success",
+            message=f"Inspected {len(files)} PDF files with {total_pages} pages in total.",
+            error_type="info",
+            data={"files": files, "total_pages": total_pages},
+        )
+
+    except Exception as e:
+        return handle_exception(exc=e, context="Inspecting PDFs")
@@ -8,14 +8,48 @@ from PyPDF2 import PdfMerger, PdfReader
 
 from core.error_handler import handle_exception
 from core.globals import ENCRYPTED_FILE_HANDLING, EncryptedFileHandling
+from core.incremental_append import IncrementalPdfAppender
+from core.page_selection import PageSelection, parse_page_selection
+from core.pdf_compress import compress_pdf_file, compression_note, write_pdf
+from core.reader_pool import PooledPdfMerger, ReaderPool
 from core.result import Result
-from core.utils import PDFValidationStatus, validate_pdf_file
+from core.streaming_merger import StreamingPdfMerger
+from core.utils import (
+    PDFValidationStatus,
+    detect_encryption_from_trailer,
+    inspect_pdfs_ahead,
+    prescreen_pdf,
+    probe_page_count,
+)
+
+
+def _append_selection(
+    merger: PdfMerger | StreamingPdfMerger,
+    reader: PdfReader,
+    selection: PageSelection,
+) -> None:
+    """Append the selected pages of a reader, in selection order."""
+    if isinstance(merger, StreamingPdfMerger):
+        merger.append(reader, selection.indices())
+        return
+
+    # PdfMerger takes (start, stop, step) index tuples
+    for page_range in selection.ranges:
+        indices = page_range.index_range()
+        merger.append(reader, pages=(indices.start, indices.stop, indices.step))
 
 
 def merge_pdf(
     input_file_path: list[str],
     output_file_path: str,
     ask_password_callback: Callable[[str], str | None] | None,
+    streaming: bool = False,
+    dedupe: bool = False,
+    read_ahead: int = 0,
+    page_specs: list[str | None] | None = None,
+    append: bool = False,
+    compress_level: int | None = None,
+    max_open_files: int = 0,
 ) -> Result:
     """
     Merge multiple PDF files into a single output PDF.
@@ -30,14 +64,52 @@ def merge_pdf(
             List of paths to input PDF files to be merged.
 
         output_file_path (str):
-            Destination file path for the merged PDF. Must not already exist and
-            must not overlap with input files.
+            Destination file path for the merged PDF. Must not already exist
+            (unless appending) and must not overlap with input files.
 
         ask_password_callback (Callable[[str], str | None] | None):
             Optional callback to provide passwords for encrypted PDFs.
             If not provided, encrypted PDFs will be skipped unless global handling
             allows silent skipping.
 
+        streaming (bool):
+            Write each PDF to the output as soon as it is read instead of keeping
+            every input in memory until the end. Peak memory is then bounded by
+            the largest input; bookmarks and named destinations are not copied.
+
+        dedupe (bool):
+            Write identical fonts, images and other resources shared by the
+            input PDFs only once. Implies the streaming merge. The bytes saved
+            are reported in the Result's 'bytes_saved' data.
+
+        read_ahead (int):
+            Number of upcoming input PDFs opened and parsed on background
+            threads while the current one is appended. The output page order
+            is unchanged. 0 (default) opens each PDF only when it is reached.
+
+        page_specs (list[str | None] | None):
+            Page selection spec per input, in the same order as input_file_path
+            (e.g. ["1-2", None, "last"]); None takes every page of that input.
+            Selected pages are copied straight from the source PDF.
+
+        append (bool):
+            Add the pages to the existing PDF at output_file_path with an
+            incremental update instead of creating a new file. Only the new
+            pages are written, so the cost does not depend on the size of the
+            existing document. Bookmarks of the inputs are not copied.
+
+        compress_level (int | None):
+            Pack the merged PDF into compressed object streams with a
+            cross-reference stream, using this zlib level (0-9). The byte
+            counts with and without packing are reported in the Result's
+            'bytes_before' and 'bytes_after' data. Not available with append.
+
+        max_open_files (int):
+            Keep the inputs on disk instead of in memory until the output is
+            written, with at most this many of them open at once. The least
+            recently used are closed and transparently reopened when the
+            merger reads them again. 0 (default) keeps every input in memory.
+
     Returns:
         Result: A standardized Result object indicating success or failure, along with an appropriate title and metadata.
     """
@@ -63,6 +135,13 @@ def merge_pdf(
             message="Output file path cannot be same as any input file.",
         )
 
+    if page_specs is not None and len(page_specs) != len(input_file_path):
+        return Result(
+            success=False,
+            title="Invalid page selection",
+            message="One page selection is needed per input file.",
+        )
+
     for file in input_file_path:
         if not os.path.exists(file):
             return Result(
@@ -70,7 +149,39 @@ def merge_pdf(
                 title="Non existent PDF",
                 message=f"Input file {file} does not exist.",
             )
-    if os.path.exists(output_file_path):
+    if max_open_files < 0:
+        return Result(
+            success=False,
+            title="Invalid open file limit",
+            message="The open file limit must be at least 1 (or 0 for no limit).",
+        )
+
+    if append and compress_level is not None:
+        return Result(
+            success=False,
+            title="Invalid options",
+            message="An appended PDF cannot be compressed; it would be rewritten entirely.",
+        )
+
+    if append:
+        if not os.path.isfile(output_file_path):
+            return Result(
+                success=False,
+                title="Non existent PDF",
+                message=f"Output file {output_file_path} does not exist.",
+            )
+        # Only the header and trailer are read: a full parse costs as much as
+        # the target, and the appender reports what these checks let through
+        status, error_message = prescreen_pdf(output_file_path)
+        if status is None and detect_encryption_from_trailer(output_file_path):
+            error_message = "The file is encrypted"
+        if error_message:
+            return Result(
+                success=False,
+                title="Invalid output PDF",
+                message=f"Cannot append to {Path(output_file_path).name}: {error_message}",
+            )
+    elif os.path.exists(output_file_path):
         return Result(
             success=False, title="Duplicate file", message="Location already exists."
         )
@@ -79,10 +190,29 @@ def merge_pdf(
     wrong_password_files: list[str] = []
     skipped_encrypted_files: list[str] = []
 
-    merger = PdfMerger()
+    merger: PdfMerger | StreamingPdfMerger | None = None
+    pool: ReaderPool | None = None
     try:
-        for pdf in input_file_path:
-            is_valid, status, error_message = validate_pdf_file(path=pdf)
+        if max_open_files:
+            pool = ReaderPool(max_open_files)
+
+        if append:
+            merger = IncrementalPdfAppender(output_file_path, dedupe=dedupe)
+        elif streaming or dedupe:
+            merger = StreamingPdfMerger(output_file_path, dedupe=dedupe)
+        elif pool is not None:
+            merger = PooledPdfMerger()
+        else:
+            merger = PdfMerger()
+
+        specs = page_specs or [None] * len(input_file_path)
+        # A pooled reader keeps the input on disk rather than in memory
+        open_reader = pool.open_reader if pool is not None else None
+        for inspection, spec in zip(
+            inspect_pdfs_ahead(input_file_path, read_ahead, open_reader), specs
+        ):
+            pdf = inspection.path
+            is_valid, status, error_message = inspection.as_tuple()
 
             password: str | None = None
 
@@ -118,7 +248,7 @@ def merge_pdf(
                     skipped_encrypted_files.append(pdf)
                     continue
 
-            reader = PdfReader(pdf)
+            reader = inspection.reader
 
             if reader.is_encrypted:
                 if password is not None:
@@ -130,7 +260,19 @@ def merge_pdf(
                     skipped_encrypted_files.append(pdf)
                     continue
 
-            merger.append(reader)
+            if spec is None:
+                merger.append(reader)
+            else:
+                selection, error = parse_page_selection(spec, probe_page_count(reader))
+                if selection is None:
+                    return Result(
+                        success=False,
+                        title="Invalid page selection",
+                        message=f"{Path(pdf).name}: {error}",
+                    )
+                _append_selection(merger, reader, selection)
+            # Drop the references so a streamed input is freed before the next one
+            inspection = reader = None
         if len(merger.pages) == 0:  # No pages added
             return Result(
                 success=False,
@@ -138,7 +280,17 @@ def merge_pdf(
                 message="No valid PDFs to merge in the directory.",
             )
 
-        merger.write(output_file_path)
+        if compress_level is None:
+            merger.write(output_file_path)
+        elif isinstance(merger, StreamingPdfMerger):
+            merger.write(output_file_path)
+            bytes_before, bytes_after = compress_pdf_file(
+                output_file_path, compress_level
+            )
+        else:
+            bytes_before, bytes_after = write_pdf(
+                merger, output_file_path, compress_level
+            )
 
         notes: list[str] = []
 
@@ -156,20 +308,43 @@ def merge_pdf(
             invalid_names = ", ".join(Path(f).name for f in invalid_files)
             notes.append(f"Invalid PDFs: {invalid_names}")
 
+        message = "PDFs merged successfully!"
+        if append:
+            message = (
+                f"{len(merger.pages)} pages appended to {Path(output_file_path).name}"
+                f" ({merger.existing_pages + len(merger.pages)} pages in total)."
+            )
+        data = {
+            "invalid_files": invalid_files,
+            "skipped_encrypted_files": skipped_encrypted_files,
+            "wrong_password_files": wrong_password_files,
+        }
+        if dedupe:
+            data["deduplicated_objects"] = merger.deduplicated_objects
+            data["bytes_saved"] = merger.bytes_saved
+            message += (
+                f" {merger.deduplicated_objects} duplicate resources removed,"
+                f" saving {merger.bytes_saved:,} bytes."
+            )
+
+        if compress_level is not None:
+            data["bytes_before"] = bytes_before
+            data["bytes_after"] = bytes_after
+            message += " " + compression_note(bytes_before, bytes_after)
+
         return Result(
             success=True,
             title="Success",
-            message="PDFs merged successfully!",
+            message=message,
             error_type="info",
-            data={
-                "invalid_files": invalid_files,
-                "skipped_encrypted_files": skipped_encrypted_files,
-                "wrong_password_files": wrong_password_files,
-            },
+            data=data,
         )
 
     except Exception as e:
         return handle_exception(exc=e, context="merging PDFs")
 
     finally:
-        merger.close()
+        if merger is not None:
+            merger.close()
+        if pool is not None:
+            pool.close()
@@ -1,181 +1,447 @@
 # PDF split logic
 
 import os
-from typing import Callable
+import re
+from typing import Any, Callable
 
 from PyPDF2 import PdfReader, PdfWriter
 
 from core.error_handler import handle_exception
 from core.globals import ENCRYPTED_FILE_HANDLING, EncryptedFileHandling
+from core.output_archive import check_archive_target, open_output, output_label
+from core.output_stage import find_clash
+from core.page_selection import parse_page_selection
+from core.pdf_compress import compression_note
+from core.resource_pruning import add_page
 from core.result import Result
-from core.utils import PDFValidationStatus, parse_page_ranges, validate_pdf_file
+from core.utils import PDFValidationStatus, inspect_pdf, probe_page_count
+
+# Characters that cannot appear in file names on common filesystems
+_UNSAFE_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]+')
+
+# Longest bookmark title kept in a file name
+MAX_TITLE_LENGTH = 100
+
+
+def _open_source(
+    file_path: str,
+    output_dir: str | None,
+    ask_password_callback: Callable[[str], str | None] | None,
+) -> tuple[PdfReader | None, Result | None]:
+    """
+    Check the paths of a split and open (and decrypt) its source PDF.
+
+    output_dir is None when the files go to an archive.
+
+    Returns:
+        tuple[PdfReader | None, Result | None]: The reader, or the Result
+            explaining why the split cannot be done.
+    """
+    if not os.path.isfile(file_path):
+        return None, Result(
+            success=False,
+            error_type="error",
+            title="File Not Found",
+            message=f"The original file does not exist: {file_path}",
+        )
+
+    if output_dir is not None and not os.path.isdir(output_dir):
+        return None, Result(
+            success=False,
+            error_type="error",
+            title="Invalid output directory",
+            message=f"The specified directory does not exist: {output_dir}",
+        )
+
+    if not file_path.lower().endswith(".pdf"):
+        # raise ValueError("Selected file is not a PDF.")
+        return None, Result(
+            success=False,
+            error_type="error",
+            title="Invalid file",
+            message="Selected file is not a PDF",
+        )
+
+    inspection = inspect_pdf(path=file_path)
+    is_valid, status, error_message = inspection.as_tuple()
+
+    password: str | None = None
+
+    if (
+        not is_valid and status == PDFValidationStatus.CORRUPTED
+    ) or status == PDFValidationStatus.NOT_PDF:
+        return None, Result(
+            success=False,
+            error_type="error",
+            title="Invalid PDF",
+            message=f"{error_message}",
+        )
+
+    if status == PDFValidationStatus.ENCRYPTED:
+        if ask_password_callback is None:
+            return None, Result(
+                success=False,
+                title="Encrypted PDF detected",
+                message="No function to collect the password of the encrypted PDF",
+                error_type="error",
+            )
+
+        password = ask_password_callback(file_path)
+
+        if not password:
+            if ENCRYPTED_FILE_HANDLING == EncryptedFileHandling.SKIP:
+                return None, Result(
+                    success=False,
+                    title="Encrypted PDF detected",
+                    message="Current encrypted PDF will be skipped",
+                    error_type="info",
+                )
+            elif ENCRYPTED_FILE_HANDLING == EncryptedFileHandling.SKIP_ALL:
+                return None, Result(
+                    success=False,
+                    title="Encrypted PDF detected",
+                    message="All encrypted PDFs will be skipped",
+                    error_type="info",
+                )
+            return None, Result(
+                success=False,
+                title="Encrypted PDF detected",
+                message="Encrypted PDF was not given password",
+                error_type="error",
+            )
+
+    reader = inspection.reader
+
+    if reader.is_encrypted:
+        if not password:
+            return None, Result(
+                success=False,
+                title="Encrypted PDF detected",
+                message="Password required but not provided or incorrect",
+                error_type="error",
+            )
+        elif reader.decrypt(password) == 0:
+            return None, Result(
+                success=False,
+                title="Wrong Password",
+                message="The provided password for the encrypted PDF is incorrect",
+                error_type="error",
+            )
+
+    return reader, None
 
 
 def split_pdf(
     file_path: str,
     page_range_input: str,
-    output_dir: str,
+    output_dir: str | None,
     ask_password_callback: Callable[[str], str | None] | None,
+    compress_level: int | None = None,
+    prune_resources: bool = True,
+    archive: str | None = None,
+    archive_format: str | None = None,
 ) -> Result:
     """
     Split a PDF file into multiple files based on user-defined page ranges.
 
+    All the output names are checked against the output directory before
+    anything is written; the files are written to a staging directory and
+    published together, so a failed run leaves no files behind.
+
     Args:
         file_path (str): Path to the input PDF file.
-        page_range_input (str): Page ranges as a string (e.g., "1-3,4,5-7").
-        output_dir (str): Directory to save the resulting split PDF files.
+        page_range_input (str): Page selection spec (e.g., "1-3,4,5-7", "10-", "last", "odd").
+            Each comma-separated range is written to its own file.
+        output_dir (Optional[str]): Directory to save the resulting split PDF files;
+            unused with an archive.
         ask_password_callback (Optional[Callable[[str], str | None]]): Optional
             function to request password for encrypted PDFs.
+        compress_level (Optional[int]): Pack the output PDFs into compressed object
+            streams with a cross-reference stream, using this zlib level (0-9).
+            The byte counts with and without packing are reported in the
+            Result's 'bytes_before' and 'bytes_after' data.
+        prune_resources (bool): Copy only the fonts, images and graphics
+            states each page draws with, instead of its whole (often
+            document-wide) resource dictionary. The number of entries dropped
+            is reported in the Result's 'pruned_resources' data.
+        archive (Optional[str]): Write the files into this .zip or .tar archive
+            (or to stdout as a tar archive with "-"), with a manifest of the
+            source pages of each, instead of to output_dir. See
+            core.output_archive.
+        archive_format (Optional[str]): "zip" or "tar", when it cannot be told
+            from the archive's extension.
 
     Returns:
         Result: Standardized Result object containing success status, messages,
                 and metadata (such as list of created files).
     """
     try:
-        if not os.path.isfile(file_path):
+        if archive is not None:
+            failure = check_archive_target(archive, archive_format)
+            if failure is not None:
+                return failure
+            output_dir = None
+
+        reader, failure = _open_source(file_path, output_dir, ask_password_callback)
+        if failure is not None:
+            return failure
+
+        total_pages = probe_page_count(reader)
+
+        selection, msg = parse_page_selection(page_range_input, total_pages)
+
+        if msg:
             return Result(
                 success=False,
                 error_type="error",
-                title="File Not Found",
-                message=f"The original file does not exist: {file_path}",
+                title="Invalid page range",
+                message=msg,
             )
 
-        if not os.path.isdir(output_dir):
+        basename = os.path.splitext(os.path.basename(file_path))[0]
+
+        if selection is None:
             return Result(
                 success=False,
                 error_type="error",
-                title="Invalid output directory",
-                message=f"The specified directory does not exist: {output_dir}",
+                title="Invalid page range",
+                message="Page range cannot be empty",
             )
 
-        if not file_path.lower().endswith(".pdf"):
-            # raise ValueError("Selected file is not a PDF.")
+        saved_files = [
+            f"{basename}_{page_range.file_suffix()}.pdf"
+            for page_range in selection.ranges
+        ]
+        clash = find_clash(output_dir, saved_files) if archive is None else None
+        if clash is not None:
             return Result(
                 success=False,
                 error_type="error",
-                title="Invalid file",
-                message="Selected file is not a PDF",
+                title="File Exists",
+                message=f"File '{clash}' already exists in the output directory.",
             )
 
-        is_valid, status, error_message = validate_pdf_file(path=file_path)
+        bytes_before = bytes_after = pruned_resources = 0
+        with open_output(output_dir, archive, archive_format, file_path) as output:
+            for page_range, filename in zip(selection.ranges, saved_files):
+                writer = PdfWriter()
+                for page_number in page_range:
+                    pruned_resources += add_page(
+                        writer, reader.pages[page_number - 1], prune_resources
+                    )
 
-        password: str | None = None
+                before, after = output.write_pdf(
+                    writer, filename, list(page_range), compress_level
+                )
+                bytes_before += before
+                bytes_after += after
 
-        if (
-            not is_valid and status == PDFValidationStatus.CORRUPTED
-        ) or status == PDFValidationStatus.NOT_PDF:
-            return Result(
-                success=False,
-                error_type="error",
-                title="Invalid PDF",
-                message=f"{error_message}",
-            )
+            output.publish(saved_files)
 
-        if status == PDFValidationStatus.ENCRYPTED:
-            if ask_password_callback is None:
-                return Result(
-                    success=False,
-                    title="Encrypted PDF detected",
-                    message="No function to collect the password of the encrypted PDF",
-                    error_type="error",
-                )
+        message = f"PDF successfully split into {len(selection.ranges)} files and saved to {output_label(output_dir, archive)}."
+        data = {"files": saved_files}
+        if archive is not None:
+            data["archive"] = archive
+        if prune_resources:
+            data["pruned_resources"] = pruned_resources
+        if compress_level is not None:
+            message += " " + compression_note(bytes_before, bytes_after)
+            data["bytes_before"] = bytes_before
+            data["bytes_after"] = bytes_after
 
-            password = ask_password_callback(file_path)
+        return Result(
+            success=True,
+            error_type="info",
+            title="Success",
+            message=message,
+            data=data,
+        )
 
-            if not password:
-                if ENCRYPTED_FILE_HANDLING == EncryptedFileHandling.SKIP:
-                    return Result(
-                        success=False,
-                        title="Encrypted PDF detected",
-                        message="Current encrypted PDF will be skipped",
-                        error_type="info",
-                    )
-                elif ENCRYPTED_FILE_HANDLING == EncryptedFileHandling.SKIP_ALL:
-                    return Result(
-                        success=False,
-                        title="Encrypted PDF detected",
-                        message="All encrypted PDFs will be skipped",
-                        error_type="info",
-                    )
-                return Result(
-                    success=False,
-                    title="Encrypted PDF detected",
-                    message="Encrypted PDF was not given password",
-                    error_type="error",
-                )
+    except Exception as e:
+        return handle_exception(exc=e, context="Splitting PDF")
 
-        reader = PdfReader(file_path)
 
-        if reader.is_encrypted:
-            if not password:
-                return Result(
-                    success=False,
-                    title="Encrypted PDF detected",
-                    message="Password required but not provided or incorrect",
-                    error_type="error",
-                )
-            elif reader.decrypt(password) == 0:
-                return Result(
-                    success=False,
-                    title="Wrong Password",
-                    message="The provided password for the encrypted PDF is incorrect",
-                    error_type="error",
-                )
+def _outline_entries(
+    reader: PdfReader, outline: list[Any], max_depth: int, depth: int = 1
+) -> list[tuple[str, int]]:
+    """(title, 0-based page index) of the outline entries down to max_depth, in outline order."""
+    entries: list[tuple[str, int]] = []
+    for item in outline:
+        if isinstance(item, list):
+            if depth < max_depth:
+                entries.extend(_outline_entries(reader, item, max_depth, depth + 1))
+            continue
+        page = reader.get_destination_page_number(item)
+        if page is not None and page >= 0:
+            entries.append((str(item.title or ""), page))
+    return entries
 
-        total_pages = len(reader.pages)
 
-        page_ranges, msg = parse_page_ranges(page_range_input, total_pages)
+def _title_filename(title: str, used: set[str]) -> str:
+    """A file name made from a bookmark title, unique among used (which it is added to)."""
+    stem = _UNSAFE_FILENAME_CHARS.sub("_", title).strip().rstrip(".")
+    stem = stem[:MAX_TITLE_LENGTH].strip() or "section"
+    filename = f"{stem}.pdf"
+    number = 2
+    while filename.lower() in used:
+        filename = f"{stem}_{number}.pdf"
+        number += 1
+    used.add(filename.lower())
+    return filename
 
-        if msg:
+
+def outline_sections(reader: PdfReader, depth: int = 1) -> list[tuple[str, int, int]]:
+    """
+    Compute the page interval of every outline entry down to depth.
+
+    Each entry covers the pages from its destination up to the page before
+    the next entry (of any level down to depth), or the end of the document.
+    Entries sharing their first page with the next one, such as a parent
+    starting on the same page as its first child, cover no page and are left
+    out; so are pages before the first entry.
+
+    Args:
+        reader (PdfReader): The opened (and decrypted) PDF.
+        depth (int): Deepest outline level used; 1 is the top level.
+
+    Returns:
+        list[tuple[str, int, int]]: (title, start, stop) of each section, with
+            0-based page indexes (stop excluded), in page order.
+    """
+    entries = _outline_entries(reader, reader.outline, depth)
+    # Sorted by page, keeping outline order for entries on the same page
+    entries.sort(key=lambda entry: entry[1])
+
+    page_count = probe_page_count(reader)
+    sections: list[tuple[str, int, int]] = []
+    for index, (title, start) in enumerate(entries):
+        stop = entries[index + 1][1] if index + 1 < len(entries) else page_count
+        if start < stop:
+            sections.append((title, start, stop))
+    return sections
+
+
+def split_pdf_by_outline(
+    file_path: str,
+    output_dir: str | None,
+    ask_password_callback: Callable[[str], str | None] | None,
+    depth: int = 1,
+    compress_level: int | None = None,
+    prune_resources: bool = True,
+    archive: str | None = None,
+    archive_format: str | None = None,
+) -> Result:
+    """
+    Split a PDF into one file per outline (bookmark) entry.
+
+    The outline is read once to compute the page interval of each entry
+    (see outline_sections()), then every section is written in page order
+    from the same reader. Files are named after the bookmark titles, with a
+    numeric suffix when titles repeat. Like split_pdf(), all the names are
+    checked before anything is written and the files are published together.
+
+    Args:
+        file_path (str): Path to the input PDF file.
+        output_dir (Optional[str]): Directory to save the resulting PDF files;
+            unused with an archive.
+        ask_password_callback (Optional[Callable[[str], str | None]]): Optional
+            function to request password for encrypted PDFs.
+        depth (int): Deepest outline level that starts a new file; 1 (default)
+            splits on the top-level bookmarks only.
+        compress_level (Optional[int]): Pack the output PDFs into compressed object
+            streams with a cross-reference stream, using this zlib level (0-9).
+        prune_resources (bool): Copy only the fonts, images and graphics
+            states each page draws with.
+        archive (Optional[str]): Write the files into this .zip or .tar archive
+            (or "-" for stdout) instead of to output_dir, as split_pdf() does.
+        archive_format (Optional[str]): "zip" or "tar", when it cannot be told
+            from the archive's extension.
+
+    Returns:
+        Result: Standardized Result object. On success, 'files' in data lists
+            the created files and 'sections' the title and 1-based first and
+            last page of each.
+    """
+    if depth < 1:
+        return Result(
+            success=False,
+            error_type="error",
+            title="Invalid depth",
+            message="The outline depth must be at least 1.",
+        )
+
+    try:
+        if archive is not None:
+            failure = check_archive_target(archive, archive_format)
+            if failure is not None:
+                return failure
+            output_dir = None
+
+        reader, failure = _open_source(file_path, output_dir, ask_password_callback)
+        if failure is not None:
+            return failure
+
+        sections = outline_sections(reader, depth)
+        if not sections:
             return Result(
                 success=False,
                 error_type="error",
-                title="Invalid page range",
-                message=msg,
+                title="No outline",
+                message="The PDF has no bookmarks pointing to its pages.",
             )
 
-        basename = os.path.splitext(os.path.basename(file_path))[0]
-
-        saved_files = []
-        if page_ranges is None:
+        used: set[str] = set()
+        saved_files = [_title_filename(title, used) for title, _, _ in sections]
+        clash = find_clash(output_dir, saved_files) if archive is None else None
+        if clash is not None:
             return Result(
                 success=False,
                 error_type="error",
-                title="Invalid page range",
-                message="Page range cannot be empty",
+                title="File Exists",
+                message=f"File '{clash}' already exists in the output directory.",
             )
-        for start, end in page_ranges:
-            writer = PdfWriter()
-            for i in range(start - 1, end):
-                writer.add_page(reader.pages[i])
-
-            if start == end:
-                filename = f"{basename}_page_{start}.pdf"
-            else:
-                filename = f"{basename}_pages_{start}-{end}.pdf"
 
-            output_path = os.path.join(output_dir, filename)
+        bytes_before = bytes_after = pruned_resources = 0
+        with open_output(output_dir, archive, archive_format, file_path) as output:
+            for (_, start, stop), filename in zip(sections, saved_files):
+                writer = PdfWriter()
+                for index in range(start, stop):
+                    pruned_resources += add_page(
+                        writer, reader.pages[index], prune_resources
+                    )
 
-            if os.path.exists(output_path):
-                return Result(
-                    success=False,
-                    error_type="error",
-                    title="File Exists",
-                    message=f"File '{filename}' already exists in the output directory.",
+                before, after = output.write_pdf(
+                    writer, filename, list(range(start + 1, stop + 1)), compress_level
                 )
+                bytes_before += before
+                bytes_after += after
 
-            with open(output_path, "wb") as out_pdf:
-                writer.write(out_pdf)
+            output.publish(saved_files)
 
-            saved_files.append(filename)
+        message = f"PDF successfully split into {len(saved_files)} files at its bookmarks and saved to {output_label(output_dir, archive)}."
+        data = {
+            "files": saved_files,
+            "sections": [
+                {"title": title, "first_page": start + 1, "last_page": stop}
+                for title, start, stop in sections
+            ],
+        }
+        if archive is not None:
+            data["archive"] = archive
+        if prune_resources:
+            data["pruned_resources"] = pruned_resources
+        if compress_level is not None:
+            message += " " + compression_note(bytes_before, bytes_after)
+            data["bytes_before"] = bytes_before
+            data["bytes_after"] = bytes_after
 
         return Result(
             success=True,
             error_type="info",
             title="Success",
-            message=f"PDF successfully split into {len(page_ranges)} files and saved to {output_dir}.",
-            data={"files": saved_files},
+            message=message,
+            data=data,
         )
 
     except Exception as e:
-        return handle_exception(exc=e, context="Splitting PDF")
+        return handle_exception(exc=e, context="Splitting PDF at its bookmarks")
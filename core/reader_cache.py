@@ -0,0 +1,133 @@
+# Shared in-process reader cache
+
+"""
+In-memory cache of parsed PDFs shared by the operations run in one process.
+
+Every core operation opens its inputs through inspect_pdf(), which parses
+the file again on each call. When many operations run back to back (see
+core/job_runner.py), the same inputs are often read by several of them; while
+a cache is activated with shared_reader_cache(), inspect_pdf() hands out the
+inspection, and its live reader, parsed by the previous call instead.
+
+Entries are keyed by file identity (absolute path, size, mtime_ns), so a file
+that is rewritten or replaced between operations is parsed again. The cache
+holds at most max_entries readers and evicts the least recently used first.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from core.utils import PDFInspection
+
+DEFAULT_MAX_READERS = 32
+
+_active_cache: "SharedReaderCache | None" = None
+
+
+class SharedReaderCache:
+    def __init__(self, max_entries: int = DEFAULT_MAX_READERS):
+        """
+        LRU cache of PDF inspections that keep a parsed reader.
+
+        Attributes:
+            max_entries (int): Maximum number of cached inspections.
+            hits (int): Lookups answered from the cache.
+            misses (int): Lookups that had to parse the file.
+
+        Methods:
+            get(path): Return the cached inspection of an unchanged file, or None.
+            put(inspection): Cache an inspection that has a reader.
+            clear(): Drop every entry.
+        """
+
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[
+            tuple[str, int, int], "PDFInspection"
+        ] = OrderedDict()
+
+    @staticmethod
+    def _file_key(path: str) -> tuple[str, int, int] | None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+    def get(self, path: str) -> "PDFInspection | None":
+        key = self._file_key(path)
+        with self._lock:
+            inspection = self._entries.get(key) if key else None
+            if inspection is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return inspection
+
+    def put(self, inspection: "PDFInspection") -> None:
+        if inspection.reader is None or self.max_entries <= 0:
+            return
+        key = self._file_key(inspection.path)
+        if key is None:
+            return
+        with self._lock:
+            self._entries[key] = inspection
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def get_shared_reader_cache() -> SharedReaderCache | None:
+    """Return the activated cache, or None when inputs are parsed on every use."""
+    return _active_cache
+
+
+def activate_shared_reader_cache(
+    max_entries: int = DEFAULT_MAX_READERS,
+) -> SharedReaderCache:
+    """
+    Activate a new process-wide reader cache, replacing any active one.
+
+    Args:
+        max_entries (int): Maximum number of cached readers.
+
+    Returns:
+        SharedReaderCache: The activated cache.
+    """
+    global _active_cache
+    _active_cache = SharedReaderCache(max_entries)
+    return _active_cache
+
+
+@contextmanager
+def shared_reader_cache(
+    max_entries: int = DEFAULT_MAX_READERS,
+) -> Iterator[SharedReaderCache]:
+    """
+    Share parsed readers between the operations run inside the block.
+
+    Args:
+        max_entries (int): Maximum number of cached readers.
+
+    Yields:
+        SharedReaderCache: The activated cache; the previous one is restored on exit.
+    """
+    global _active_cache
+    previous = _active_cache
+    cache = activate_shared_reader_cache(max_entries)
+    try:
+        yield cache
+    finally:
+        cache.clear()
+        _active_cache = previous
@@ -0,0 +1,203 @@
+# Bounded pool of open PDF sources
+
+"""
+Keep the inputs of a merge on disk with a bounded number of open files.
+
+PdfMerger keeps every input it is given until write(): a PdfReader built
+from a path holds the whole file in memory, and one built from a file
+object holds the file descriptor open, so merging thousands of PDFs costs
+either the size of all of them in memory or one descriptor each (and runs
+into `ulimit -n`).
+
+A ReaderPool hands out PooledFile objects instead. Each one remembers its
+path and position and borrows a real file handle from the pool only while it
+is read; once more than max_open handles are in use, the least recently used
+one is closed, and it is reopened (and positioned again) the next time its
+source is read, typically while the merger writes the output. PooledPdfMerger
+is a PdfMerger that keeps pooled inputs as they are instead of copying them
+into memory.
+"""
+
+import io
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, BinaryIO
+
+from PyPDF2 import PdfMerger, PdfReader
+
+# Leaves room under the common default `ulimit -n` of 1024
+DEFAULT_MAX_OPEN_FILES = 256
+
+
+class PooledFile(io.RawIOBase):
+    def __init__(self, pool: "ReaderPool", path: str):
+        """
+        Read-only binary file whose handle is opened and closed by a ReaderPool.
+
+        Attributes:
+            pool (ReaderPool): The pool lending the file handle.
+            path (str): The file read.
+            mode (str): Always "rb".
+
+        Methods:
+            read(size): Read from the current position, reopening the file if needed.
+            seek(offset, whence): Move the position without touching a closed handle.
+            tell(): Return the current position.
+            reopen(): Return a new PooledFile of the same path, at position 0.
+            close(): Give the handle back to the pool.
+        """
+
+        super().__init__()
+        self.pool = pool
+        self.path = path
+        self.mode = "rb"
+        self._position = 0
+        self._evicted = False
+        self._size = os.path.getsize(path)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_SET:
+            position = offset
+        elif whence == os.SEEK_CUR:
+            position = self._position + offset
+        elif whence == os.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+
+        self._position = position
+        self.pool._seek_handle(self, position)
+        return position
+
+    def read(self, size: int = -1) -> bytes:
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        # Held across the read so another thread cannot evict the handle midway
+        with self.pool._lock:
+            data = self.pool._handle(self).read(size)
+        self._position += len(data)
+        return data
+
+    def readall(self) -> bytes:
+        return self.read(-1)
+
+    def readinto(self, buffer: Any) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def reopen(self) -> "PooledFile":
+        return self.pool.open(self.path)
+
+    def close(self) -> None:
+        if not self.closed:
+            self.pool._release(self)
+        super().close()
+
+
+class ReaderPool:
+    def __init__(self, max_open: int = DEFAULT_MAX_OPEN_FILES):
+        """
+        LRU pool bounding the file handles open for PooledFile sources.
+
+        Attributes:
+            max_open (int): Maximum number of file handles open at once.
+            opened (int): Handles opened, including reopenings.
+            reopened (int): Handles reopened after being evicted.
+            peak_open (int): Highest number of handles open at once.
+
+        Methods:
+            open(path): Return a PooledFile reading path.
+            open_reader(path): Return a PdfReader parsing a PooledFile of path.
+            close(): Close every open handle.
+
+        Raises:
+            ValueError: If max_open is less than 1.
+        """
+
+        if max_open < 1:
+            raise ValueError("The pool needs at least one open file")
+
+        self.max_open = max_open
+        self.opened = 0
+        self.reopened = 0
+        self.peak_open = 0
+        # Re-entrant: a PooledFile collected while the lock is held releases itself
+        self._lock = threading.RLock()
+        self._handles: OrderedDict[PooledFile, BinaryIO] = OrderedDict()
+
+    def open(self, path: str) -> PooledFile:
+        return PooledFile(self, path)
+
+    def open_reader(self, path: str) -> PdfReader:
+        return PdfReader(self.open(path))
+
+    def _handle(self, source: PooledFile) -> BinaryIO:
+        """Return the open handle of source, opening it (and evicting) if needed."""
+        with self._lock:
+            handle = self._handles.get(source)
+            if handle is not None:
+                self._handles.move_to_end(source)
+                return handle
+
+            while len(self._handles) >= self.max_open:
+                evicted, old_handle = self._handles.popitem(last=False)
+                old_handle.close()
+                evicted._evicted = True
+
+            handle = open(source.path, "rb")
+            handle.seek(source.tell())
+            self._handles[source] = handle
+            self.opened += 1
+            if source._evicted:
+                source._evicted = False
+                self.reopened += 1
+            self.peak_open = max(self.peak_open, len(self._handles))
+            return handle
+
+    def _seek_handle(self, source: PooledFile, position: int) -> None:
+        # A closed handle is positioned when it is reopened
+        with self._lock:
+            handle = self._handles.get(source)
+            if handle is not None:
+                handle.seek(position)
+
+    def _release(self, source: PooledFile) -> None:
+        with self._lock:
+            handle = self._handles.pop(source, None)
+        if handle is not None:
+            handle.close()
+
+    def close(self) -> None:
+        with self._lock:
+            handles = list(self._handles.values())
+            self._handles.clear()
+        for handle in handles:
+            handle.close()
+
+
+class PooledPdfMerger(PdfMerger):
+    """
+    PdfMerger that reads readers built on PooledFile sources from the pool.
+
+    Inputs opened with ReaderPool.open_reader() are kept as pooled files
+    (on disk, with a bounded number of handles) instead of being copied into
+    memory; any other input is handled as PdfMerger does.
+    """
+
+    def _create_stream(self, fileobj: Any) -> tuple[Any, Any]:
+        if isinstance(fileobj, PdfReader) and isinstance(fileobj.stream, PooledFile):
+            return fileobj.stream.reopen(), fileobj._encryption
+        return super()._create_stream(fileobj)
@@ -0,0 +1,206 @@
+# Unused page resource pruning
+
+"""
+Drop the fonts, images and graphics states a page does not use.
+
+Many producers give every page the same document-wide /Resources
+dictionary, so copying one page into its own file with PdfWriter.add_page()
+also copies every font and image of the document. pruned_page() scans the
+page's content stream for the names it draws with:
+
+  - /Font entries selected by the Tf operator;
+  - /XObject entries painted by Do (form XObjects without resources of
+    their own are scanned as well, since they draw with the page's);
+  - /ExtGState entries set by gs;
+
+and returns a copy of the page whose /Font, /XObject and /ExtGState
+dictionaries keep only those entries (used_resources() returns the names
+alone, so they can be reused). Other resource categories are kept
+as they are. The source page is never modified, so readers shared with
+other operations are unaffected. When the page cannot be analysed safely
+(unreadable content, Type 3 fonts drawing with the page's resources...),
+it is returned unchanged.
+"""
+
+import re
+
+from PyPDF2 import PageObject, PdfWriter
+from PyPDF2.generic import ArrayObject, DictionaryObject, NameObject
+
+# Resource category -> content stream operator using its names
+PRUNED_CATEGORIES = {"/Font": b"Tf", "/XObject": b"Do", "/ExtGState": b"gs"}
+
+# A name operand followed by Do or gs, or by the font size and Tf
+_NAME_OPERATOR = re.compile(
+    rb"/([^\s/\[\]()<>{}%]+)\s+"
+    rb"(?:[-+]?(?:\d+\.?\d*|\.\d+)\s+)?"
+    rb"(Tf|Do|gs)(?![^\s/\[\]()<>{}%])"
+)
+_NAME_ESCAPE = re.compile(rb"#([0-9A-Fa-f]{2})")
+
+# Nested form XObjects followed without resources of their own
+_MAX_FORM_DEPTH = 16
+
+
+class _UnsafeToPrune(Exception):
+    pass
+
+
+def _content_bytes(contents: object) -> bytes:
+    contents = contents.get_object() if contents is not None else None
+    if contents is None:
+        return b""
+    if isinstance(contents, ArrayObject):
+        return b"\n".join(part.get_object().get_data() for part in contents)
+    return contents.get_data()
+
+
+def _names_used(data: bytes) -> dict[str, set[str]]:
+    used: dict[str, set[str]] = {category: set() for category in PRUNED_CATEGORIES}
+    operators = {operator: category for category, operator in PRUNED_CATEGORIES.items()}
+    for match in _NAME_OPERATOR.finditer(data):
+        name = _NAME_ESCAPE.sub(lambda m: bytes([int(m.group(1), 16)]), match.group(1))
+        used[operators[match.group(2)]].add("/" + name.decode("latin-1"))
+    return used
+
+
+def _collect_used(
+    data: bytes,
+    resources: DictionaryObject,
+    used: dict[str, set[str]],
+    depth: int = 0,
+) -> None:
+    """Add the names drawn by data (and by the forms it paints) to used."""
+    if depth > _MAX_FORM_DEPTH:
+        raise _UnsafeToPrune("Form XObjects nested too deeply")
+
+    found = _names_used(data)
+    fonts = resources.get("/Font")
+    for name in found["/Font"] - used["/Font"]:
+        font = fonts.get_object().get(name) if fonts is not None else None
+        font = font.get_object() if font is not None else None
+        if font is not None and font.get("/Subtype") == "/Type3":
+            if "/Resources" not in font:
+                raise _UnsafeToPrune("Type 3 font drawing with the page resources")
+        used["/Font"].add(name)
+
+    used["/ExtGState"] |= found["/ExtGState"]
+
+    xobjects = resources.get("/XObject")
+    for name in found["/XObject"] - used["/XObject"]:
+        used["/XObject"].add(name)
+        xobject = xobjects.get_object().get(name) if xobjects is not None else None
+        xobject = xobject.get_object() if xobject is not None else None
+        # A form without /Resources draws with the resources of the page
+        if (
+            xobject is not None
+            and xobject.get("/Subtype") == "/Form"
+            and "/Resources" not in xobject
+        ):
+            _collect_used(xobject.get_data(), resources, used, depth + 1)
+
+
+def used_resources(page: PageObject) -> dict[str, set[str]] | None:
+    """
+    Return the names of the fonts, XObjects and ExtGStates a page draws with.
+
+    Args:
+        page (PageObject): A page of a reader.
+
+    Returns:
+        dict[str, set[str]] | None: Resource category -> names used, or None
+            if the page has no resource dictionary or cannot be analysed safely.
+    """
+    resources = page.get("/Resources")
+    resources = resources.get_object() if resources is not None else None
+    if not isinstance(resources, DictionaryObject):
+        return None
+
+    used: dict[str, set[str]] = {category: set() for category in PRUNED_CATEGORIES}
+    try:
+        _collect_used(_content_bytes(page.get("/Contents")), resources, used)
+    except Exception:
+        return None
+    return used
+
+
+def pruned_page(
+    page: PageObject, used: dict[str, set[str]] | None = None
+) -> tuple[PageObject, int]:
+    """
+    Return a copy of page without the fonts, XObjects and ExtGStates it does not use.
+
+    Args:
+        page (PageObject): A page of a reader; it is not modified.
+        used (dict[str, set[str]] | None): The names used_resources() returned
+            for the page, if already known; the content is scanned otherwise.
+
+    Returns:
+        tuple[PageObject, int]: The page to add to a writer (page itself when
+            nothing can be pruned) and the number of resource entries dropped.
+    """
+    if used is None:
+        used = used_resources(page)
+        if used is None:
+            return page, 0
+    resources = page.get("/Resources")
+    resources = resources.get_object() if resources is not None else None
+    if not isinstance(resources, DictionaryObject):
+        return page, 0
+
+    pruned = DictionaryObject()
+    dropped = 0
+    for key, value in resources.items():
+        category = value.get_object() if key in PRUNED_CATEGORIES else None
+        if not isinstance(category, DictionaryObject):
+            pruned[NameObject(key)] = resources.raw_get(key)
+            continue
+
+        kept = DictionaryObject(
+            {
+                NameObject(name): category.raw_get(name)
+                for name in category
+                if name in used[key]
+            }
+        )
+        dropped += len(category) - len(kept)
+        if kept:
+            pruned[NameObject(key)] = kept
+
+    if not dropped:
+        return page, 0
+
+    # Sharing the indirect reference makes PdfWriter translate references
+    # to the source page (e.g. annotations' /P) to this copy
+    copy = PageObject(page.pdf, page.indirect_reference)
+    for key in page:
+        copy[NameObject(key)] = page.raw_get(key)
+    copy[NameObject("/Resources")] = pruned
+    return copy, dropped
+
+
+def add_page(
+    writer: PdfWriter,
+    page: PageObject,
+    prune: bool = True,
+    used: dict[str, set[str]] | None = None,
+) -> int:
+    """
+    Add page to writer, without its unused resources if prune is set.
+
+    Args:
+        writer (PdfWriter): The writer receiving the page.
+        page (PageObject): A page of a reader; it is not modified.
+        prune (bool): Whether to drop the fonts, XObjects and ExtGStates the
+            page does not use.
+        used (dict[str, set[str]] | None): The names used_resources() returned
+            for the page, if already known.
+
+    Returns:
+        int: The number of resource entries dropped.
+    """
+    dropped = 0
+    if prune:
+        page, dropped = pruned_page(page, used)
+    writer.add_page(page)
+    return dropped
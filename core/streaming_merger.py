@@ -0,0 +1,343 @@
+# Streaming PDF merge writer
+
+"""
+Bounded-memory alternative to PyPDF2's PdfMerger.
+
+PdfMerger keeps every appended reader and page alive until write(). The
+StreamingPdfMerger instead serializes each input's pages, and the objects
+they reference, to a partial output file as soon as the input is appended.
+Between inputs it only keeps the byte offset of every written object and the
+object numbers of the pages, so peak memory is bounded by the largest single
+input rather than the sum of all inputs.
+
+Only pages and what they reference are copied; document-level structures
+such as bookmarks, named destinations and forms are not.
+
+With dedupe enabled, stream objects (fonts, images, ICC profiles...) are
+hashed by their dictionary, filters included, their encoded data and the
+content of everything they reference; a stream identical to one already
+written, from any input, is not written again (nor anything it references)
+and its references point at the existing object instead. Only a 32-byte
+digest per distinct stream is kept for this between inputs.
+"""
+
+import hashlib
+import os
+from io import BytesIO
+from typing import Any, BinaryIO, Iterable
+
+from PyPDF2 import PdfReader
+from PyPDF2.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NullObject,
+    NumberObject,
+    PdfObject,
+    StreamObject,
+)
+
+PDF_HEADER = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n"
+
+PART_SUFFIX = ".part"
+
+# Object numbers reserved for the document catalog and the root page tree node
+_CATALOG_NUMBER = 1
+_PAGES_NUMBER = 2
+
+
+class StreamingPdfMerger:
+    def __init__(self, output_file_path: str, dedupe: bool = False):
+        """
+        Merge PDFs into output_file_path, writing each input as it is appended.
+
+        The data is written to "<output_file_path>.part", which write() completes
+        and renames into place; close() without write() removes it.
+
+        Attributes:
+            output_file_path (str): Where the merged PDF will be saved.
+            dedupe (bool): Write identical stream objects only once.
+            pages (list[int]): Object numbers of the merged pages, in order.
+            deduplicated_objects (int): Stream objects not written again.
+            bytes_saved (int): Size of the stream objects not written again.
+
+        Methods:
+            append(reader, pages): Copy the pages of a reader to the output.
+            write(output_file_path): Finish the document and move it into place.
+            close(): Release the partial output if write() was not called.
+        """
+
+        self.output_file_path = output_file_path
+        self.dedupe = dedupe
+        self.pages: list[int] = []
+        self.deduplicated_objects = 0
+        self.bytes_saved = 0
+        # Content digest -> object number of every stream written so far
+        self._streams_by_digest: dict[bytes, int] = {}
+        # Source streams being copied by _dedupe_stream() (reference cycles)
+        self._hashing: set[tuple[int, int]] = set()
+        # Source object -> content digest, for the reader being appended
+        self._digests: dict[tuple[int, int], bytes] = {}
+        self._part_path = f"{output_file_path}{PART_SUFFIX}"
+        self._stream: BinaryIO | None = None
+        # Index = object number; object 0 is the head of the free list
+        self._offsets: list[int] = [0, 0, 0]
+        # Page tree node the copied pages are attached to
+        self._parent_number = _PAGES_NUMBER
+
+    def _output(self) -> BinaryIO:
+        # Opened on first use so that creating the merger cannot fail
+        if self._stream is None:
+            self._stream = open(self._part_path, "wb")
+            self._stream.write(PDF_HEADER)
+        return self._stream
+
+    def _reserve(self) -> int:
+        self._offsets.append(0)
+        return len(self._offsets) - 1
+
+    def _write_object(self, number: int, obj: PdfObject) -> None:
+        stream = self._output()
+        self._offsets[number] = stream.tell()
+        stream.write(f"{number} 0 obj\n".encode())
+        obj.write_to_stream(stream, None)
+        stream.write(b"\nendobj\n")
+
+    def _content_digest(self, obj: Any, visiting: set[tuple[int, int]]) -> bytes:
+        """
+        Digest of an object and everything it references, by content.
+
+        References are replaced by the digest of their target, so identical
+        subtrees from different inputs (or objects) have the same digest.
+        """
+        if isinstance(obj, IndirectObject):
+            key = (obj.idnum, obj.generation)
+            if key in self._digests:
+                return self._digests[key]
+            if key in visiting:
+                return b"cycle"
+            target = obj.get_object()
+            # Written as null by _translate()
+            if isinstance(target, DictionaryObject) and target.get("/Type") in (
+                "/Page",
+                "/Pages",
+            ):
+                return b"null"
+            visiting.add(key)
+            try:
+                digest = self._content_digest(target, visiting)
+            finally:
+                visiting.discard(key)
+            self._digests[key] = digest
+            return digest
+
+        content = hashlib.sha256(type(obj).__name__.encode())
+        if isinstance(obj, DictionaryObject):
+            for key in sorted(obj):
+                if key != "/Length":
+                    content.update(key.encode())
+                    content.update(self._content_digest(obj.raw_get(key), visiting))
+            if isinstance(obj, StreamObject):
+                content.update(obj._data)
+        elif isinstance(obj, ArrayObject):
+            for item in obj:
+                content.update(self._content_digest(item, visiting))
+        else:
+            buffer = BytesIO()
+            obj.write_to_stream(buffer, None)
+            content.update(buffer.getvalue())
+        return content.digest()
+
+    def _dedupe_stream(
+        self,
+        reference: IndirectObject,
+        target: StreamObject,
+        mapping: dict[tuple[int, int], int],
+        pending: list[IndirectObject],
+    ) -> int:
+        """
+        Write a stream unless an identical one was already written; return its number.
+
+        The stream is compared with everything it references before anything
+        is copied, so the objects of a duplicate are not written either.
+        """
+        key = (reference.idnum, reference.generation)
+        digest = self._content_digest(reference, set())
+        existing = self._streams_by_digest.get(digest)
+        if existing is not None:
+            buffer = BytesIO()
+            DictionaryObject(target).write_to_stream(buffer, None)
+            self.deduplicated_objects += 1
+            self.bytes_saved += buffer.tell() + len(target._data)
+            return existing
+
+        self._hashing.add(key)
+        try:
+            copied = self._translate(target, mapping, pending)
+        finally:
+            self._hashing.discard(key)
+
+        # A reference cycle back to this stream already gave it a number
+        number = mapping[key] if key in mapping else self._reserve()
+        self._write_object(number, copied)
+        self._streams_by_digest[digest] = number
+        return number
+
+    def append(self, reader: PdfReader, pages: Iterable[int] | None = None) -> None:
+        """
+        Copy pages of a reader, and everything they reference, to the output.
+
+        Objects shared between the pages of this reader (fonts, images...) are
+        written once. Nothing from the reader is kept once this returns, so the
+        caller can release the reader.
+
+        Args:
+            reader (PdfReader): An opened (and, if needed, decrypted) reader.
+            pages (Iterable[int] | None): 0-based page indices to copy, in order;
+                all pages by default.
+
+        Returns:
+            None
+        """
+        indices = range(len(reader.pages)) if pages is None else pages
+        source_pages = [reader.pages[index] for index in indices]
+
+        # Source (object number, generation) -> output object number
+        mapping: dict[tuple[int, int], int] = {}
+        self._digests = {}
+        page_numbers: list[int] = []
+        for page in source_pages:
+            number = self._reserve()
+            reference = page.indirect_reference
+            if reference is not None:
+                mapping.setdefault((reference.idnum, reference.generation), number)
+            page_numbers.append(number)
+
+        pending: list[IndirectObject] = []
+        for page, number in zip(source_pages, page_numbers):
+            copied = self._translate(page, mapping, pending, skip_keys=("/Parent",))
+            copied[NameObject("/Parent")] = IndirectObject(self._parent_number, 0, None)
+            self._prepare_page(copied)
+            self._write_object(number, copied)
+
+            # Write what this page references before moving on to the next one
+            while pending:
+                reference = pending.pop()
+                target = mapping[(reference.idnum, reference.generation)]
+                self._write_object(
+                    target,
+                    self._translate(reference.get_object(), mapping, pending),
+                )
+
+        self.pages.extend(page_numbers)
+        self._digests = {}
+
+    def _prepare_page(self, page: DictionaryObject) -> None:
+        """Adjust a copied page before it is written; a hook for subclasses."""
+
+    def _translate(
+        self,
+        obj: Any,
+        mapping: dict[tuple[int, int], int],
+        pending: list[IndirectObject],
+        skip_keys: tuple[str, ...] = (),
+    ) -> Any:
+        """Copy an object, renumbering indirect references into the output."""
+        if isinstance(obj, IndirectObject):
+            key = (obj.idnum, obj.generation)
+            if key not in mapping:
+                target = obj.get_object()
+                # Pages that are not being copied (and the source page tree)
+                # must not be dragged in through links or annotations
+                if isinstance(target, DictionaryObject) and target.get("/Type") in (
+                    "/Page",
+                    "/Pages",
+                ):
+                    return NullObject()
+                if (
+                    self.dedupe
+                    and isinstance(target, StreamObject)
+                    and key not in self._hashing
+                ):
+                    mapping[key] = self._dedupe_stream(obj, target, mapping, pending)
+                else:
+                    mapping[key] = self._reserve()
+                    pending.append(obj)
+            return IndirectObject(mapping[key], 0, None)
+
+        if isinstance(obj, StreamObject):
+            copied = StreamObject()
+            for key, value in obj.items():
+                if key != "/Length":
+                    copied[NameObject(key)] = self._translate(value, mapping, pending)
+            copied._data = obj._data
+            return copied
+
+        if isinstance(obj, DictionaryObject):
+            copied = DictionaryObject()
+            for key, value in obj.items():
+                if key not in skip_keys:
+                    copied[NameObject(key)] = self._translate(value, mapping, pending)
+            return copied
+
+        if isinstance(obj, ArrayObject):
+            return ArrayObject(self._translate(item, mapping, pending) for item in obj)
+
+        return obj
+
+    def write(self, output_file_path: str | None = None) -> None:
+        """
+        Write the page tree, catalog and cross-reference table and move the file into place.
+
+        Args:
+            output_file_path (str | None): Final location; defaults to the path
+                given to the constructor.
+
+        Returns:
+            None
+        """
+        page_tree = DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Pages"),
+                NameObject("/Kids"): ArrayObject(
+                    IndirectObject(number, 0, None) for number in self.pages
+                ),
+                NameObject("/Count"): NumberObject(len(self.pages)),
+            }
+        )
+        self._write_object(_PAGES_NUMBER, page_tree)
+
+        catalog = DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Catalog"),
+                NameObject("/Pages"): IndirectObject(_PAGES_NUMBER, 0, None),
+            }
+        )
+        self._write_object(_CATALOG_NUMBER, catalog)
+
+        stream = self._output()
+        xref_offset = stream.tell()
+        size = len(self._offsets)
+        stream.write(f"xref\n0 {size}\n0000000000 65535 f \n".encode())
+        stream.write(
+            "".join(
+                f"{offset:010d} 00000 n \n" for offset in self._offsets[1:]
+            ).encode()
+        )
+        stream.write(
+            f"trailer\n<< /Size {size} /Root {_CATALOG_NUMBER} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n".encode()
+        )
+        stream.close()
+
+        os.replace(self._part_path, output_file_path or self.output_file_path)
+
+    def close(self) -> None:
+        """Close the partial output; it is deleted unless write() completed."""
+        if self._stream is None:
+            return
+        if not self._stream.closed:
+            self._stream.close()
+        if os.path.exists(self._part_path):
+            os.remove(self._part_path)
@@ -1,12 +1,23 @@
 # Shared utilities
 
+import mmap
 import os
 import platform
+import re
+import sqlite3
 import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from enum import Enum
+from itertools import islice
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
 
 from PyPDF2 import PdfReader
+from PyPDF2.errors import FileNotDecryptedError
+
+from core import globals
+from core.reader_cache import get_shared_reader_cache
 
 
 def _get_windows_data():
@@ -118,73 +129,176 @@ def get_persistent_path(relative_path: str = "") -> str:
     return os.path.join(base_path, relative_path)
 
 
-def parse_page_ranges(
-    page_range_input: str, total_pages: int
-) -> tuple[list[tuple[int, int]] | None, str | None]:
+class PDFValidationStatus(Enum):
+    """
+    Enum representing the validation status of a PDF file.
+
+    Members:
+        - VALID: The PDF file is valid, readable, and unencrypted.
+        - NOT_PDF: The file is not a PDF based on its extension or header.
+        - ENCRYPTED: The PDF file is encrypted or password-protected.
+        - CORRUPTED: The PDF file is corrupted or unreadable.
+
+    Used to standardize the results of PDF validation checks across the app.
+    """
+
+    VALID = "valid"
+    NOT_PDF = "not-pdf"
+    ENCRYPTED = "encrypted"
+    CORRUPTED = "corrupted"
+
+
+PDF_HEADER = b"%PDF-"
+PDF_EOF_MARKER = b"%%EOF"
+PDF_STARTXREF = b"startxref"
+
+# Readers tolerate up to 1 KB of junk before the header
+PDF_HEADER_SEARCH_WINDOW = 1024
+
+# "%%EOF" is searched in the last bytes only (the spec puts it in the last
+# kilobyte), and "startxref" in the bytes before it, so a truncated file is
+# never scanned from end to end
+PDF_TRAILER_SEARCH_WINDOW = 2048
+
+# Upper bound on the size of a cross-reference stream dictionary
+XREF_STREAM_DICT_WINDOW = 8192
+
+# A PDF name ends at whitespace or a delimiter character
+_NAME_END = rb"(?=[\s()<>\[\]{}/%])"
+_ENCRYPT_KEY = re.compile(rb"/Encrypt" + _NAME_END)
+_PREV_KEY = re.compile(rb"/Prev" + _NAME_END)
+_XREFSTM_KEY = re.compile(rb"/XRefStm" + _NAME_END)
+_STARTXREF_OFFSET = re.compile(rb"startxref\s+(\d+)")
+_XREF_TABLE_HEADER = re.compile(rb"\s*xref")
+_XREF_STREAM_HEADER = re.compile(rb"\s*\d+\s+\d+\s+obj")
+
+
+def _find_eof_marker(mm: mmap.mmap) -> int:
+    """Position of the last "%%EOF" in the tail of mm, or -1."""
+    return mm.rfind(PDF_EOF_MARKER, max(0, len(mm) - PDF_TRAILER_SEARCH_WINDOW))
+
+
+def _find_startxref(mm: mmap.mmap, eof_pos: int) -> int:
+    """Position of the last "startxref" shortly before eof_pos, or -1."""
+    return mm.rfind(PDF_STARTXREF, max(0, eof_pos - PDF_TRAILER_SEARCH_WINDOW), eof_pos)
+
+
+def prescreen_pdf(path: str) -> tuple[PDFValidationStatus | None, str]:
     """
-    Parse a string representing page ranges into a list of (start, end) tuples.
+    Cheaply reject obvious non-PDF or truncated files before a full parse.
+
+    The file is memory-mapped and only its first kilobyte and its tail are
+    inspected:
+      - No "%PDF-" header in the first 1024 bytes -> NOT_PDF (e.g. an HTML
+        error page saved with a .pdf extension).
+      - No "%%EOF" marker in the last PDF_TRAILER_SEARCH_WINDOW bytes or no
+        "startxref" shortly before it -> CORRUPTED (e.g. a truncated upload).
+
+    Files passing the pre-screen are not guaranteed to be valid; they still
+    need a full parse.
 
     Args:
-        page_range_input (str): Page range string (e.g., "1-3,5,7-9").
-        total_pages (int): Total pages in the PDF to validate ranges.
+        path (str): Path to the file to pre-screen.
 
     Returns:
-        tuple[list[tuple[int, int]] | None, str | None]:
-            - List of (start, end) page tuples if parsing is successful, else None.
-            - Error message string if parsing fails, else None.
+        tuple[PDFValidationStatus | None, str]:
+            - PDFValidationStatus if the file was rejected, else None.
+            - Error message if the file was rejected, else an empty string.
     """
-    page_range_strings = page_range_input.split(",")
-    parsed_ranges = []
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return PDFValidationStatus.CORRUPTED, "The file is empty"
 
-    for segment in page_range_strings:
-        segment = segment.strip()
-        if not segment:
-            continue
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(PDF_HEADER, 0, PDF_HEADER_SEARCH_WINDOW) == -1:
+                    return (
+                        PDFValidationStatus.NOT_PDF,
+                        "The file does not have a PDF header",
+                    )
 
-        if "-" in segment:
-            try:
-                start, end = map(int, segment.split("-"))
-                if start > end:
+                eof_pos = _find_eof_marker(mm)
+                if eof_pos == -1:
                     return (
-                        None,
-                        f"Start page {start} cannot be greater than end page {end}",
+                        PDFValidationStatus.CORRUPTED,
+                        "The file is truncated or corrupted (no %%EOF marker)",
                     )
-            except ValueError:
-                return None, f"Invalid range format: '{segment}'"
-        else:
-            try:
-                start = end = int(segment)
-            except ValueError:
-                return None, f"Invalid page number: '{segment}'"
 
-        if start < 1 or end > total_pages:
-            return None, f"Page range {start}-{end} is out of bounds (1–{total_pages})"
+                if _find_startxref(mm, eof_pos) == -1:
+                    return (
+                        PDFValidationStatus.CORRUPTED,
+                        "The file is truncated or corrupted (no startxref)",
+                    )
+    except (OSError, ValueError):
+        return PDFValidationStatus.CORRUPTED, "The file could not be read"
 
-        parsed_ranges.append((start, end))
+    return None, ""
 
-    if not parsed_ranges:
-        return None, "No valid page ranges provided"
 
-    return parsed_ranges, None
+def detect_encryption_from_trailer(path: str) -> bool | None:
+    """
+    Detect encryption from the last trailer without building a PdfReader.
 
+    The file is memory-mapped and the "startxref" offset before the final
+    "%%EOF" is followed to either a classic "trailer" dictionary or a
+    cross-reference stream dictionary, which is searched for an /Encrypt entry.
 
-class PDFValidationStatus(Enum):
-    """
-    Enum representing the validation status of a PDF file.
+    Like prescreen_pdf(), only the tail of the file is searched for the
+    markers. The answer is only given when the trailer is unambiguous.
+    Hybrid files (/XRefStm) and files without /Encrypt whose last trailer
+    points at earlier sections (/Prev, i.e. incremental updates) are left to
+    a full parse, as are files whose markers are missing from the tail or
+    whose startxref offset is broken.
 
-    Members:
-        - VALID: The PDF file is valid, readable, and unencrypted.
-        - NOT_PDF: The file is not a PDF based on its extension.
-        - ENCRYPTED: The PDF file is encrypted or password-protected.
-        - CORRUPTED: The PDF file is corrupted or unreadable.
+    Args:
+        path (str): Path to the PDF file.
 
-    Used to standardize the results of PDF validation checks across the app.
+    Returns:
+        bool | None:
+            - True if the last trailer references an encryption dictionary.
+            - False if the trailer is unambiguous and has no /Encrypt entry.
+            - None if a full parse is required to tell.
     """
-
-    VALID = "valid"
-    NOT_PDF = "not-pdf"
-    ENCRYPTED = "encrypted"
-    CORRUPTED = "corrupted"
+    try:
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            eof_pos = _find_eof_marker(mm)
+            if eof_pos == -1:
+                return None
+            startxref_pos = _find_startxref(mm, eof_pos)
+            if startxref_pos == -1:
+                return None
+
+            match = _STARTXREF_OFFSET.match(mm, startxref_pos)
+            if not match or int(match.group(1)) >= startxref_pos:
+                return None
+            xref_pos = int(match.group(1))
+
+            if _XREF_TABLE_HEADER.match(mm, xref_pos):
+                trailer_pos = mm.rfind(b"trailer", xref_pos, startxref_pos)
+                if trailer_pos == -1:
+                    return None
+                trailer = mm[trailer_pos:startxref_pos]
+                if _XREFSTM_KEY.search(trailer):
+                    return None
+            elif _XREF_STREAM_HEADER.match(mm, xref_pos):
+                stream_pos = mm.find(
+                    b"stream", xref_pos, xref_pos + XREF_STREAM_DICT_WINDOW
+                )
+                if stream_pos == -1:
+                    return None
+                trailer = mm[xref_pos:stream_pos]
+            else:
+                return None
+    except (OSError, ValueError):
+        return None
+
+    if _ENCRYPT_KEY.search(trailer):
+        return True
+    if _PREV_KEY.search(trailer):
+        return None
+    return False
 
 
 def is_valid_pdf(path: str) -> bool:
@@ -213,6 +327,9 @@ def is_encrypted_pdf(path: str) -> bool:
     """
     Determine whether a PDF file is encrypted or password-protected.
 
+    The trailer is scanned first (see detect_encryption_from_trailer()); a full
+    PdfReader is only built when the trailer is ambiguous.
+
      Args:
          path (str): Path to the PDF file.
 
@@ -221,6 +338,10 @@ def is_encrypted_pdf(path: str) -> bool:
              - True if the file is encrypted.
              - False if the file is not encrypted or if the check fails.
     """
+    encrypted = detect_encryption_from_trailer(path)
+    if encrypted is not None:
+        return encrypted
+
     try:
         reader = PdfReader(path)
         return reader.is_encrypted
@@ -228,39 +349,382 @@ def is_encrypted_pdf(path: str) -> bool:
         return False
 
 
-def validate_pdf_file(path: str) -> tuple[bool, PDFValidationStatus, str]:
+def probe_page_count(reader: PdfReader) -> int:
     """
-    Validate whether the file is a legitimate, readable, and unencrypted PDF.
+    Return the page count from the root page tree's /Count entry.
+
+    Only the catalog and the root /Pages node are resolved, so the page tree is
+    not flattened into PageObjects the way len(reader.pages) does. The full
+    tree walk is used as a fallback when /Count is missing, not an integer, or
+    inconsistent with the root's /Kids (fewer pages than direct kids, or zero
+    pages with kids present).
+
+    Args:
+        reader (PdfReader): An opened (and, if encrypted, decrypted) reader.
+
+    Returns:
+        int: Number of pages in the document.
+
+    Raises:
+        FileNotDecryptedError: If the reader is encrypted and not yet decrypted.
+    """
+    try:
+        catalog = reader.trailer["/Root"].get_object()
+        pages = catalog["/Pages"].get_object()
+        count = pages.get("/Count")
+        kids = pages.get("/Kids")
+        kids = kids.get_object() if kids is not None else []
+    except FileNotDecryptedError:
+        raise
+    except Exception:
+        return len(reader.pages)
+
+    if isinstance(count, int) and count >= len(kids) and (count > 0 or not kids):
+        return int(count)
+
+    return len(reader.pages)
+
+
+class PDFInspection:
+    def __init__(
+        self,
+        path: str,
+        is_valid: bool,
+        status: PDFValidationStatus,
+        message: str = "",
+        reader: PdfReader | None = None,
+        page_count: int | None = None,
+    ):
+        """
+        Result of opening and validating a PDF file exactly once.
+
+        The inspection keeps the parsed PdfReader alive so that core operations
+        can reuse it instead of re-opening and re-parsing the same path.
+
+        Attributes:
+            path (str): Path of the inspected file.
+            is_valid (bool): True if the file is a readable, unencrypted PDF.
+            status (PDFValidationStatus): Validation result status.
+            message (str): Detailed error message; empty string if valid.
+            reader (PdfReader | None): The live reader, or None if the file could not be parsed.
+            page_count (int | None): Known page count, e.g. from the validation cache.
+
+        Properties:
+            is_encrypted (bool): Whether the PDF is encrypted.
+            page_count (int | None): Number of pages, or None if unknown (unparsed or not decrypted).
+        """
+
+        self.path = path
+        self.is_valid = is_valid
+        self.status = status
+        self.message = message
+        self.reader = reader
+        self._page_count: int | None = page_count
+
+    @property
+    def is_encrypted(self) -> bool:
+        return self.status == PDFValidationStatus.ENCRYPTED
+
+    @property
+    def page_count(self) -> int | None:
+        if self._page_count is None and self.reader is not None:
+            try:
+                self._page_count = probe_page_count(self.reader)
+            except FileNotDecryptedError:
+                return None
+        return self._page_count
+
+    def as_tuple(self) -> tuple[bool, PDFValidationStatus, str]:
+        """
+        Return the inspection in the legacy validate_pdf_file() tuple form.
+
+        Returns:
+            tuple[bool, PDFValidationStatus, str]: (is_valid, status, message)
+        """
+        return (self.is_valid, self.status, self.message)
+
+    def __repr__(self):
+        return f"<PDFInspection {self.status.value}: {self.path}>"
+
+
+def _get_cached_validation(
+    path: str,
+) -> tuple[PDFValidationStatus, str, int | None, bool] | None:
+    """
+    Look up a file in the persistent validation cache.
+
+    Cache errors are swallowed so that a broken, locked or unwritable cache
+    database never makes validation fail.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        tuple[PDFValidationStatus, str, int | None, bool] | None:
+            (status, message, page count, encryption flag), or None on a miss.
+    """
+    from core.validation_cache import get_validation_cache
+
+    try:
+        cache = get_validation_cache()
+        entry = cache.get(path) if cache else None
+    except (sqlite3.Error, OSError):
+        return None
+
+    if entry is None:
+        return None
+
+    status, message, page_count, is_encrypted = entry
+    return PDFValidationStatus(status), message, page_count, is_encrypted
+
+
+def _store_cached_validation(inspection: PDFInspection) -> None:
+    """
+    Record an inspection in the persistent validation cache, ignoring cache errors.
+
+    Args:
+        inspection (PDFInspection): The inspection to record.
+
+    Returns:
+        None
+    """
+    from core.validation_cache import get_validation_cache
+
+    try:
+        cache = get_validation_cache()
+        if cache:
+            cache.put(
+                inspection.path,
+                inspection.status.value,
+                inspection.message,
+                inspection.page_count,
+                inspection.is_encrypted,
+            )
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def inspect_pdf(
+    path: str,
+    load_reader: bool = True,
+    open_reader: Callable[[str], PdfReader] | None = None,
+) -> PDFInspection:
+    """
+    Open a file once and report its validation status along with the live reader.
 
     This function performs the following checks in order:
       - Ensures the file has a ".pdf" extension.
-      - Confirms the file can be opened and parsed by PyPDF2.
+      - Consults the persistent validation cache for known-bad files.
+      - Pre-screens the header and trailer markers (see prescreen_pdf()).
+      - Parses the file with PyPDF2 a single time.
       - Detects whether the file is encrypted or password-protected.
 
+    When load_reader is False, encrypted files are recognised from their
+    trailer (see detect_encryption_from_trailer()) and returned without a
+    reader, skipping the full parse.
+
+    While a shared reader cache is active (see core/reader_cache.py), an
+    unchanged file inspected earlier in the process is not parsed again.
+
     Args:
-        path (str): Path to the file to validate.
+        path (str): Path to the file to inspect.
+        load_reader (bool): Whether callers need the reader of encrypted files.
+        open_reader (Callable[[str], PdfReader] | None): Builds the reader
+            instead of PdfReader(path), e.g. ReaderPool.open_reader(); such
+            readers are not shared through the reader cache.
 
     Returns:
-        tuple[bool, PDFValidationStatus, str]:
-            - bool: True if valid PDF and neither encrypted nor corrupt, False otherwise.
-            - PDFValidationStatus: Enum indicating the validation result status.
-            - str: Detailed error message if validation fails; empty string if successful.
+        PDFInspection: The validation status, encryption flag, page count and reader.
     """
     if not path.lower().endswith(".pdf"):
-        return (False, PDFValidationStatus.NOT_PDF, "File is not a .pdf file.")
+        return PDFInspection(
+            path, False, PDFValidationStatus.NOT_PDF, "File is not a .pdf file."
+        )
+
+    readers = get_shared_reader_cache() if load_reader and open_reader is None else None
+    if readers is not None:
+        shared = readers.get(path)
+        if shared is not None:
+            return shared
+
+    cached = _get_cached_validation(path)
+    if cached is not None:
+        status, message, _, _ = cached
+        # Known-bad files are answered from the cache without touching them
+        if status in (PDFValidationStatus.NOT_PDF, PDFValidationStatus.CORRUPTED):
+            return PDFInspection(path, False, status, message)
+
+    inspection = _inspect_pdf_uncached(path, load_reader, open_reader)
+    _store_cached_validation(inspection)
+    if readers is not None:
+        readers.put(inspection)
+    return inspection
+
+
+def _inspect_pdf_uncached(
+    path: str,
+    load_reader: bool = True,
+    open_reader: Callable[[str], PdfReader] | None = None,
+) -> PDFInspection:
+    """
+    Pre-screen and parse a .pdf file, bypassing the validation cache.
+
+    Args:
+        path (str): Path to the file to inspect.
+        load_reader (bool): Whether callers need the reader of encrypted files.
+        open_reader (Callable[[str], PdfReader] | None): Builds the reader
+            instead of PdfReader(path).
 
-    if not is_valid_pdf(path):
-        return (
+    Returns:
+        PDFInspection: The inspection result.
+    """
+    status, message = prescreen_pdf(path)
+    if status is not None:
+        return PDFInspection(path, False, status, message)
+
+    if not load_reader and detect_encryption_from_trailer(path):
+        return PDFInspection(
+            path,
+            False,
+            PDFValidationStatus.ENCRYPTED,
+            "The file is encrypted and cannot be processed",
+        )
+
+    try:
+        reader = PdfReader(path) if open_reader is None else open_reader(path)
+        _ = reader.pages
+    except Exception as e:
+        return PDFInspection(
+            path,
             False,
             PDFValidationStatus.CORRUPTED,
             "The file is not a valid PDF or is corrupted",
         )
 
-    if is_encrypted_pdf(path):
-        return (
+    if reader.is_encrypted:
+        return PDFInspection(
+            path,
             False,
             PDFValidationStatus.ENCRYPTED,
             "The file is encrypted and cannot be processed",
+            reader=reader,
+        )
+
+    return PDFInspection(path, True, PDFValidationStatus.VALID, "", reader=reader)
+
+
+def inspect_pdfs_ahead(
+    paths: Iterable[str],
+    read_ahead: int = 0,
+    open_reader: Callable[[str], PdfReader] | None = None,
+) -> Iterator[PDFInspection]:
+    """
+    Inspect files in order while the next ones are already being opened.
+
+    Up to read_ahead files after the one being consumed are read and parsed
+    by inspect_pdf() on a thread pool, so slow storage is read while the
+    caller processes the current file. Results are yielded strictly in input
+    order, and at most read_ahead + 1 readers are held at a time.
+
+    Args:
+        paths (Iterable[str]): Paths of the files to inspect; consumed lazily.
+        read_ahead (int): Number of files opened ahead; 0 inspects each file
+            only when it is reached.
+        open_reader (Callable[[str], PdfReader] | None): Passed to inspect_pdf().
+
+    Returns:
+        Iterator[PDFInspection]: One inspection per path, in input order.
+    """
+    if read_ahead <= 0:
+        for path in paths:
+            yield inspect_pdf(path, open_reader=open_reader)
+        return
+
+    remaining = iter(paths)
+    with ThreadPoolExecutor(max_workers=read_ahead) as executor:
+        window: deque[Future[PDFInspection]] = deque(
+            executor.submit(inspect_pdf, path, True, open_reader)
+            for path in islice(remaining, read_ahead)
         )
+        while window:
+            inspection = window.popleft().result()
+            next_path = next(remaining, None)
+            if next_path is not None:
+                window.append(
+                    executor.submit(inspect_pdf, next_path, True, open_reader)
+                )
+            yield inspection
+
+
+def validate_pdf_file(path: str) -> tuple[bool, PDFValidationStatus, str]:
+    """
+    Validate whether the file is a legitimate, readable, and unencrypted PDF.
+
+    Thin wrapper over inspect_pdf() for callers that only need the status;
+    the file is parsed at most once, and not at all if an up-to-date result
+    is found in the persistent validation cache. Use inspect_pdf() directly
+    to reuse the reader.
+
+    Args:
+        path (str): Path to the file to validate.
+
+    Returns:
+        tuple[bool, PDFValidationStatus, str]:
+            - bool: True if valid PDF and neither encrypted nor corrupt, False otherwise.
+            - PDFValidationStatus: Enum indicating the validation result status.
+            - str: Detailed error message if validation fails; empty string if successful.
+    """
+    if not path.lower().endswith(".pdf"):
+        return (False, PDFValidationStatus.NOT_PDF, "File is not a .pdf file.")
+
+    cached = _get_cached_validation(path)
+    if cached is not None:
+        status, message, _, _ = cached
+        return (status == PDFValidationStatus.VALID, status, message)
+
+    return inspect_pdf(path, load_reader=False).as_tuple()
 
-    return (True, PDFValidationStatus.VALID, "")
+
+def _init_validation_worker(use_validation_cache: bool) -> None:
+    """
+    Propagate global settings to a validation worker process.
+
+    Worker processes started with "spawn" (Windows, macOS) re-import core.globals
+    with its defaults, so flags set by the CLI have to be passed explicitly.
+
+    Args:
+        use_validation_cache (bool): Value for core.globals.USE_VALIDATION_CACHE.
+    """
+    globals.USE_VALIDATION_CACHE = use_validation_cache
+
+
+def validate_pdf_files(
+    paths: list[str], jobs: int = 1
+) -> list[tuple[bool, PDFValidationStatus, str]]:
+    """
+    Validate many files, optionally in parallel across worker processes.
+
+    Results are returned in the same order as the input paths, each in the
+    validate_pdf_file() tuple form.
+
+    Args:
+        paths (list[str]): Paths of the files to validate.
+        jobs (int): Number of worker processes. 1 validates serially in the
+            current process; 0 uses one worker per CPU.
+
+    Returns:
+        list[tuple[bool, PDFValidationStatus, str]]: One validation result per path.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    jobs = min(jobs, len(paths))
+
+    if jobs <= 1:
+        return [validate_pdf_file(path) for path in paths]
+
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_validation_worker,
+        initargs=(globals.USE_VALIDATION_CACHE,),
+    ) as executor:
+        return list(executor.map(validate_pdf_file, paths, chunksize=chunksize))
@@ -0,0 +1,296 @@
+# Persistent PDF validation cache
+
+"""
+Persistent cache of PDF validation results stored in the app data directory.
+
+Entries are keyed by file identity (absolute path, size, mtime_ns, inode), so a
+file that is modified, replaced or moved is automatically re-validated. The
+cache is bounded by a maximum number of entries; the least recently used
+entries are evicted first. Lookups only note their access time in memory; the
+times are written in one transaction before an eviction, once enough have
+accumulated, or when the cache is closed.
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from core import globals
+from core.utils import get_app_data_dir
+
+CACHE_DIR_NAME = "cache"
+
+VALIDATION_CACHE_FILENAME = "validation_cache.sqlite3"
+
+DEFAULT_MAX_ENTRIES = 50_000
+
+# Eviction runs after this many inserts instead of on every insert
+_EVICT_EVERY = 500
+
+# Pending access times are written once this many lookups have hit
+_FLUSH_EVERY = 500
+
+FileKey = tuple[str, int, int, int]
+
+
+def validation_cache_file() -> Path:
+    """
+    Return the location of the shared cache database in the app data directory.
+
+    It is resolved on use rather than at import, so a platform without an app
+    data directory only loses the cache.
+
+    Returns:
+        Path: Path to the SQLite database file.
+    """
+    return get_app_data_dir() / CACHE_DIR_NAME / VALIDATION_CACHE_FILENAME
+
+
+class ValidationCache:
+    def __init__(
+        self,
+        db_path: str | Path | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """
+        SQLite-backed store of PDF validation results.
+
+        The database defaults to validation_cache_file().
+
+        Attributes:
+            db_path (Path): Location of the SQLite database file.
+            max_entries (int): Maximum number of entries kept before LRU eviction.
+
+        Methods:
+            get(path): Return the cached entry for the file, or None on a miss.
+            put(path, status, message, page_count, is_encrypted): Store a validation result.
+            clear(): Remove every entry.
+            close(): Close the underlying connection.
+        """
+
+        self.db_path = Path(db_path) if db_path is not None else validation_cache_file()
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._inserts = 0
+        # Access times of cache hits not yet written to the database
+        self._touched: dict[FileKey, float] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS validation (
+                    path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    page_count INTEGER,
+                    is_encrypted INTEGER NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (path, size, mtime_ns, inode)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_validation_last_used "
+                "ON validation (last_used)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _file_key(path: str) -> FileKey | None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+    def get(self, path: str) -> tuple[str, str, int | None, bool] | None:
+        """
+        Look up the cached validation result for a file.
+
+        Args:
+            path (str): Path to the file.
+
+        Returns:
+            tuple[str, str, int | None, bool] | None:
+                (status value, message, page count, encryption flag), or None
+                if the file is not cached or has changed since it was cached.
+        """
+        key = self._file_key(path)
+        if key is None:
+            return None
+
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT status, message, page_count, is_encrypted FROM validation "
+                "WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            self._touched[key] = time.time()
+            if len(self._touched) >= _FLUSH_EVERY:
+                self._flush_touched(conn)
+                conn.commit()
+
+        status, message, page_count, is_encrypted = row
+        return status, message, page_count, bool(is_encrypted)
+
+    def put(
+        self,
+        path: str,
+        status: str,
+        message: str,
+        page_count: int | None,
+        is_encrypted: bool,
+    ) -> None:
+        """
+        Store the validation result for a file, replacing older entries for the same path.
+
+        Args:
+            path (str): Path to the file.
+            status (str): PDFValidationStatus value.
+            message (str): Validation message.
+            page_count (int | None): Number of pages, if known.
+            is_encrypted (bool): Whether the file is encrypted.
+
+        Returns:
+            None
+        """
+        key = self._file_key(path)
+        if key is None:
+            return
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM validation WHERE path = ?", (key[0],))
+            conn.execute(
+                "INSERT INTO validation VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    *key,
+                    status,
+                    message,
+                    page_count,
+                    int(is_encrypted),
+                    time.time(),
+                ),
+            )
+            self._inserts += 1
+            if self._inserts % _EVICT_EVERY == 1:
+                self._evict(conn)
+            conn.commit()
+
+    def _flush_touched(self, conn: sqlite3.Connection) -> None:
+        """Write the pending access times; the caller commits."""
+        if self._touched:
+            conn.executemany(
+                "UPDATE validation SET last_used = ? "
+                "WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+                [(last_used, *key) for key, last_used in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # Recent hits must count before the least recently used rows are picked
+        self._flush_touched(conn)
+        (count,) = conn.execute("SELECT COUNT(*) FROM validation").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM validation WHERE rowid IN ("
+                "SELECT rowid FROM validation ORDER BY last_used, rowid LIMIT ?)",
+                (excess,),
+            )
+
+    def clear(self) -> None:
+        """Remove every cached validation result."""
+        with self._lock:
+            self._touched.clear()
+            conn = self._connect()
+            conn.execute("DELETE FROM validation")
+            conn.commit()
+
+    def close(self) -> None:
+        """
+        Write the pending access times and close the database connection.
+
+        The connection is reopened on the next access.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._flush_touched(self._conn)
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+
+
+_cache: ValidationCache | None = None
+
+
+def get_validation_cache() -> ValidationCache | None:
+    """
+    Return the shared validation cache, or None if caching is disabled.
+
+    Caching is controlled by core.globals.USE_VALIDATION_CACHE (the CLI
+    --no-cache flag turns it off). When the cache cannot be set up, for
+    instance because the app data directory cannot be determined, the app
+    runs without it.
+
+    Returns:
+        ValidationCache | None: The shared cache instance, or None.
+    """
+    global _cache
+
+    if not globals.USE_VALIDATION_CACHE:
+        return None
+
+    if _cache is None:
+        try:
+            _cache = ValidationCache()
+        except Exception:
+            return None
+        # Hits since the last flush are written when the process exits
+        atexit.register(_cache.close)
+    return _cache
+
+
+def clear_validation_cache() -> None:
+    """
+    Delete every entry from the shared validation cache.
+
+    Nothing is done when there is no cache database, including when the app
+    data directory cannot be determined.
+
+    Returns:
+        None
+    """
+    if _cache is not None:
+        _cache.clear()
+        return
+
+    try:
+        db_path = validation_cache_file()
+    except Exception:
+        return
+    if not db_path.exists():
+        return
+
+    cache = ValidationCache(db_path)
+    try:
+        cache.clear()
+    finally:
+        cache.close()
@@ -0,0 +1,232 @@
+# Hot-folder watching
+
+"""
+Watch a folder for newly arriving PDFs and hand them over once they are complete.
+
+On Linux the watcher is woken by inotify (through ctypes, no extra
+dependency); elsewhere, for recursive scans, or if inotify is unavailable it
+falls back to polling the directory. A file is only reported after its size
+and modification time have stayed unchanged for the settle period, so
+uploads that are still being written are not picked up half-way.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import platform
+import select
+import struct
+import threading
+import time
+from typing import Callable
+
+from core.dir_scanner import ScanOptions, natural_sort_key, scan_directory
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_INOTIFY_EVENT = struct.Struct("iIII")
+_INOTIFY_BUFFER_SIZE = 64 * 1024
+
+
+class _Inotify:
+    def __init__(self, directory: str):
+        """
+        Minimal ctypes binding to Linux inotify watching a single directory.
+
+        Raises:
+            OSError: If inotify is unavailable or the watch cannot be added.
+        """
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def read_events(self, timeout: float) -> list[tuple[int, str]]:
+        """
+        Wait up to timeout seconds and return the (mask, name) of pending events.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+
+        try:
+            data = os.read(self.fd, _INOTIFY_BUFFER_SIZE)
+        except BlockingIOError:
+            return []
+
+        events: list[tuple[int, str]] = []
+        offset = 0
+        while offset + _INOTIFY_EVENT.size <= len(data):
+            _, mask, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            if name and not mask & IN_ISDIR:
+                events.append((mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FolderWatcher:
+    def __init__(
+        self,
+        directory: str,
+        scan_options: ScanOptions | None = None,
+        settle_seconds: float = 2.0,
+        poll_interval: float = 1.0,
+        use_inotify: bool = True,
+    ):
+        """
+        Report PDFs arriving in a directory once they have stopped growing.
+
+        Attributes:
+            directory (str): Directory to watch.
+            scan_options (ScanOptions): Filters selecting the files of interest
+                (sorting is ignored; arrivals are reported in natural order).
+            settle_seconds (float): How long size and mtime must stay unchanged.
+            poll_interval (float): Seconds between checks.
+            use_inotify (bool): Use inotify on Linux; polling is used otherwise
+                and always for recursive scans.
+
+        Methods:
+            ignore(path): Never report this path (e.g. an output the caller writes).
+            watch(on_arrivals, stop_event, process_existing): Block and report arrivals.
+        """
+
+        self.directory = directory
+        self.scan_options = scan_options or ScanOptions()
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self._seen: set[str] = set()
+        self._ignored: set[str] = set()
+        # path -> (size, mtime_ns, monotonic time of the last observed change)
+        self._pending: dict[str, tuple[int, int, float]] = {}
+
+    def ignore(self, path: str) -> None:
+        """Never report the given path as an arrival."""
+        self._ignored.add(os.path.abspath(path))
+
+    def _snapshot(self) -> list[str]:
+        return [
+            os.path.abspath(entry.path)
+            for entry in scan_directory(self.directory, self.scan_options)
+        ]
+
+    def _note(self, path: str) -> None:
+        if path in self._seen or path in self._ignored or path in self._pending:
+            return
+        self._pending[path] = (-1, -1, time.monotonic())
+
+    def _note_event(self, mask: int, name: str) -> None:
+        path = os.path.abspath(os.path.join(self.directory, name))
+
+        # A file created again under an already processed name is a new arrival
+        if mask & (IN_CREATE | IN_MOVED_TO):
+            self._seen.discard(path)
+
+        options = self.scan_options
+        try:
+            if options.is_excluded(name, name) or not options.matches(
+                name, lambda: os.stat(path)
+            ):
+                return
+        except FileNotFoundError:
+            return
+        self._note(path)
+
+    def _collect_settled(self) -> list[str]:
+        now = time.monotonic()
+        settled: list[str] = []
+
+        for path, (size, mtime_ns, since) in list(self._pending.items()):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                del self._pending[path]
+                continue
+
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                self._pending[path] = (stat.st_size, stat.st_mtime_ns, now)
+            elif now - since >= self.settle_seconds:
+                del self._pending[path]
+                self._seen.add(path)
+                settled.append(path)
+
+        return sorted(settled, key=natural_sort_key)
+
+    def _open_inotify(self) -> _Inotify | None:
+        if (
+            not self.use_inotify
+            or platform.system() != "Linux"
+            or self.scan_options.recursive
+        ):
+            return None
+        try:
+            return _Inotify(self.directory)
+        except (OSError, AttributeError):
+            return None
+
+    def watch(
+        self,
+        on_arrivals: Callable[[list[str]], None],
+        stop_event: threading.Event | None = None,
+        process_existing: bool = False,
+    ) -> None:
+        """
+        Block until stop_event is set, passing each batch of settled arrivals to on_arrivals.
+
+        Args:
+            on_arrivals (Callable[[list[str]], None]): Receives the absolute paths of
+                newly settled files, in natural order.
+            stop_event (threading.Event | None): Set it to stop watching; without
+                one, the watcher runs until interrupted.
+            process_existing (bool): Also report files already present at start.
+
+        Returns:
+            None
+        """
+        stop_event = stop_event or threading.Event()
+
+        inotify = self._open_inotify()
+        try:
+            for path in self._snapshot():
+                if process_existing:
+                    self._note(path)
+                else:
+                    self._seen.add(path)
+
+            while not stop_event.is_set():
+                if inotify is not None:
+                    for mask, name in inotify.read_events(self.poll_interval):
+                        self._note_event(mask, name)
+                else:
+                    stop_event.wait(self.poll_interval)
+                    snapshot = self._snapshot()
+                    # Forget processed files that were removed so re-uploads count again
+                    self._seen.intersection_update(snapshot)
+                    for path in snapshot:
+                        self._note(path)
+
+                settled = self._collect_settled()
+                if settled and not stop_event.is_set():
+                    on_arrivals(settled)
+        finally:
+            if inotify is not None:
+                inotify.close()
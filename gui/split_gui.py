@@ -48,7 +48,8 @@ def split_pdf_gui(root) -> None:
             logger.warning("Splitting failed - No PDF file selected.")
             return
         page_range_input = simpledialog.askstring(
-            title="Page ranges", prompt="Enter the page ranges (e.g., 1-3,5,7-9):"
+            title="Page ranges",
+            prompt="Enter the page ranges (e.g., 1-3,5,7-9,10-,last):",
         )
 
         if not page_range_input or not (page_range_input := page_range_input.strip()):
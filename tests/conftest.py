@@ -232,3 +232,32 @@ def single_page_pdf():
         yield temp_pdf
     finally:
         sample_dir.cleanup()
+
+
+@pytest.fixture
+def encrypted_pdf_file_path():
+    """Provide a temporary path to a password-protected sample PDF (password: 'secret')."""
+
+    from PyPDF2 import PdfReader, PdfWriter
+
+    sample_dir = TemporaryDirectory(
+        dir=os.path.join(root_path, "tests"), prefix="test_pdf_"
+    )
+
+    plain_pdf = os.path.join(sample_dir.name, "plain.pdf")
+    create_pdf(plain_pdf)
+
+    writer = PdfWriter()
+    for page in PdfReader(plain_pdf).pages:
+        writer.add_page(page)
+    writer.encrypt("secret")
+
+    temp_pdf = os.path.join(sample_dir.name, "encrypted.pdf")
+    with open(temp_pdf, "wb") as f:
+        writer.write(f)
+    os.remove(plain_pdf)
+
+    try:
+        yield temp_pdf
+    finally:
+        sample_dir.cleanup()
@@ -1,5 +1,7 @@
 import os
 
+import pytest
+
 from core.batch.batch_merge import batch_merge_pdfs
 
 
@@ -186,3 +188,179 @@ def test_batch_merge_with_non_pdf_file_in_dir(pdfs_directory):
         ask_password_callback=None,
     )
     assert result.success is True
+
+
+def test_batch_merge_parallel_validation(corrupt_pdfs_directory):
+    """Parallel pre-scan reports the same invalid files as the serial loop."""
+
+    result = batch_merge_pdfs(
+        input_dir_path=corrupt_pdfs_directory,
+        new_name="parallel_merged",
+        output_dir=None,
+        ask_password_callback=None,
+        jobs=2,
+    )
+
+    assert result.success is True
+    assert sorted(os.path.basename(f) for f in result.data["invalid_files"]) == [
+        "tempfile0.pdf",
+        "tempfile3.pdf",
+    ]
+
+
+def test_batch_merge_recursive(pdfs_directory, save_pdf_dir):
+    """Recursive scans merge PDFs from sub-directories too."""
+
+    from PyPDF2 import PdfReader
+
+    from core.dir_scanner import ScanOptions
+
+    nested = os.path.join(pdfs_directory, "nested")
+    os.mkdir(nested)
+    os.rename(
+        os.path.join(pdfs_directory, "tempfile0.pdf"),
+        os.path.join(nested, "tempfile0.pdf"),
+    )
+
+    result = batch_merge_pdfs(
+        input_dir_path=pdfs_directory,
+        new_name="recursive_merged",
+        output_dir=save_pdf_dir,
+        ask_password_callback=None,
+        scan_options=ScanOptions(recursive=True),
+    )
+
+    assert result.success is True
+    merged = PdfReader(os.path.join(save_pdf_dir, "recursive_merged.pdf"))
+    assert len(merged.pages) == 24
+
+
+def test_batch_merge_streaming_into_input_directory(pdfs_directory):
+    """A streamed output written into the input directory is not merged into itself."""
+
+    from PyPDF2 import PdfReader
+
+    from core.dir_scanner import ScanOptions
+
+    result = batch_merge_pdfs(
+        input_dir_path=pdfs_directory,
+        new_name="streamed",
+        output_dir=None,
+        ask_password_callback=None,
+        scan_options=ScanOptions(sort_key=None),
+        streaming=True,
+    )
+
+    assert result.success is True
+    merged = PdfReader(os.path.join(pdfs_directory, "streamed.pdf"))
+    assert len(merged.pages) == 24
+    assert not os.path.exists(os.path.join(pdfs_directory, "streamed.pdf.part"))
+
+
+@pytest.mark.parametrize(
+    "chunk_size, jobs, streaming", [(2, 1, False), (3, 2, False), (2, 1, True)]
+)
+def test_batch_merge_chunked(pdfs_directory, save_pdf_dir, chunk_size, jobs, streaming):
+    """A tree merge gives the same pages as a direct merge and cleans up its spill files."""
+
+    import glob
+    import tempfile
+
+    from PyPDF2 import PdfReader
+
+    from core.batch.batch_merge import SPILL_DIR_PREFIX
+
+    direct = batch_merge_pdfs(pdfs_directory, "direct", save_pdf_dir, None)
+    result = batch_merge_pdfs(
+        pdfs_directory,
+        "chunked",
+        save_pdf_dir,
+        None,
+        jobs=jobs,
+        streaming=streaming,
+        chunk_size=chunk_size,
+    )
+
+    assert direct.success is True
+    assert result.success is True
+    texts = [
+        [page.extract_text() for page in PdfReader(path).pages]
+        for path in (
+            os.path.join(save_pdf_dir, "direct.pdf"),
+            os.path.join(save_pdf_dir, "chunked.pdf"),
+        )
+    ]
+    assert len(texts[1]) == 24
+    assert texts[0] == texts[1]
+    assert not glob.glob(os.path.join(tempfile.gettempdir(), SPILL_DIR_PREFIX + "*"))
+
+
+def test_batch_merge_invalid_chunk_size(pdfs_directory, save_pdf_dir):
+    """Chunks of one PDF would never converge."""
+
+    result = batch_merge_pdfs(pdfs_directory, "out", save_pdf_dir, None, chunk_size=1)
+
+    assert result.success is False
+    assert result.title == "Invalid chunk size"
+
+
+@pytest.mark.parametrize("chunk_size", [0, 2])
+def test_batch_merge_max_open_files(pdfs_directory, save_pdf_dir, chunk_size):
+    """A bounded reader pool gives the same output as the in-memory merge."""
+    from PyPDF2 import PdfReader
+
+    direct = batch_merge_pdfs(pdfs_directory, "direct", save_pdf_dir, None)
+    result = batch_merge_pdfs(
+        pdfs_directory,
+        "pooled",
+        save_pdf_dir,
+        None,
+        chunk_size=chunk_size,
+        max_open_files=1,
+    )
+
+    assert direct.success is True
+    assert result.success is True
+    texts = [
+        [page.extract_text() for page in PdfReader(path).pages]
+        for path in (
+            os.path.join(save_pdf_dir, "direct.pdf"),
+            os.path.join(save_pdf_dir, "pooled.pdf"),
+        )
+    ]
+    assert texts[0] == texts[1]
+
+
+def test_batch_merge_max_open_files_parses_once(
+    monkeypatch, pdfs_directory, save_pdf_dir
+):
+    """With a reader pool, each input is parsed once and never read into memory."""
+    from PyPDF2 import PdfReader
+
+    from core.reader_pool import ReaderPool
+
+    opened: list[str] = []
+    in_memory: list[str] = []
+    open_reader = ReaderPool.open_reader
+    reader_init = PdfReader.__init__
+
+    def counting_open_reader(self, path):
+        opened.append(path)
+        return open_reader(self, path)
+
+    def recording_init(self, stream, *args, **kwargs):
+        if isinstance(stream, str):
+            in_memory.append(stream)
+        reader_init(self, stream, *args, **kwargs)
+
+    monkeypatch.setattr(ReaderPool, "open_reader", counting_open_reader)
+    monkeypatch.setattr(PdfReader, "__init__", recording_init)
+
+    result = batch_merge_pdfs(
+        pdfs_directory, "pooled", save_pdf_dir, None, max_open_files=1
+    )
+
+    assert result.success is True
+    assert opened
+    assert len(opened) == len(set(opened))
+    assert in_memory == []
@@ -174,3 +174,25 @@ def test_batch_rename_many_files(large_pdfs_directory):
         base_name="some_name",
     )
     assert result.success is True
+
+
+def test_batch_rename_parallel_validation(large_pdfs_directory):
+    """Batch rename succeeds when PDFs are validated by a process pool."""
+
+    result = batch_rename_pdfs(
+        input_dir=large_pdfs_directory,
+        base_name="some_name",
+        jobs=2,
+    )
+    assert result.success is True
+
+
+def test_batch_rename_parallel_validation_corrupt(corrupt_pdfs_directory):
+    """Parallel validation still rejects directories containing corrupt PDFs."""
+
+    result = batch_rename_pdfs(
+        input_dir=corrupt_pdfs_directory,
+        base_name="some_name",
+        jobs=2,
+    )
+    assert result.success is False
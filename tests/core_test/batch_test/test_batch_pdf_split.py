@@ -1,6 +1,10 @@
 import os
 
+import pytest
+from PyPDF2 import PdfReader
 
+import core.output_stage
+import core.resource_pruning
 from core.batch.batch_split import batch_split_pdf
 
 
@@ -85,3 +89,143 @@ def test_batch_split_file_exists(pdf_file_path):
 
     result = batch_split_pdf(file_path=pdf_file_path)
     assert result.success is False
+
+
+@pytest.mark.parametrize("jobs", [2, 0])
+def test_batch_split_parallel(large_pdf_file_path, save_pdf_dir, jobs):
+    """Worker processes write the same files, reported in page order."""
+
+    result = batch_split_pdf(large_pdf_file_path, save_pdf_dir, jobs=jobs)
+
+    assert result.success is True
+    basename = os.path.splitext(os.path.basename(large_pdf_file_path))[0]
+    assert result.data["files"] == [
+        f"{basename}_page_{number}.pdf" for number in range(1, 113)
+    ]
+    source = PdfReader(large_pdf_file_path)
+    for number in (1, 57, 112):
+        page = PdfReader(os.path.join(save_pdf_dir, f"{basename}_page_{number}.pdf"))
+        assert page.pages[0].extract_text() == source.pages[number - 1].extract_text()
+
+
+def test_batch_split_parallel_encrypted(encrypted_pdf_file_path, save_pdf_dir):
+    """Each worker decrypts its own reader with the password given."""
+
+    result = batch_split_pdf(
+        encrypted_pdf_file_path, save_pdf_dir, lambda _: "secret", jobs=3
+    )
+
+    assert result.success is True
+    assert len(result.data["files"]) == 6
+
+
+def test_batch_split_existing_page_file(pdf_file_path, save_pdf_dir):
+    """A clashing page file fails the split before any page is written."""
+
+    basename = os.path.splitext(os.path.basename(pdf_file_path))[0]
+    open(os.path.join(save_pdf_dir, f"{basename}_page_5.pdf"), "w").close()
+
+    result = batch_split_pdf(pdf_file_path, save_pdf_dir, jobs=2)
+
+    assert result.success is False
+    assert result.title == "File Exists"
+    assert os.listdir(save_pdf_dir) == [f"{basename}_page_5.pdf"]
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_batch_split_pages_per_file(large_pdf_file_path, save_pdf_dir, jobs):
+    """Every file holds N consecutive pages; the last one holds the rest."""
+
+    result = batch_split_pdf(
+        large_pdf_file_path, save_pdf_dir, pages_per_file=50, jobs=jobs
+    )
+
+    assert result.success is True
+    basename = os.path.splitext(os.path.basename(large_pdf_file_path))[0]
+    assert result.data["files"] == [
+        f"{basename}_pages_1-50.pdf",
+        f"{basename}_pages_51-100.pdf",
+        f"{basename}_pages_101-112.pdf",
+    ]
+    last = PdfReader(os.path.join(save_pdf_dir, result.data["files"][-1]))
+    assert len(last.pages) == 12
+    assert (
+        last.pages[0].extract_text()
+        == PdfReader(large_pdf_file_path).pages[100].extract_text()
+    )
+
+
+def test_batch_split_max_bytes(large_pdf_file_path, save_pdf_dir):
+    """Files stay under the size limit and hold every page, in order."""
+
+    max_bytes = 20_000
+    result = batch_split_pdf(large_pdf_file_path, save_pdf_dir, max_bytes=max_bytes)
+
+    assert result.success is True
+    files = result.data["files"]
+    assert len(files) > 1
+    sizes = [os.path.getsize(os.path.join(save_pdf_dir, name)) for name in files]
+    assert max(sizes) <= max_bytes
+    pages = [
+        page.extract_text()
+        for name in files
+        for page in PdfReader(os.path.join(save_pdf_dir, name)).pages
+    ]
+    assert pages == [
+        page.extract_text() for page in PdfReader(large_pdf_file_path).pages
+    ]
+
+
+def test_batch_split_max_bytes_smaller_than_a_page(pdf_file_path, save_pdf_dir):
+    """A page larger than the limit gets a file of its own."""
+
+    result = batch_split_pdf(pdf_file_path, save_pdf_dir, max_bytes=1, pages_per_file=5)
+
+    assert result.success is True
+    assert len(result.data["files"]) == 9
+
+
+def test_batch_split_max_bytes_existing_file(pdf_file_path, save_pdf_dir, monkeypatch):
+    """With max_bytes too, a clashing file fails the split before any page is written."""
+
+    def write_pdf(*args, **kwargs):
+        raise AssertionError("A page was written")
+
+    monkeypatch.setattr(core.output_stage, "write_pdf", write_pdf)
+    basename = os.path.splitext(os.path.basename(pdf_file_path))[0]
+    open(os.path.join(save_pdf_dir, f"{basename}_page_5.pdf"), "w").close()
+
+    result = batch_split_pdf(pdf_file_path, save_pdf_dir, max_bytes=1)
+
+    assert result.success is False
+    assert result.title == "File Exists"
+    assert os.listdir(save_pdf_dir) == [f"{basename}_page_5.pdf"]
+
+
+def test_batch_split_max_bytes_scans_each_page_once(
+    large_pdf_file_path, save_pdf_dir, monkeypatch
+):
+    """The resources measured by the size estimate are reused to write the pages."""
+
+    scanned = []
+    collect_used = core.resource_pruning._collect_used
+
+    def counting_collect(data, resources, used, depth=0):
+        if depth == 0:
+            scanned.append(data)
+        return collect_used(data, resources, used, depth)
+
+    monkeypatch.setattr(core.resource_pruning, "_collect_used", counting_collect)
+
+    result = batch_split_pdf(large_pdf_file_path, save_pdf_dir, max_bytes=20_000)
+
+    assert result.success is True
+    assert len(scanned) == len(PdfReader(large_pdf_file_path).pages)
+
+
+@pytest.mark.parametrize("options", [{"pages_per_file": 0}, {"max_bytes": 0}])
+def test_batch_split_invalid_chunk_size(pdf_file_path, save_pdf_dir, options):
+    result = batch_split_pdf(pdf_file_path, save_pdf_dir, **options)
+
+    assert result.success is False
+    assert result.title == "Invalid chunk size"
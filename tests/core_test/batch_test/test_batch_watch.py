@@ -0,0 +1,155 @@
+import os
+import shutil
+import threading
+import time
+
+from core.batch.batch_watch import (
+    watch_batch_merge,
+    watch_batch_rename,
+    watch_batch_split,
+)
+from core.watcher import FolderWatcher
+
+
+def _stop_after(count: int, results: list, stop_event: threading.Event):
+    def on_result(result) -> None:
+        results.append(result)
+        if len(results) >= count:
+            stop_event.set()
+
+    return on_result
+
+
+def test_watch_batch_rename_numbers_new_arrivals(pdf_file_path, save_pdf_dir):
+    """New PDFs are renamed after the already numbered ones; outputs are not re-processed."""
+
+    shutil.copy(pdf_file_path, os.path.join(save_pdf_dir, "Invoice_1.pdf"))
+    watcher = FolderWatcher(save_pdf_dir, settle_seconds=0.2, poll_interval=0.05)
+    results: list = []
+    stop_event = threading.Event()
+
+    thread = threading.Thread(
+        target=watch_batch_rename,
+        args=(
+            watcher,
+            "Invoice",
+            None,
+            _stop_after(2, results, stop_event),
+            stop_event,
+        ),
+    )
+    thread.start()
+    time.sleep(0.2)
+    shutil.copy(pdf_file_path, os.path.join(save_pdf_dir, "scan_a.pdf"))
+    shutil.copy(pdf_file_path, os.path.join(save_pdf_dir, "scan_b.pdf"))
+    thread.join(timeout=5)
+    stop_event.set()
+
+    assert all(result.success for result in results)
+    assert sorted(os.listdir(save_pdf_dir)) == [
+        "Invoice_1.pdf",
+        "Invoice_2.pdf",
+        "Invoice_3.pdf",
+    ]
+
+
+def test_watch_batch_merge_dedupe(pdf_file_path, save_pdf_dir):
+    """The merge options apply to every batch of arrivals."""
+
+    output_dir = os.path.join(save_pdf_dir, "merged")
+    os.mkdir(output_dir)
+    watcher = FolderWatcher(
+        save_pdf_dir, settle_seconds=0.2, poll_interval=0.05, use_inotify=False
+    )
+    results: list = []
+    stop_event = threading.Event()
+
+    thread = threading.Thread(
+        target=watch_batch_merge,
+        args=(watcher, "All", output_dir, None, results.append, stop_event),
+        kwargs={"dedupe": True, "max_open_files": 1},
+    )
+    thread.start()
+    time.sleep(0.2)
+    shutil.copy(pdf_file_path, os.path.join(save_pdf_dir, "a.pdf"))
+    shutil.copy(pdf_file_path, os.path.join(save_pdf_dir, "b.pdf"))
+    deadline = time.monotonic() + 5
+    while not results and time.monotonic() < deadline:
+        time.sleep(0.05)
+    stop_event.set()
+    thread.join(timeout=5)
+
+    assert results and all(result.success for result in results)
+    assert all("bytes_saved" in result.data for result in results)
+
+
+def test_watch_batch_split_ignores_its_outputs(pdf_file_path, save_pdf_dir):
+    """Page PDFs written into the watched directory are not split again."""
+
+    watcher = FolderWatcher(
+        save_pdf_dir, settle_seconds=0.2, poll_interval=0.05, use_inotify=False
+    )
+    results: list = []
+    stop_event = threading.Event()
+
+    thread = threading.Thread(
+        target=watch_batch_split, args=(watcher, None, None, results.append, stop_event)
+    )
+    thread.start()
+    time.sleep(0.2)
+    shutil.copy(pdf_file_path, os.path.join(save_pdf_dir, "report.pdf"))
+    deadline = time.monotonic() + 5
+    while not results and time.monotonic() < deadline:
+        time.sleep(0.05)
+    # Leave time for a (wrong) second round over the page files
+    time.sleep(0.5)
+    stop_event.set()
+    thread.join(timeout=5)
+
+    assert len(results) == 1 and results[0].success
+    assert len(os.listdir(save_pdf_dir)) == 1 + len(results[0].data["files"])
+
+
+def test_watch_batch_split_options(pdf_file_path, save_pdf_dir):
+    """The split options apply to every arrived PDF."""
+
+    output_dir = os.path.join(save_pdf_dir, "pages")
+    os.mkdir(output_dir)
+    watcher = FolderWatcher(
+        save_pdf_dir, settle_seconds=0.2, poll_interval=0.05, use_inotify=False
+    )
+    results: list = []
+    stop_event = threading.Event()
+
+    thread = threading.Thread(
+        target=watch_batch_split,
+        args=(watcher, output_dir, None, results.append, stop_event),
+        kwargs={"pages_per_file": 4, "compress_level": 6},
+    )
+    thread.start()
+    time.sleep(0.2)
+    shutil.copy(pdf_file_path, os.path.join(save_pdf_dir, "report.pdf"))
+    deadline = time.monotonic() + 5
+    while not results and time.monotonic() < deadline:
+        time.sleep(0.05)
+    stop_event.set()
+    thread.join(timeout=5)
+
+    assert len(results) == 1 and results[0].success
+    assert results[0].data["files"] == [
+        "report_pages_1-4.pdf",
+        "report_pages_5-8.pdf",
+        "report_page_9.pdf",
+    ]
+    assert "bytes_after" in results[0].data
+
+
+def test_watch_batch_rename_invalid_directory():
+    """An unknown directory is reported before watching starts."""
+
+    watcher = FolderWatcher("does/not/exist")
+
+    result = watch_batch_rename(watcher, "Invoice", None, on_result=print)
+
+    assert not result.success
+    assert result.title == "Invalid directory"
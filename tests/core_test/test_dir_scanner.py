@@ -0,0 +1,71 @@
+import os
+
+from core.dir_scanner import ScanOptions, natural_sort_key, scan_directory
+
+
+def _touch(path: str, size: int = 0) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+
+
+def test_natural_sort_key():
+    """Numbers inside names are compared numerically."""
+
+    names = ["file10.pdf", "File2.pdf", "file1.pdf"]
+
+    assert sorted(names, key=natural_sort_key) == [
+        "file1.pdf",
+        "File2.pdf",
+        "file10.pdf",
+    ]
+
+
+def test_scan_default_natural_order(save_pdf_dir):
+    """Only PDFs are returned, in natural order, without recursion."""
+
+    for name in ["doc10.pdf", "doc2.PDF", "doc1.pdf", "notes.txt", "sub/doc3.pdf"]:
+        _touch(os.path.join(save_pdf_dir, name))
+
+    names = [entry.name for entry in scan_directory(save_pdf_dir)]
+
+    assert names == ["doc1.pdf", "doc2.PDF", "doc10.pdf"]
+
+
+def test_scan_recursive_with_exclude(save_pdf_dir):
+    """Recursive scans descend into sub-directories and honour exclusions."""
+
+    for name in ["a.pdf", "sub/b.pdf", "sub/deep/c.pdf", "archive/d.pdf"]:
+        _touch(os.path.join(save_pdf_dir, name))
+
+    options = ScanOptions(recursive=True, exclude=["archive"])
+    paths = [
+        os.path.relpath(entry.path, save_pdf_dir).replace(os.sep, "/")
+        for entry in scan_directory(save_pdf_dir, options)
+    ]
+
+    assert paths == ["a.pdf", "sub/b.pdf", "sub/deep/c.pdf"]
+
+
+def test_scan_size_filter_and_include(save_pdf_dir):
+    """Size filters use the cached stat results and include globs narrow names."""
+
+    _touch(os.path.join(save_pdf_dir, "invoice_small.pdf"), 10)
+    _touch(os.path.join(save_pdf_dir, "invoice_big.pdf"), 1000)
+    _touch(os.path.join(save_pdf_dir, "report_big.pdf"), 1000)
+
+    options = ScanOptions(include=["invoice_*.pdf"], min_size=100)
+    names = [entry.name for entry in scan_directory(save_pdf_dir, options)]
+
+    assert names == ["invoice_big.pdf"]
+
+
+def test_scan_streaming_without_sort(save_pdf_dir):
+    """sort_key=None streams every match without sorting."""
+
+    for i in range(5):
+        _touch(os.path.join(save_pdf_dir, f"doc{i}.pdf"))
+
+    entries = scan_directory(save_pdf_dir, ScanOptions(sort_key=None))
+
+    assert sorted(entry.name for entry in entries) == [f"doc{i}.pdf" for i in range(5)]
@@ -0,0 +1,86 @@
+import os
+import shutil
+
+import pytest
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import NameObject, RectangleObject
+
+from core.incremental_append import IncrementalPdfAppender
+from core.pdf_compress import compress_pdf_file
+
+
+def append_pages(output, source, pages=None):
+    appender = IncrementalPdfAppender(output)
+    try:
+        appender.append(PdfReader(source), pages)
+        appender.write()
+    finally:
+        appender.close()
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_append_chain(pdf_file_path, multiple_pdfs, save_pdf_dir, packed):
+    """Successive updates, after table or stream xref sections, keep every page in order."""
+
+    output = os.path.join(save_pdf_dir, "all.pdf")
+    shutil.copyfile(multiple_pdfs[0], output)
+    if packed:
+        # Ends with an xref stream, whose /Size PdfReader leaves out of its trailer
+        compress_pdf_file(output)
+
+    append_pages(output, pdf_file_path, [0, 1])
+    append_pages(output, pdf_file_path, [8])
+
+    source = [page.extract_text() for page in PdfReader(pdf_file_path).pages]
+    base = [page.extract_text() for page in PdfReader(multiple_pdfs[0]).pages]
+    merged = [page.extract_text() for page in PdfReader(output).pages]
+    assert merged == base + source[:2] + [source[8]]
+
+
+def test_append_failure_restores_file(pdf_file_path, multiple_pdfs, save_pdf_dir):
+    """Closing without write() truncates the file back to its original size."""
+
+    output = os.path.join(save_pdf_dir, "all.pdf")
+    shutil.copyfile(multiple_pdfs[0], output)
+    size = os.path.getsize(output)
+
+    appender = IncrementalPdfAppender(output)
+    appender.append(PdfReader(pdf_file_path))
+    appender.close()
+
+    assert os.path.getsize(output) == size
+    assert len(PdfReader(output).pages) == 6
+
+
+def inherited_boxes_pdf(path, source, media_box, crop_box=None):
+    """Copy of source whose boxes are only set on the root page tree node."""
+
+    writer = PdfWriter()
+    for page in PdfReader(source).pages:
+        writer.add_page(page)
+    for page in writer.pages:
+        for key in ("/MediaBox", "/CropBox"):
+            if key in page:
+                del page[key]
+    root = writer._pages.get_object()
+    root[NameObject("/MediaBox")] = RectangleObject(media_box)
+    if crop_box is not None:
+        root[NameObject("/CropBox")] = RectangleObject(crop_box)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def test_append_inherited_boxes(pdf_file_path, multiple_pdfs, save_pdf_dir):
+    """Appended pages keep their own boxes, not those the target's root sets."""
+
+    output = os.path.join(save_pdf_dir, "all.pdf")
+    source = os.path.join(save_pdf_dir, "source.pdf")
+    inherited_boxes_pdf(output, multiple_pdfs[0], [0, 0, 200, 200], [0, 0, 100, 100])
+    inherited_boxes_pdf(source, pdf_file_path, [0, 0, 300, 400])
+
+    append_pages(output, source, [0])
+
+    pages = PdfReader(output).pages
+    assert [float(v) for v in pages[0].cropbox] == [0, 0, 100, 100]
+    assert [float(v) for v in pages[-1].mediabox] == [0, 0, 300, 400]
+    assert [float(v) for v in pages[-1].cropbox] == [0, 0, 300, 400]
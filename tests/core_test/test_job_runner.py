@@ -0,0 +1,144 @@
+import json
+import os
+
+import pytest
+from PyPDF2 import PdfReader
+
+from core.job_runner import load_manifest, run_manifest
+from core.reader_cache import shared_reader_cache
+from core.utils import inspect_pdf
+
+
+def write_manifest(directory, document, name="manifest.json"):
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as f:
+        if name.endswith(".json"):
+            json.dump(document, f)
+        else:
+            import yaml
+
+            yaml.safe_dump(document, f)
+    return path
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_manifest(multiple_pdfs, save_pdf_dir, jobs):
+    """Runs merge, split, extract and batch split jobs and reports each of them."""
+
+    first, second = multiple_pdfs[:2]
+    manifest = write_manifest(
+        save_pdf_dir,
+        {
+            "jobs": [
+                {
+                    "id": "merge",
+                    "type": "merge",
+                    "files": [f"{first}:1-2", second],
+                    "output": "merged.pdf",
+                },
+                {"type": "split", "file": first, "range": "1-2,3", "output": "."},
+                {"type": "extract", "file": second, "range": "2-3", "output": "."},
+                {"type": "batch_split", "file": second, "output": "."},
+            ]
+        },
+    )
+    report_path = os.path.join(save_pdf_dir, "report.json")
+
+    result = run_manifest(manifest, jobs=jobs, report_path=report_path)
+
+    assert result.success is True
+    assert [job["id"] for job in result.data["jobs"]] == ["merge", "2", "3", "4"]
+    assert len(PdfReader(os.path.join(save_pdf_dir, "merged.pdf")).pages) == 2 + 6
+    assert len(result.data["jobs"][3]["data"]["files"]) == 6
+    with open(report_path, encoding="utf-8") as f:
+        assert json.load(f)["succeeded"] == 4
+
+
+def test_run_yaml_manifest_with_password(encrypted_pdf_file_path, save_pdf_dir):
+    """Reads YAML, resolves paths against the manifest and uses listed passwords."""
+
+    manifest = write_manifest(
+        save_pdf_dir,
+        {
+            "passwords": {encrypted_pdf_file_path: "secret"},
+            "jobs": [
+                {"type": "batch_split", "file": encrypted_pdf_file_path, "output": "."}
+            ],
+        },
+        name="manifest.yaml",
+    )
+
+    result = run_manifest(manifest)
+
+    assert result.success is True
+    assert os.path.isfile(
+        os.path.join(
+            save_pdf_dir,
+            os.path.basename(encrypted_pdf_file_path)[:-4] + "_page_1.pdf",
+        )
+    )
+
+
+def test_run_manifest_reports_failed_jobs(pdf_file_path, save_pdf_dir):
+    """A failing job does not stop the others and is reported."""
+
+    manifest = write_manifest(
+        save_pdf_dir,
+        [
+            {
+                "id": "bad",
+                "type": "split",
+                "file": "missing.pdf",
+                "range": "1",
+                "output": ".",
+            },
+            {
+                "id": "good",
+                "type": "extract",
+                "file": pdf_file_path,
+                "range": "1",
+                "output": ".",
+            },
+        ],
+    )
+
+    result = run_manifest(manifest)
+
+    assert result.success is False
+    assert result.data["failed"] == 1
+    assert [job["success"] for job in result.data["jobs"]] == [False, True]
+
+
+@pytest.mark.parametrize(
+    "jobs",
+    [
+        [{"type": "shred", "file": "a.pdf"}],
+        [{"type": "split", "file": "a.pdf"}],
+        [{"type": "rename", "file": "a.pdf", "output": "b.pdf", "force": True}],
+        [{"id": "x", "type": "rename", "file": "a.pdf", "output": "b.pdf"}] * 2,
+    ],
+)
+def test_invalid_manifest(save_pdf_dir, jobs):
+    """Rejects unknown job types, missing or unknown keys and duplicate ids."""
+
+    manifest = write_manifest(save_pdf_dir, {"jobs": jobs})
+
+    with pytest.raises(ValueError):
+        load_manifest(manifest)
+    assert run_manifest(manifest).title == "Invalid manifest"
+
+
+def test_shared_reader_cache(pdf_file_path):
+    """Unchanged files are parsed once while the cache is active."""
+
+    with shared_reader_cache() as cache:
+        first = inspect_pdf(pdf_file_path)
+        assert inspect_pdf(pdf_file_path) is first
+        assert cache.hits == 1
+
+        # A rewritten file is parsed again
+        with open(pdf_file_path, "ab") as f:
+            f.write(b"\n")
+        assert inspect_pdf(pdf_file_path) is not first
+
+    assert inspect_pdf(pdf_file_path) is not inspect_pdf(pdf_file_path)
@@ -0,0 +1,162 @@
+import gc
+import io
+import json
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+import core.output_archive
+from core.batch.batch_split import batch_split_pdf
+from core.output_archive import MANIFEST_NAME, STDOUT_TARGET
+from core.pdf_extract_pages import extract_pdf_page
+from core.pdf_splitter import split_pdf
+
+
+def test_split_to_zip(pdf_file_path, save_pdf_dir):
+    """The split PDFs and a manifest of their pages are written into the zip only."""
+    from PyPDF2 import PdfReader
+
+    archive = os.path.join(save_pdf_dir, "pages.zip")
+    result = split_pdf(pdf_file_path, "1-3,last", None, None, archive=archive)
+
+    assert result.success is True
+    assert os.listdir(save_pdf_dir) == ["pages.zip"]
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.namelist() == result.data["files"] + [MANIFEST_NAME]
+        manifest = json.loads(zf.read(MANIFEST_NAME))
+        first = PdfReader(io.BytesIO(zf.read(result.data["files"][0])))
+        assert len(first.pages) == 3
+
+    assert manifest["source"] == "tempfile1.pdf"
+    assert manifest["members"][0] == {
+        "name": "tempfile1_pages_1-3.pdf",
+        "pages": [1, 2, 3],
+    }
+    assert manifest["pages"]["2"] == ["tempfile1_pages_1-3.pdf"]
+    assert manifest["pages"]["9"] == ["tempfile1_page_9.pdf"]
+
+
+def test_extract_to_tar(pdf_file_path, save_pdf_dir):
+    """Extracted pages go into a tar archive."""
+
+    archive = os.path.join(save_pdf_dir, "pages.tar")
+    result = extract_pdf_page(pdf_file_path, "2-4", None, None, archive=archive)
+
+    assert result.success is True
+    with tarfile.open(archive) as tf:
+        assert tf.getnames() == ["tempfile1_pages_2-4.pdf", MANIFEST_NAME]
+
+
+def test_batch_split_to_zip_with_workers(pdf_file_path, save_pdf_dir):
+    """Pages written by workers are added to the archive in page order."""
+
+    archive = os.path.join(save_pdf_dir, "pages.zip")
+    result = batch_split_pdf(
+        pdf_file_path, None, None, jobs=2, pages_per_file=2, archive=archive
+    )
+
+    assert result.success is True
+    assert os.listdir(save_pdf_dir) == ["pages.zip"]
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.namelist() == [
+            "tempfile1_pages_1-2.pdf",
+            "tempfile1_pages_3-4.pdf",
+            "tempfile1_pages_5-6.pdf",
+            "tempfile1_pages_7-8.pdf",
+            "tempfile1_page_9.pdf",
+            MANIFEST_NAME,
+        ]
+        manifest = json.loads(zf.read(MANIFEST_NAME))
+    assert manifest["pages"]["9"] == ["tempfile1_page_9.pdf"]
+
+
+def test_archive_to_stdout(pdf_file_path, capsysbinary):
+    """With '-', a tar archive is streamed to stdout."""
+
+    result = batch_split_pdf(pdf_file_path, None, None, archive=STDOUT_TARGET)
+
+    assert result.success is True
+    data = capsysbinary.readouterr().out
+    with tarfile.open(fileobj=io.BytesIO(data)) as tf:
+        assert len(tf.getnames()) == 10
+
+
+def test_existing_archive(pdf_file_path, save_pdf_dir):
+    """An existing archive is never replaced."""
+
+    archive = os.path.join(save_pdf_dir, "pages.zip")
+    with open(archive, "w") as f:
+        f.write("keep")
+
+    result = split_pdf(pdf_file_path, "1", None, None, archive=archive)
+
+    assert result.success is False
+    assert result.title == "File Exists"
+    with open(archive) as f:
+        assert f.read() == "keep"
+
+
+def test_unknown_archive_format(pdf_file_path, save_pdf_dir):
+    """The format must be given or told by the extension."""
+
+    archive = os.path.join(save_pdf_dir, "pages.rar")
+    result = split_pdf(pdf_file_path, "1", None, None, archive=archive)
+    assert result.success is False
+    assert result.title == "Invalid archive"
+
+    result = split_pdf(
+        pdf_file_path, "1", None, None, archive=archive, archive_format="tar"
+    )
+    assert result.success is True
+    assert tarfile.is_tarfile(archive)
+
+
+def test_failed_split_removes_archive(pdf_file_path, save_pdf_dir, monkeypatch):
+    """An archive left incomplete by a failure is removed."""
+
+    pdf_bytes = core.output_archive.pdf_bytes
+    calls = []
+
+    def failing_bytes(writer, compress_level=None):
+        calls.append(writer)
+        if len(calls) == 3:
+            raise OSError("disk full")
+        return pdf_bytes(writer, compress_level)
+
+    monkeypatch.setattr(core.output_archive, "pdf_bytes", failing_bytes)
+
+    archive = os.path.join(save_pdf_dir, "pages.zip")
+    result = split_pdf(pdf_file_path, "1,2,3,4", None, None, archive=archive)
+
+    assert result.success is False
+    assert os.listdir(save_pdf_dir) == []
+
+
+def test_failed_archive_to_stdout_is_truncated(
+    pdf_file_path, capsysbinary, monkeypatch
+):
+    """A failed run does not complete the archive it streamed to stdout."""
+
+    pdf_bytes = core.output_archive.pdf_bytes
+    calls = []
+
+    def failing_bytes(writer, compress_level=None):
+        calls.append(writer)
+        if len(calls) == 3:
+            raise OSError("disk full")
+        return pdf_bytes(writer, compress_level)
+
+    monkeypatch.setattr(core.output_archive, "pdf_bytes", failing_bytes)
+
+    result = batch_split_pdf(pdf_file_path, None, None, archive=STDOUT_TARGET)
+
+    assert result.success is False
+    gc.collect()
+    data = capsysbinary.readouterr().out
+    # A complete tar stream ends with two zero blocks
+    assert not data.endswith(b"\0" * 2 * tarfile.BLOCKSIZE)
+    with pytest.raises(tarfile.ReadError):
+        with tarfile.open(fileobj=io.BytesIO(data)) as tf:
+            tf.getmembers()
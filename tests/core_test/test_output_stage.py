@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+import core.output_stage
+from core.output_stage import STAGE_DIR_PREFIX, OutputStage, find_clash
+from core.pdf_splitter import split_pdf
+
+
+def test_find_clash(save_pdf_dir):
+    """Existing and repeated names clash; free names do not."""
+
+    open(os.path.join(save_pdf_dir, "b.pdf"), "w").close()
+
+    assert find_clash(save_pdf_dir, ["a.pdf", "c.pdf"]) is None
+    assert find_clash(save_pdf_dir, ["a.pdf", "b.pdf"]) == "b.pdf"
+    assert find_clash(save_pdf_dir, ["a.pdf", "a.pdf"]) == "a.pdf"
+
+
+def test_publish(save_pdf_dir):
+    """Staged files are moved to the output directory and the stage is removed."""
+
+    with OutputStage(save_pdf_dir) as stage:
+        for name in ("a.pdf", "b.pdf"):
+            with open(stage.path(name), "w") as f:
+                f.write(name)
+        stage.publish(["a.pdf", "b.pdf"])
+
+    assert sorted(os.listdir(save_pdf_dir)) == ["a.pdf", "b.pdf"]
+
+
+def test_publish_rolls_back_on_clash(save_pdf_dir):
+    """A target created after the preflight is kept and nothing is published."""
+
+    with OutputStage(save_pdf_dir) as stage:
+        for name in ("a.pdf", "b.pdf"):
+            open(stage.path(name), "w").close()
+        with open(os.path.join(save_pdf_dir, "b.pdf"), "w") as f:
+            f.write("someone else's")
+
+        with pytest.raises(FileExistsError):
+            stage.publish(["a.pdf", "b.pdf"])
+
+    assert os.listdir(save_pdf_dir) == ["b.pdf"]
+    with open(os.path.join(save_pdf_dir, "b.pdf")) as f:
+        assert f.read() == "someone else's"
+
+
+def test_failed_split_leaves_nothing(pdf_file_path, save_pdf_dir, monkeypatch):
+    """A split failing midway publishes none of the files already written."""
+
+    write_pdf = core.output_stage.write_pdf
+    calls = []
+
+    def failing_write(writer, output_path, compress_level=None):
+        calls.append(output_path)
+        if len(calls) == 3:
+            raise OSError("disk full")
+        return write_pdf(writer, output_path, compress_level)
+
+    monkeypatch.setattr(core.output_stage, "write_pdf", failing_write)
+
+    result = split_pdf(pdf_file_path, "1,2,3,4", save_pdf_dir, None)
+
+    assert result.success is False
+    assert len(calls) == 3
+    assert not [
+        name for name in os.listdir(save_pdf_dir) if name.startswith(STAGE_DIR_PREFIX)
+    ]
+    assert not [name for name in os.listdir(save_pdf_dir) if name.endswith(".pdf")]
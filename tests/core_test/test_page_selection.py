@@ -0,0 +1,97 @@
+import pytest
+
+from core.page_selection import PageSelection, parse_page_selection, split_input_spec
+
+
+def test_selection_plain_ranges():
+    """Plain ranges and single pages are kept in spec order."""
+
+    selection = PageSelection.compile("1-3,5,7-9", 10)
+
+    assert list(selection) == [1, 2, 3, 5, 7, 8, 9]
+    assert len(selection.ranges) == 3
+
+
+def test_selection_merges_overlapping_ranges():
+    """Overlapping and duplicate ranges only add their new pages, in spec order."""
+
+    selection = PageSelection.compile("1-5,3-8,4,2-3", 10)
+    assert str(selection) == "1-8"
+
+    selection = PageSelection.compile("2-5,1-3,3,9-10,4-9", 10)
+    assert str(selection) == "2-5,1,9-10,6-8"
+    assert len(selection) == 10
+
+
+def test_selection_keeps_adjacent_ranges_separate():
+    """Adjacent, non-overlapping ranges still produce separate output files."""
+
+    selection = PageSelection.compile("1-3,4-5", 10)
+
+    assert [str(r) for r in selection.ranges] == ["1-3", "4-5"]
+
+
+def test_selection_open_ended_and_last():
+    """Open-ended ranges and 'last' resolve against the page count."""
+
+    assert list(PageSelection.compile("8-", 10)) == [8, 9, 10]
+    assert list(PageSelection.compile("-3", 10)) == [1, 2, 3]
+    assert list(PageSelection.compile("last", 10)) == [10]
+    assert list(PageSelection.compile("9-last", 10)) == [9, 10]
+
+
+def test_selection_odd_even_step_and_reversal():
+    """Keywords, steps and negative steps select the expected pages."""
+
+    assert list(PageSelection.compile("odd", 7)) == [1, 3, 5, 7]
+    assert list(PageSelection.compile("even", 7)) == [2, 4, 6]
+    assert list(PageSelection.compile("1-10:3", 10)) == [1, 4, 7, 10]
+    assert list(PageSelection.compile("1-4:-1", 10)) == [4, 3, 2, 1]
+
+
+def test_selection_large_document_is_lazy():
+    """A selection over a huge document stores ranges, not pages."""
+
+    selection = PageSelection.compile("1-,odd", 100_000)
+
+    assert len(selection.ranges) == 1
+    assert len(selection) == 100_000
+
+
+def test_selection_stepped_ranges_skip_selected_pages():
+    """Ranges lose the pages earlier ranges select, without reordering those."""
+
+    assert list(PageSelection.compile("odd,1-4", 9)) == [1, 3, 5, 7, 9, 2, 4]
+
+    selection = PageSelection.compile("odd,3-5,9-", 12)
+    assert str(selection) == "1-11:2,4,10,12"
+
+    selection = PageSelection.compile("4-6,1-10:-1", 10)
+    assert list(selection) == [4, 5, 6, 10, 9, 8, 7, 3, 2, 1]
+
+    selection = PageSelection.compile("2-8:3,1-9", 10)
+    assert list(selection) == [2, 5, 8, 1, 3, 4, 6, 7, 9]
+
+    assert str(PageSelection.compile("1-10:-1,4-6", 10)) == "1-10:-1"
+
+
+@pytest.mark.parametrize(
+    "spec", ["3-1", "-1-3", "1-three", " ", "0", "1-1000", "1-5:0", "even"]
+)
+def test_selection_invalid_specs(spec):
+    """Malformed, out-of-bound and empty specs return an error message."""
+
+    selection, msg = parse_page_selection(spec, 1 if spec == "even" else 10)
+
+    assert selection is None
+    assert msg
+
+
+def test_split_input_spec(pdf_file_path):
+    """Page selections are split off input arguments, but never off existing paths."""
+
+    assert split_input_spec("cover.pdf:1-2") == ("cover.pdf", "1-2")
+    assert split_input_spec("scan.PDF:1-9:2") == ("scan.PDF", "1-9:2")
+    assert split_input_spec("body.pdf") == ("body.pdf", None)
+    assert split_input_spec(r"C:\docs\a.pdf:last") == (r"C:\docs\a.pdf", "last")
+    assert split_input_spec(pdf_file_path) == (pdf_file_path, None)
@@ -0,0 +1,87 @@
+import os
+
+import pytest
+from PyPDF2 import PdfReader
+
+from core.pdf_compress import compress_pdf_file
+from core.pdf_extract_pages import extract_pdf_page
+from core.pdf_merge import merge_pdf
+
+
+def page_texts(path):
+    return [page.extract_text() for page in PdfReader(path, strict=True).pages]
+
+
+def test_compress_pdf_file(large_pdf_file_path):
+    """Packing keeps every page and writes object and xref streams."""
+
+    texts = page_texts(large_pdf_file_path)
+
+    before, after = compress_pdf_file(large_pdf_file_path, level=9)
+
+    assert after < before
+    assert os.path.getsize(large_pdf_file_path) == after
+    assert page_texts(large_pdf_file_path) == texts
+    with open(large_pdf_file_path, "rb") as f:
+        data = f.read()
+    assert b"/ObjStm" in data
+    assert b"/XRef" in data
+    assert b"\nxref\n" not in data
+
+
+def test_compress_invalid_level(pdf_file_path):
+    """An out-of-range level is rejected before the file is touched."""
+
+    with open(pdf_file_path, "rb") as f:
+        original = f.read()
+
+    with pytest.raises(ValueError):
+        compress_pdf_file(pdf_file_path, level=10)
+
+    with open(pdf_file_path, "rb") as f:
+        assert f.read() == original
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_merge_compressed(multiple_pdfs, save_pdf_dir, streaming):
+    """The merge Result reports the sizes with and without packing."""
+
+    output = os.path.join(save_pdf_dir, "merged.pdf")
+
+    result = merge_pdf(
+        multiple_pdfs, output, None, streaming=streaming, compress_level=6
+    )
+
+    assert result.success is True
+    assert result.data["bytes_after"] == os.path.getsize(output)
+    assert result.data["bytes_after"] < result.data["bytes_before"]
+    assert len(page_texts(output)) == 4 * 6
+
+
+def test_extract_compressed(pdf_file_path, save_pdf_dir):
+    """Extracted files are packed and their sizes summed in the Result."""
+
+    result = extract_pdf_page(pdf_file_path, "1-3,5", save_pdf_dir, None, 6)
+
+    assert result.success is True
+    sizes = [
+        os.path.getsize(os.path.join(save_pdf_dir, name))
+        for name in result.data["files"]
+    ]
+    assert result.data["bytes_after"] == sum(sizes)
+    assert [
+        len(page_texts(os.path.join(save_pdf_dir, name)))
+        for name in result.data["files"]
+    ] == [3, 1]
+
+
+def test_merge_append_cannot_compress(pdf_file_path, save_pdf_dir):
+    """Compression would rewrite the whole file, so it is refused with append."""
+
+    output = os.path.join(save_pdf_dir, "merged.pdf")
+    merge_pdf([pdf_file_path], output, None)
+
+    result = merge_pdf([pdf_file_path], output, None, append=True, compress_level=6)
+
+    assert result.success is False
+    assert result.title == "Invalid options"
@@ -0,0 +1,37 @@
+from core.pdf_info import get_pdf_info
+
+
+def test_info(multiple_pdfs):
+    """Report page counts for multiple valid PDFs."""
+
+    result = get_pdf_info(input_file_path=multiple_pdfs)
+
+    assert result.success is True
+    assert [f["page_count"] for f in result.data["files"]] == [6, 6, 6, 6]
+    assert result.data["total_pages"] == 24
+
+
+def test_info_mixed_valid_invalid(valid_invalid_pdfs):
+    """Invalid PDFs are reported with their status and no page count."""
+
+    result = get_pdf_info(input_file_path=valid_invalid_pdfs)
+
+    assert result.success is True
+    assert [f["page_count"] for f in result.data["files"]] == [None, 6, 6, None]
+
+
+def test_info_encrypted_pdf(encrypted_pdf_file_path):
+    """Encrypted PDFs are reported as encrypted without a page count."""
+
+    result = get_pdf_info(input_file_path=[encrypted_pdf_file_path])
+
+    assert result.data["files"][0]["encrypted"] is True
+    assert result.data["files"][0]["page_count"] is None
+
+
+def test_info_no_files():
+    """Fail when no input files are provided."""
+
+    result = get_pdf_info(input_file_path=[])
+
+    assert result.success is False
@@ -1,5 +1,10 @@
 import os
 
+import pytest
+from PyPDF2 import PdfReader
+
+import core.pdf_merge
+import core.utils
 from core.pdf_merge import merge_pdf
 
 
@@ -153,3 +158,228 @@ def test_merge_no_pdf(save_pdf_dir):
     )
 
     assert result.success is False
+
+
+def test_merge_streaming(multiple_pdfs, save_pdf_dir):
+    """The streaming merge produces the same pages as the in-memory merge."""
+
+    regular = os.path.join(save_pdf_dir, "regular.pdf")
+    streamed = os.path.join(save_pdf_dir, "streamed.pdf")
+
+    assert merge_pdf(multiple_pdfs, regular, None).success is True
+    result = merge_pdf(multiple_pdfs, streamed, None, streaming=True)
+
+    assert result.success is True
+    regular_pages = PdfReader(regular).pages
+    streamed_pages = PdfReader(streamed, strict=True).pages
+    assert len(streamed_pages) == len(regular_pages)
+    assert streamed_pages[-1].extract_text() == regular_pages[-1].extract_text()
+
+
+def test_merge_streaming_encrypted(
+    pdf_file_path, encrypted_pdf_file_path, save_pdf_dir
+):
+    """Encrypted inputs are decrypted before they are streamed."""
+
+    output = os.path.join(save_pdf_dir, "merged.pdf")
+
+    result = merge_pdf(
+        [pdf_file_path, encrypted_pdf_file_path],
+        output,
+        ask_password_callback=lambda _: "secret",
+        streaming=True,
+    )
+
+    assert result.success is True
+    assert len(PdfReader(output).pages) == 9 + 6
+
+
+def test_merge_streaming_no_valid_pdf(corrupt_file, save_pdf_dir):
+    """A failed streaming merge leaves neither the output nor a partial file."""
+
+    output = os.path.join(save_pdf_dir, "merged.pdf")
+
+    result = merge_pdf([corrupt_file], output, None, streaming=True)
+
+    assert result.success is False
+    assert os.listdir(save_pdf_dir) == []
+
+
+def test_merge_dedupe(multiple_pdfs, save_pdf_dir):
+    """Resources shared by the inputs are written once and the savings reported."""
+
+    streamed = os.path.join(save_pdf_dir, "streamed.pdf")
+    deduped = os.path.join(save_pdf_dir, "deduped.pdf")
+
+    assert merge_pdf(multiple_pdfs, streamed, None, streaming=True).success is True
+    result = merge_pdf(multiple_pdfs, deduped, None, dedupe=True)
+
+    assert result.success is True
+    assert result.data["bytes_saved"] > 0
+    assert (
+        os.path.getsize(deduped)
+        <= os.path.getsize(streamed) - result.data["bytes_saved"] + 1024
+    )
+    pages = PdfReader(deduped, strict=True).pages
+    assert len(pages) == 4 * 6
+    assert (
+        pages[-1].extract_text()
+        == PdfReader(multiple_pdfs[-1]).pages[-1].extract_text()
+    )
+
+
+def test_merge_read_ahead_keeps_order(multiple_pdfs, pdf_file_path, save_pdf_dir):
+    """Opening inputs ahead in the background does not change the page order."""
+
+    inputs = [pdf_file_path, *multiple_pdfs, pdf_file_path]
+    output = os.path.join(save_pdf_dir, "merged.pdf")
+
+    result = merge_pdf(inputs, output, None, read_ahead=3)
+
+    assert result.success is True
+    expected = [
+        page.extract_text() for path in inputs for page in PdfReader(path).pages
+    ]
+    assert [page.extract_text() for page in PdfReader(output).pages] == expected
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_merge_page_specs(pdf_file_path, multiple_pdfs, save_pdf_dir, streaming):
+    """Only the selected pages of each input are merged, in selection order."""
+
+    output = os.path.join(save_pdf_dir, "merged.pdf")
+
+    result = merge_pdf(
+        [pdf_file_path, multiple_pdfs[0], pdf_file_path],
+        output,
+        None,
+        streaming=streaming,
+        page_specs=["1-2", None, "last,1-3:-1"],
+    )
+
+    assert result.success is True
+    source = [page.extract_text() for page in PdfReader(pdf_file_path).pages]
+    body = [page.extract_text() for page in PdfReader(multiple_pdfs[0]).pages]
+    merged = [page.extract_text() for page in PdfReader(output).pages]
+    assert merged == source[:2] + body + [source[-1], source[2], source[1], source[0]]
+
+
+def test_merge_invalid_page_spec(pdf_file_path, save_pdf_dir):
+    """An out-of-range selection fails the merge without leaving an output."""
+
+    output = os.path.join(save_pdf_dir, "merged.pdf")
+
+    result = merge_pdf([pdf_file_path], output, None, page_specs=["5-99"])
+
+    assert result.success is False
+    assert result.title == "Invalid page selection"
+    assert not os.path.exists(output)
+
+
+def test_merge_append(pdf_file_path, multiple_pdfs, save_pdf_dir):
+    """Appending keeps the existing bytes and adds the new pages at the end."""
+
+    output = os.path.join(save_pdf_dir, "all.pdf")
+    assert merge_pdf([pdf_file_path], output, None).success is True
+    with open(output, "rb") as f:
+        original = f.read()
+
+    result = merge_pdf(multiple_pdfs[:2], output, None, append=True)
+
+    assert result.success is True
+    with open(output, "rb") as f:
+        assert f.read(len(original)) == original
+    assert len(PdfReader(output, strict=True).pages) == 9 + 2 * 6
+
+
+def test_merge_append_requires_existing_output(pdf_file_path, save_pdf_dir):
+    """Appending to a missing or invalid output fails without creating it."""
+
+    output = os.path.join(save_pdf_dir, "all.pdf")
+
+    result = merge_pdf([pdf_file_path], output, None, append=True)
+
+    assert result.success is False
+    assert not os.path.exists(output)
+
+
+def test_merge_append_checks_target_without_parsing(
+    pdf_file_path, corrupt_file, encrypted_pdf_file_path, monkeypatch
+):
+    """Corrupt or encrypted targets are rejected from their header and trailer only."""
+
+    def full_parse(*args, **kwargs):
+        raise AssertionError("The append target was parsed")
+
+    monkeypatch.setattr(core.pdf_merge, "inspect_pdf", full_parse, raising=False)
+    monkeypatch.setattr(core.utils, "inspect_pdf", full_parse)
+
+    for target in (corrupt_file, encrypted_pdf_file_path):
+        with open(target, "rb") as f:
+            original = f.read()
+
+        result = merge_pdf([pdf_file_path], target, None, append=True)
+
+        assert result.success is False
+        assert result.title == "Invalid output PDF"
+        with open(target, "rb") as f:
+            assert f.read() == original
+
+
+@pytest.mark.parametrize("page_specs", [None, ["2-3", None, None, "last", None, None]])
+def test_merge_max_open_files(
+    pdf_file_path, multiple_pdfs, encrypted_pdf_file_path, save_pdf_dir, page_specs
+):
+    """Inputs evicted from the reader pool are reopened while the output is written."""
+
+    inputs = [pdf_file_path, *multiple_pdfs, encrypted_pdf_file_path]
+    direct = os.path.join(save_pdf_dir, "direct.pdf")
+    pooled = os.path.join(save_pdf_dir, "pooled.pdf")
+
+    assert merge_pdf(inputs, direct, lambda _: "secret", page_specs=page_specs).success
+    result = merge_pdf(
+        inputs, pooled, lambda _: "secret", page_specs=page_specs, max_open_files=2
+    )
+
+    assert result.success is True
+    assert [page.extract_text() for page in PdfReader(pooled).pages] == [
+        page.extract_text() for page in PdfReader(direct).pages
+    ]
+
+
+def test_merge_max_open_files_parses_once(
+    monkeypatch, pdf_file_path, multiple_pdfs, encrypted_pdf_file_path, save_pdf_dir
+):
+    """With a reader pool, each input is parsed once and never read into memory."""
+    from core.reader_pool import ReaderPool
+
+    inputs = [pdf_file_path, *multiple_pdfs, encrypted_pdf_file_path]
+    opened: list[str] = []
+    in_memory: list[str] = []
+
+    open_reader = ReaderPool.open_reader
+    reader_init = PdfReader.__init__
+
+    def counting_open_reader(self, path):
+        opened.append(path)
+        return open_reader(self, path)
+
+    def recording_init(self, stream, *args, **kwargs):
+        if isinstance(stream, str):
+            in_memory.append(stream)
+        reader_init(self, stream, *args, **kwargs)
+
+    monkeypatch.setattr(ReaderPool, "open_reader", counting_open_reader)
+    monkeypatch.setattr(PdfReader, "__init__", recording_init)
+
+    result = merge_pdf(
+        inputs,
+        os.path.join(save_pdf_dir, "pooled.pdf"),
+        lambda _: "secret",
+        max_open_files=2,
+        read_ahead=2,
+    )
+
+    assert result.success is True
+    assert sorted(opened) == sorted(inputs)
+    assert in_memory == []
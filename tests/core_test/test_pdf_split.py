@@ -1,4 +1,6 @@
-from core.pdf_splitter import split_pdf
+import os
+
+from core.pdf_splitter import split_pdf, split_pdf_by_outline
 
 
 def test_split(pdf_file_path, save_pdf_dir):
@@ -180,3 +182,128 @@ def test_split_negative_page_range(pdf_file_path, save_pdf_dir):
         ask_password_callback=None,
     )
     assert result.success is False
+
+
+def test_split_open_ended_range(pdf_file_path, save_pdf_dir):
+    """Split succeeds with open-ended ranges and the 'last' keyword."""
+
+    result = split_pdf(
+        file_path=pdf_file_path,
+        page_range_input="-2,5-,last",
+        output_dir=save_pdf_dir,
+        ask_password_callback=None,
+    )
+    assert result.success is True
+    assert result.data["files"] == [
+        "tempfile1_pages_1-2.pdf",
+        "tempfile1_pages_5-9.pdf",
+    ]
+
+
+def _outlined_pdf(pdf_file_path):
+    """Copy the 9-page sample PDF with bookmarks; page 1 comes before the outline."""
+    from PyPDF2 import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    for page in PdfReader(pdf_file_path).pages:
+        writer.add_page(page)
+    chapter = writer.add_outline_item("Chapter 1: Intro", 1)
+    writer.add_outline_item("Section 1.1", 1, parent=chapter)
+    writer.add_outline_item("Section 1.2", 3, parent=chapter)
+    writer.add_outline_item("Part A/B?", 5)
+    writer.add_outline_item("Chapter 1: Intro", 7)
+
+    outlined = os.path.join(os.path.dirname(pdf_file_path), "outlined.pdf")
+    with open(outlined, "wb") as f:
+        writer.write(f)
+    return outlined
+
+
+def test_split_by_outline(pdf_file_path, save_pdf_dir):
+    """One file per top-level bookmark, named after the titles."""
+    from PyPDF2 import PdfReader
+
+    result = split_pdf_by_outline(
+        file_path=_outlined_pdf(pdf_file_path),
+        output_dir=save_pdf_dir,
+        ask_password_callback=None,
+    )
+    assert result.success is True
+    assert result.data["files"] == [
+        "Chapter 1_ Intro.pdf",
+        "Part A_B_.pdf",
+        "Chapter 1_ Intro_2.pdf",
+    ]
+    assert [(s["first_page"], s["last_page"]) for s in result.data["sections"]] == [
+        (2, 5),
+        (6, 7),
+        (8, 9),
+    ]
+    assert sorted(os.listdir(save_pdf_dir)) == sorted(result.data["files"])
+    counts = [
+        len(PdfReader(os.path.join(save_pdf_dir, name)).pages)
+        for name in result.data["files"]
+    ]
+    assert counts == [4, 2, 2]
+
+
+def test_split_by_outline_depth(pdf_file_path, save_pdf_dir):
+    """Deeper levels split chapters at their sections; empty parents are skipped."""
+
+    result = split_pdf_by_outline(
+        file_path=_outlined_pdf(pdf_file_path),
+        output_dir=save_pdf_dir,
+        ask_password_callback=None,
+        depth=2,
+    )
+    assert result.success is True
+    assert [s["title"] for s in result.data["sections"]] == [
+        "Section 1.1",
+        "Section 1.2",
+        "Part A/B?",
+        "Chapter 1: Intro",
+    ]
+    assert [(s["first_page"], s["last_page"]) for s in result.data["sections"]] == [
+        (2, 3),
+        (4, 5),
+        (6, 7),
+        (8, 9),
+    ]
+
+
+def test_split_by_outline_without_outline(pdf_file_path, save_pdf_dir):
+    """Fail when the PDF has no bookmarks."""
+
+    result = split_pdf_by_outline(
+        file_path=pdf_file_path,
+        output_dir=save_pdf_dir,
+        ask_password_callback=None,
+    )
+    assert result.success is False
+    assert result.title == "No outline"
+    assert os.listdir(save_pdf_dir) == []
+
+
+def test_split_by_outline_file_exists(pdf_file_path, save_pdf_dir):
+    """Nothing is written when one of the bookmark names is taken."""
+
+    open(os.path.join(save_pdf_dir, "Part A_B_.pdf"), "wb").close()
+    result = split_pdf_by_outline(
+        file_path=_outlined_pdf(pdf_file_path),
+        output_dir=save_pdf_dir,
+        ask_password_callback=None,
+    )
+    assert result.success is False
+    assert os.listdir(save_pdf_dir) == ["Part A_B_.pdf"]
+
+
+def test_split_by_outline_invalid_depth(pdf_file_path, save_pdf_dir):
+    """Fail with an outline depth below 1."""
+
+    result = split_pdf_by_outline(
+        file_path=_outlined_pdf(pdf_file_path),
+        output_dir=save_pdf_dir,
+        ask_password_callback=None,
+        depth=0,
+    )
+    assert result.success is False
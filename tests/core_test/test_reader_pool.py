@@ -0,0 +1,51 @@
+import os
+
+import pytest
+from PyPDF2 import PdfReader
+
+from core.reader_pool import PooledPdfMerger, ReaderPool
+
+
+def test_pool_bounds_open_files(multiple_pdfs, save_pdf_dir):
+    """Never more than max_open files are open; evicted ones are reopened on read."""
+
+    pool = ReaderPool(max_open=2)
+    merger = PooledPdfMerger()
+    try:
+        for pdf in multiple_pdfs:
+            merger.append(pool.open_reader(pdf))
+        merger.write(os.path.join(save_pdf_dir, "merged.pdf"))
+    finally:
+        merger.close()
+        pool.close()
+
+    assert pool.peak_open == 2
+    assert pool.reopened > 0
+    merged = PdfReader(os.path.join(save_pdf_dir, "merged.pdf"))
+    assert len(merged.pages) == 4 * 6
+
+
+def test_pooled_file_keeps_position(pdf_file_path):
+    """A pooled file reads the same bytes as a plain file across evictions."""
+
+    pool = ReaderPool(max_open=1)
+    first, second = pool.open(pdf_file_path), pool.open(pdf_file_path)
+    with open(pdf_file_path, "rb") as f:
+        expected = f.read()
+
+    assert first.read(10) == expected[:10]
+    assert second.read(5) == expected[:5]
+    # first was evicted by second and resumes where it stopped
+    assert first.read(10) == expected[10:20]
+    first.seek(-4, os.SEEK_END)
+    assert first.read() == expected[-4:]
+    assert pool.reopened == 1
+
+    first.close()
+    second.close()
+    pool.close()
+
+
+def test_pool_rejects_zero_open_files():
+    with pytest.raises(ValueError):
+        ReaderPool(max_open=0)
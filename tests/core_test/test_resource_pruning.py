@@ -0,0 +1,91 @@
+import os
+
+import pytest
+from fpdf import FPDF
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from core.pdf_splitter import split_pdf
+from core.resource_pruning import pruned_page
+
+
+@pytest.fixture
+def shared_fonts_pdf(save_pdf_dir):
+    """Three pages, one font each, sharing a resource dictionary with all fonts."""
+
+    pdf = FPDF()
+    for family in ("Courier", "Times", "Arial"):
+        pdf.add_page()
+        pdf.set_font(family, size=12)
+        pdf.cell(40, 10, f"Written in {family}")
+    path = os.path.join(save_pdf_dir, "fonts.pdf")
+    pdf.output(path)
+    return path
+
+
+def font_names(page):
+    return sorted(page["/Resources"]["/Font"].keys())
+
+
+def test_pruned_page_keeps_used_fonts(shared_fonts_pdf):
+    """Only the fonts selected by Tf stay; the source page is not modified."""
+
+    page = PdfReader(shared_fonts_pdf).pages[0]
+
+    copy, dropped = pruned_page(page)
+
+    assert dropped == 2
+    assert font_names(copy) == ["/F1"]
+    assert font_names(page) == ["/F1", "/F2", "/F3"]
+
+
+def test_pruned_page_follows_forms_without_resources(shared_fonts_pdf):
+    """A form XObject drawing with the page's resources keeps what it uses."""
+
+    reader = PdfReader(shared_fonts_pdf)
+    writer = PdfWriter()
+    page = writer.add_page(reader.pages[0])
+    form = DecodedStreamObject()
+    form.update(
+        {
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Form"),
+        }
+    )
+    form.set_data(b"BT /F3 9 Tf (x) Tj ET")
+    page["/Resources"][NameObject("/XObject")] = DictionaryObject(
+        {NameObject("/Fm0"): writer._add_object(form)}
+    )
+    contents = DecodedStreamObject()
+    contents.set_data(page["/Contents"].get_object().get_data() + b"\n/Fm0 Do")
+    page[NameObject("/Contents")] = writer._add_object(contents)
+
+    copy, dropped = pruned_page(page)
+
+    assert dropped == 1
+    assert font_names(copy) == ["/F1", "/F3"]
+    assert list(copy["/Resources"]["/XObject"]) == ["/Fm0"]
+
+
+def test_split_prunes_resources(shared_fonts_pdf, save_pdf_dir):
+    """Split files carry only their page's fonts and are smaller."""
+
+    pruned_dir = os.path.join(save_pdf_dir, "pruned")
+    full_dir = os.path.join(save_pdf_dir, "full")
+    os.mkdir(pruned_dir)
+    os.mkdir(full_dir)
+
+    pruned = split_pdf(shared_fonts_pdf, "1,2,3", pruned_dir, None)
+    full = split_pdf(shared_fonts_pdf, "1,2,3", full_dir, None, prune_resources=False)
+
+    assert pruned.success is True
+    assert pruned.data["pruned_resources"] > 0
+    assert "pruned_resources" not in full.data
+    for name in pruned.data["files"]:
+        small = os.path.join(pruned_dir, name)
+        large = os.path.join(full_dir, name)
+        assert os.path.getsize(small) < os.path.getsize(large)
+        assert (
+            PdfReader(small).pages[0].extract_text()
+            == PdfReader(large).pages[0].extract_text()
+        )
@@ -0,0 +1,140 @@
+import os
+
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NumberObject,
+)
+
+from core.streaming_merger import StreamingPdfMerger
+
+
+def test_streaming_merger_page_selection(pdf_file_path, save_pdf_dir):
+    """Selected pages are copied in the given order, duplicates included."""
+
+    output = os.path.join(save_pdf_dir, "out.pdf")
+    merger = StreamingPdfMerger(output)
+    try:
+        merger.append(PdfReader(pdf_file_path), [4, 0, 0])
+        merger.write()
+    finally:
+        merger.close()
+
+    source = PdfReader(pdf_file_path).pages
+    pages = PdfReader(output, strict=True).pages
+    assert [page.extract_text() for page in pages] == [
+        source[index].extract_text() for index in (4, 0, 0)
+    ]
+
+
+def test_streaming_merger_shares_resources(pdf_file_path, save_pdf_dir):
+    """Objects shared by the pages of one input are written only once."""
+
+    output = os.path.join(save_pdf_dir, "out.pdf")
+    merger = StreamingPdfMerger(output)
+    try:
+        merger.append(PdfReader(pdf_file_path))
+        merger.write()
+    finally:
+        merger.close()
+
+    pages = PdfReader(output).pages
+    resources = {page.raw_get("/Resources").idnum for page in pages}
+    assert len(pages) == 9
+    assert len(resources) == 1
+    assert not os.path.exists(output + ".part")
+
+
+def image_pdf(path):
+    """One-page PDF drawing an image whose stream references other objects."""
+
+    writer = PdfWriter()
+    writer.add_blank_page(100, 100)
+    page = writer.pages[0]
+    mask = DecodedStreamObject()
+    mask.set_data(b"\xff" * 4)
+    mask.update(
+        {
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Image"),
+            NameObject("/Width"): NumberObject(2),
+            NameObject("/Height"): NumberObject(2),
+            NameObject("/ColorSpace"): NameObject("/DeviceGray"),
+            NameObject("/BitsPerComponent"): NumberObject(8),
+        }
+    )
+    image = DecodedStreamObject()
+    image.set_data(b"\x00\x80\xff" * 4)
+    image.update(
+        {
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Image"),
+            NameObject("/Width"): NumberObject(2),
+            NameObject("/Height"): NumberObject(2),
+            NameObject("/ColorSpace"): writer._add_object(
+                ArrayObject([NameObject("/CalRGB"), DictionaryObject()])
+            ),
+            NameObject("/BitsPerComponent"): NumberObject(8),
+            NameObject("/SMask"): writer._add_object(mask),
+        }
+    )
+    page[NameObject("/Resources")] = DictionaryObject(
+        {
+            NameObject("/XObject"): DictionaryObject(
+                {NameObject("/Im0"): writer._add_object(image)}
+            )
+        }
+    )
+    content = DecodedStreamObject()
+    content.set_data(b"q 100 0 0 100 0 0 cm /Im0 Do Q")
+    page[NameObject("/Contents")] = writer._add_object(content)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def reachable_objects(reader):
+    """Numbers of the objects reachable from the trailer."""
+
+    found = set()
+    pending = [reader.trailer.raw_get("/Root")]
+    while pending:
+        obj = pending.pop()
+        if isinstance(obj, IndirectObject):
+            if obj.idnum in found:
+                continue
+            found.add(obj.idnum)
+            obj = obj.get_object()
+        if isinstance(obj, DictionaryObject):
+            pending.extend(obj.raw_get(key) for key in obj)
+        elif isinstance(obj, ArrayObject):
+            pending.extend(obj)
+    return found
+
+
+def test_streaming_merger_dedupe_skips_duplicate_subtrees(save_pdf_dir):
+    """A duplicate stream is shared with what it references; nothing is left orphaned."""
+
+    inputs = [os.path.join(save_pdf_dir, f"{name}.pdf") for name in "ab"]
+    for path in inputs:
+        image_pdf(path)
+
+    output = os.path.join(save_pdf_dir, "out.pdf")
+    merger = StreamingPdfMerger(output, dedupe=True)
+    try:
+        for path in inputs:
+            merger.append(PdfReader(path))
+        merger.write()
+    finally:
+        merger.close()
+
+    reader = PdfReader(output, strict=True)
+    images = {
+        page["/Resources"]["/XObject"].raw_get("/Im0").idnum for page in reader.pages
+    }
+    assert len(images) == 1
+    assert merger.deduplicated_objects == 2
+    assert reachable_objects(reader) == set(reader.xref[0]) - {0}
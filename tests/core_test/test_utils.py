@@ -0,0 +1,212 @@
+import os
+
+from core.utils import (
+    PDFValidationStatus,
+    detect_encryption_from_trailer,
+    inspect_pdf,
+    inspect_pdfs_ahead,
+    is_encrypted_pdf,
+    prescreen_pdf,
+    probe_page_count,
+    validate_pdf_file,
+    validate_pdf_files,
+)
+
+
+def test_inspect_valid_pdf(pdf_file_path):
+    """Inspecting a valid PDF returns a live reader and its page count."""
+
+    inspection = inspect_pdf(pdf_file_path)
+
+    assert inspection.is_valid is True
+    assert inspection.status == PDFValidationStatus.VALID
+    assert inspection.reader is not None
+    assert inspection.page_count == 9
+
+
+def test_inspect_corrupt_pdf(pdf_file_path):
+    """Inspecting a truncated PDF reports CORRUPTED and keeps no reader."""
+
+    with open(pdf_file_path, "rb") as f:
+        data = f.read()
+    with open(pdf_file_path, "wb") as f:
+        f.write(data[: len(data) // 2])
+
+    inspection = inspect_pdf(pdf_file_path)
+
+    assert inspection.is_valid is False
+    assert inspection.status == PDFValidationStatus.CORRUPTED
+    assert inspection.reader is None
+    assert inspection.page_count is None
+
+
+def test_inspect_not_pdf():
+    """Inspecting a non-.pdf path reports NOT_PDF without opening it."""
+
+    inspection = inspect_pdf("something.txt")
+
+    assert inspection.status == PDFValidationStatus.NOT_PDF
+
+
+def test_inspect_encrypted_pdf(encrypted_pdf_file_path):
+    """Encrypted PDFs keep their reader so callers can decrypt it in place."""
+
+    inspection = inspect_pdf(encrypted_pdf_file_path)
+
+    assert inspection.status == PDFValidationStatus.ENCRYPTED
+    assert inspection.is_encrypted is True
+    assert inspection.page_count is None
+
+    inspection.reader.decrypt("secret")
+    assert inspection.page_count == 6
+
+
+def test_validate_pdf_file_matches_inspection(pdf_file_path):
+    """validate_pdf_file() keeps its tuple contract."""
+
+    assert validate_pdf_file(pdf_file_path) == (True, PDFValidationStatus.VALID, "")
+
+
+def test_prescreen_valid_pdf(pdf_file_path):
+    """A well-formed PDF passes the pre-screen."""
+
+    assert prescreen_pdf(pdf_file_path) == (None, "")
+
+
+def test_prescreen_text_file_with_pdf_extension(corrupt_file):
+    """A text file renamed to .pdf is rejected as NOT_PDF by its missing header."""
+
+    status, message = prescreen_pdf(corrupt_file)
+
+    assert status == PDFValidationStatus.NOT_PDF
+    assert message
+
+
+def test_prescreen_empty_file(save_pdf_dir):
+    """An empty file is rejected as CORRUPTED."""
+
+    empty_pdf = os.path.join(save_pdf_dir, "empty.pdf")
+    open(empty_pdf, "wb").close()
+
+    status, _ = prescreen_pdf(empty_pdf)
+
+    assert status == PDFValidationStatus.CORRUPTED
+
+
+def test_prescreen_missing_eof(save_pdf_dir):
+    """A file with a PDF header but no trailer is rejected as CORRUPTED."""
+
+    truncated_pdf = os.path.join(save_pdf_dir, "truncated.pdf")
+    with open(truncated_pdf, "wb") as f:
+        f.write(b"%PDF-1.4\n1 0 obj\n<< /Type /Catalog >>\n")
+
+    status, _ = prescreen_pdf(truncated_pdf)
+
+    assert status == PDFValidationStatus.CORRUPTED
+
+
+def test_prescreen_eof_only_far_from_end(pdf_file_path):
+    """A %%EOF followed by a truncated update is outside the tail window: CORRUPTED."""
+
+    with open(pdf_file_path, "ab") as f:
+        f.write(b"1 0 obj\n<< /Type /Catalog >>\nendobj\n" * 200)
+
+    status, _ = prescreen_pdf(pdf_file_path)
+
+    assert status == PDFValidationStatus.CORRUPTED
+
+
+def test_validate_pdf_files_keeps_order(valid_invalid_pdfs):
+    """Parallel validation returns one result per path in input order."""
+
+    results = validate_pdf_files(valid_invalid_pdfs, jobs=2)
+
+    assert [is_valid for is_valid, _, _ in results] == [False, True, True, False]
+    assert results == validate_pdf_files(valid_invalid_pdfs, jobs=1)
+
+
+def test_inspect_pdfs_ahead_keeps_order(valid_invalid_pdfs):
+    """Read-ahead yields the inspections lazily, in input order."""
+
+    paths = valid_invalid_pdfs * 3
+
+    inspections = list(inspect_pdfs_ahead(iter(paths), read_ahead=2))
+
+    assert [inspection.path for inspection in inspections] == paths
+    assert [inspection.as_tuple() for inspection in inspections] == [
+        inspect_pdf(path).as_tuple() for path in paths
+    ]
+
+
+def test_detect_encryption_plain_pdf(pdf_file_path):
+    """An unencrypted PDF is recognised from its trailer alone."""
+
+    assert detect_encryption_from_trailer(pdf_file_path) is False
+
+
+def test_detect_encryption_encrypted_pdf(encrypted_pdf_file_path):
+    """An /Encrypt entry in the trailer marks the PDF as encrypted."""
+
+    assert detect_encryption_from_trailer(encrypted_pdf_file_path) is True
+    assert is_encrypted_pdf(encrypted_pdf_file_path) is True
+
+
+def test_detect_encryption_incremental_update_is_ambiguous(pdf_file_path):
+    """A trailer with /Prev but no /Encrypt defers to a full parse."""
+
+    with open(pdf_file_path, "rb") as f:
+        data = f.read()
+    prev = int(data[data.rindex(b"startxref") + 9 :].split()[0])
+
+    update = (
+        b"xref\n0 1\n0000000000 65535 f \n"
+        b"trailer\n<< /Size 1 /Prev %d >>\nstartxref\n%d\n%%%%EOF\n" % (prev, len(data))
+    )
+    with open(pdf_file_path, "ab") as f:
+        f.write(update)
+
+    assert detect_encryption_from_trailer(pdf_file_path) is None
+    assert is_encrypted_pdf(pdf_file_path) is False
+
+
+def test_detect_encryption_markers_outside_tail(encrypted_pdf_file_path):
+    """Markers followed by more than the tail window are left to a full parse."""
+
+    with open(encrypted_pdf_file_path, "ab") as f:
+        f.write(b"%" + b"x" * 4096 + b"\n")
+
+    assert detect_encryption_from_trailer(encrypted_pdf_file_path) is None
+
+
+def test_validate_encrypted_pdf(encrypted_pdf_file_path):
+    """validate_pdf_file() classifies encrypted PDFs without needing a reader."""
+
+    is_valid, status, _ = validate_pdf_file(encrypted_pdf_file_path)
+
+    assert is_valid is False
+    assert status == PDFValidationStatus.ENCRYPTED
+
+
+def test_probe_page_count(large_pdf_file_path):
+    """The /Count probe matches the flattened page tree."""
+
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(large_pdf_file_path)
+
+    assert probe_page_count(reader) == 112
+    assert reader.flattened_pages is None
+    assert probe_page_count(reader) == len(reader.pages)
+
+
+def test_probe_page_count_inconsistent_count(pdf_file_path):
+    """An inconsistent /Count falls back to walking the page tree."""
+
+    from PyPDF2 import PdfReader
+    from PyPDF2.generic import NameObject, NumberObject
+
+    reader = PdfReader(pdf_file_path)
+    pages = reader.trailer["/Root"]["/Pages"]
+    pages[NameObject("/Count")] = NumberObject(0)
+
+    assert probe_page_count(reader) == 9
@@ -0,0 +1,120 @@
+import os
+import sqlite3
+
+import core.validation_cache
+from core.utils import PDFValidationStatus, inspect_pdf
+from core.validation_cache import (
+    ValidationCache,
+    clear_validation_cache,
+    get_validation_cache,
+)
+
+
+def test_cache_round_trip(pdf_file_path, save_pdf_dir):
+    """A stored validation result is returned for the unchanged file."""
+
+    cache = ValidationCache(os.path.join(save_pdf_dir, "cache.sqlite3"))
+    cache.put(pdf_file_path, PDFValidationStatus.VALID.value, "", 9, False)
+
+    assert cache.get(pdf_file_path) == ("valid", "", 9, False)
+    cache.close()
+
+
+def test_cache_miss_after_modification(pdf_file_path, save_pdf_dir):
+    """Modifying a file invalidates its cached entry."""
+
+    cache = ValidationCache(os.path.join(save_pdf_dir, "cache.sqlite3"))
+    cache.put(pdf_file_path, PDFValidationStatus.VALID.value, "", 9, False)
+
+    with open(pdf_file_path, "ab") as f:
+        f.write(b"\n")
+
+    assert cache.get(pdf_file_path) is None
+    cache.close()
+
+
+def test_cache_eviction(multiple_pdfs, save_pdf_dir):
+    """The cache never keeps more than max_entries entries after eviction."""
+
+    cache = ValidationCache(os.path.join(save_pdf_dir, "cache.sqlite3"), max_entries=2)
+    for pdf in multiple_pdfs:
+        cache.put(pdf, PDFValidationStatus.VALID.value, "", 6, False)
+    cache._evict(cache._connect())
+
+    cached = [pdf for pdf in multiple_pdfs if cache.get(pdf) is not None]
+    assert cached == multiple_pdfs[-2:]
+    cache.close()
+
+
+def test_cache_lookup_defers_access_time(pdf_file_path, save_pdf_dir):
+    """A cache hit writes its access time only when the cache is closed."""
+
+    db_path = os.path.join(save_pdf_dir, "cache.sqlite3")
+    cache = ValidationCache(db_path)
+    cache.put(pdf_file_path, PDFValidationStatus.VALID.value, "", 9, False)
+
+    def last_used():
+        with sqlite3.connect(db_path) as conn:
+            return conn.execute("SELECT last_used FROM validation").fetchone()[0]
+
+    stored = last_used()
+    assert cache.get(pdf_file_path) is not None
+    assert last_used() == stored
+
+    cache.close()
+    assert last_used() > stored
+
+
+def test_cache_eviction_keeps_recent_hits(multiple_pdfs, save_pdf_dir):
+    """Eviction counts the access times of hits that are not written yet."""
+
+    cache = ValidationCache(os.path.join(save_pdf_dir, "cache.sqlite3"), max_entries=2)
+    first, second, third = multiple_pdfs[:3]
+    for pdf in (first, second):
+        cache.put(pdf, PDFValidationStatus.VALID.value, "", 6, False)
+    assert cache.get(first) is not None
+    cache.put(third, PDFValidationStatus.VALID.value, "", 6, False)
+    cache._evict(cache._connect())
+
+    assert cache.get(second) is None
+    assert cache.get(first) is not None
+    assert cache.get(third) is not None
+    cache.close()
+
+
+def test_cache_clear(pdf_file_path, save_pdf_dir):
+    """clear() removes every cached entry."""
+
+    cache = ValidationCache(os.path.join(save_pdf_dir, "cache.sqlite3"))
+    cache.put(pdf_file_path, PDFValidationStatus.VALID.value, "", 9, False)
+    cache.clear()
+
+    assert cache.get(pdf_file_path) is None
+    cache.close()
+
+
+def test_no_cache_without_app_data_dir(pdf_file_path, monkeypatch):
+    """An app data directory that cannot be determined only disables the cache."""
+
+    def no_app_data_dir():
+        raise ValueError("LOCALAPPDATA is not set")
+
+    monkeypatch.setattr(core.validation_cache, "validation_cache_file", no_app_data_dir)
+    monkeypatch.setattr(core.validation_cache, "_cache", None)
+
+    assert get_validation_cache() is None
+    assert inspect_pdf(pdf_file_path).status == PDFValidationStatus.VALID
+
+
+def test_clear_without_cache(tmp_path, monkeypatch):
+    """Clearing is a no-op when there is no database or no app data directory."""
+
+    clear_validation_cache()
+    assert not (tmp_path / core.validation_cache.VALIDATION_CACHE_FILENAME).exists()
+
+    def no_app_data_dir():
+        raise ValueError("LOCALAPPDATA is not set")
+
+    monkeypatch.setattr(core.validation_cache, "validation_cache_file", no_app_data_dir)
+
+    clear_validation_cache()
@@ -0,0 +1,64 @@
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from core.watcher import FolderWatcher
+
+
+def _watch_in_background(watcher: FolderWatcher):
+    arrivals: list[str] = []
+    stop_event = threading.Event()
+
+    def on_arrivals(paths: list[str]) -> None:
+        arrivals.extend(paths)
+        stop_event.set()
+
+    thread = threading.Thread(target=watcher.watch, args=(on_arrivals, stop_event))
+    thread.start()
+    # Give the watcher time to take its initial snapshot
+    time.sleep(0.2)
+    return arrivals, stop_event, thread
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher_reports_only_new_arrivals(pdf_file_path, save_pdf_dir, use_inotify):
+    """Files present at start and ignored paths are not reported; new PDFs are."""
+
+    shutil.copy(pdf_file_path, os.path.join(save_pdf_dir, "existing.pdf"))
+    watcher = FolderWatcher(
+        save_pdf_dir, settle_seconds=0.2, poll_interval=0.05, use_inotify=use_inotify
+    )
+    watcher.ignore(os.path.join(save_pdf_dir, "output.pdf"))
+
+    arrivals, stop_event, thread = _watch_in_background(watcher)
+    shutil.copy(pdf_file_path, os.path.join(save_pdf_dir, "output.pdf"))
+    shutil.copy(pdf_file_path, os.path.join(save_pdf_dir, "notes.txt"))
+    shutil.copy(pdf_file_path, os.path.join(save_pdf_dir, "new.pdf"))
+    thread.join(timeout=5)
+    stop_event.set()
+
+    assert [os.path.basename(path) for path in arrivals] == ["new.pdf"]
+
+
+def test_watcher_waits_for_growing_files(save_pdf_dir):
+    """A file is only reported once it stops changing for the settle period."""
+
+    watcher = FolderWatcher(
+        save_pdf_dir, settle_seconds=0.3, poll_interval=0.05, use_inotify=False
+    )
+    arrivals, stop_event, thread = _watch_in_background(watcher)
+
+    path = os.path.join(save_pdf_dir, "upload.pdf")
+    with open(path, "wb") as f:
+        for _ in range(4):
+            f.write(b"x" * 1024)
+            f.flush()
+            time.sleep(0.15)
+            assert arrivals == []
+    thread.join(timeout=5)
+    stop_event.set()
+
+    assert arrivals == [os.path.abspath(path)]